@@ -0,0 +1,311 @@
+"""교실 부하 테스트: N명의 학생이 동시에 실제 페이지를 사용하는 상황을 재현합니다.
+
+Streamlit AppTest로 로그인 페이지, 주제별 문제 페이지(render_question_page),
+랭킹 페이지를 직접 실행합니다. 학생마다 로그인 -> 주제별로 문제 풀이(제출, 다음 문제)
+-> 랭킹 조회를 반복하고, 동작별 응답 시간(p50/p95/p99), 오류 수,
+DB 쓰기 락 대기 시간을 출력합니다.
+
+오류는 페이지에서 발생한 예외와 DB 오류("데이터베이스 오류" 메시지)만 셉니다.
+오답 안내도 st.error로 표시되므로 다른 st.error는 세지 않습니다.
+끝난 뒤 학생별로 제출한 수와 DB에 기록된 수를 비교해 빠진 기록도 오류로 셉니다.
+
+쓰기 락 대기 시간은 별도 연결이 주기적으로 BEGIN IMMEDIATE를 실행해서 락을 얻기까지
+기다린 시간입니다. 답안 기록이 락을 오래 잡고 있으면 이 값이 커집니다.
+
+AppTest는 프로세스에 하나뿐인 Streamlit 런타임을 사용하므로 한 프로세스에서 여러 페이지를
+동시에 실행할 수 없습니다. 그래서 학생마다 별도 프로세스에서 실행하며, 답안 기록 큐도
+프로세스마다 따로 동작합니다. (실제 서버보다 쓰기 경합이 큰 쪽으로 측정됩니다)
+
+실행: python -m benchmarks.classroom_load [--users 50] [--questions 5]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from streamlit.testing.v1 import AppTest
+
+import config
+from utils import db
+from utils.student_import import StudentRow, import_students
+from utils.submissions import wait_for_user_writes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGIN_PAGE = os.path.join(ROOT, "pages", "0_🔐_Login.py")
+RANKING_PAGE = os.path.join(ROOT, "pages", "1_🏆_Ranking.py")
+TOPIC_SCRIPT = """
+from q_page_format import render_question_page
+render_question_page({topic!r})
+"""
+
+
+def make_students(count):
+    return [
+        StudentRow(
+            i,
+            f"부하{i}",
+            config.SCHOOLS[i % len(config.SCHOOLS)],
+            config.TEAMS[i % len(config.TEAMS)],
+            f"{i % 10000:04d}",
+        )
+        for i in range(count)
+    ]
+
+
+# save_question_result가 DB 오류를 표시할 때 쓰는 메시지 앞부분
+DB_ERROR_PREFIX = "데이터베이스 오류"
+
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+class Recorder:
+    """동작별 응답 시간과 오류를 모읍니다."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = Counter()
+
+    def run(self, action, app, timeout):
+        started = time.perf_counter()
+        try:
+            app.run(timeout=timeout)
+        except Exception as e:  # AppTest 시간 초과 등
+            self.errors[f"{action}: {type(e).__name__}: {e}"[:120]] += 1
+            return False
+        finally:
+            self.latencies[action].append((time.perf_counter() - started) * 1000)
+
+        for exception in app.exception:
+            self.errors[f"{action}: {exception.message}"[:120]] += 1
+        # 오답 안내("틀렸습니다." 등)도 st.error이므로 DB 오류만 셉니다.
+        for error in app.error:
+            if str(error.value).startswith(DB_ERROR_PREFIX):
+                self.errors[f"{action}: {error.value}"[:120]] += 1
+        return not app.exception
+
+
+def warm_up():
+    """작업 프로세스 초기화: 측정 전에 Streamlit 런타임과 페이지 모듈을 미리 불러옵니다."""
+    import q_page_format  # noqa: F401
+
+    AppTest.from_string("import streamlit as st").run(timeout=120)
+
+
+def _ready():
+    time.sleep(0.5)
+
+
+def simulate(student, db_path, topics, questions, timeout, seed):
+    """학생 한 명의 시나리오를 실행하고 (user_id, 제출 수, 동작별 응답 시간, 오류 수)를 반환합니다."""
+    config.DB_PATH = db_path
+    rng = random.Random(seed)
+    recorder = Recorder()
+
+    login_page = AppTest.from_file(LOGIN_PAGE, default_timeout=timeout)
+    if not recorder.run("open_login", login_page, timeout):
+        return None, 0, dict(recorder.latencies), recorder.errors
+    _widget(login_page.text_input, "이름").input(student.name)
+    _widget(login_page.selectbox, "학교 또는 소속").select(student.school)
+    _widget(login_page.selectbox, "팀").select(student.team)
+    _widget(login_page.text_input, "비밀번호 (4자리 숫자)").input(student.pin)
+    _widget(login_page.button, "로그인").click()
+    recorder.run("login", login_page, timeout)
+    if "user" not in login_page.session_state:
+        recorder.errors["login: 로그인 실패"] += 1
+        return None, 0, dict(recorder.latencies), recorder.errors
+    user = login_page.session_state["user"]
+    submitted = 0
+
+    for topic in topics:
+        page = AppTest.from_string(
+            TOPIC_SCRIPT.format(topic=topic), default_timeout=timeout
+        )
+        page.session_state["user"] = user
+        if not recorder.run("question", page, timeout):
+            continue
+        for _ in range(questions):
+            if page.radio:
+                page.radio[0].set_value(rng.choice(page.radio[0].options))
+            elif page.multiselect:
+                page.multiselect[0].select(rng.choice(page.multiselect[0].options))
+            _widget(page.button, "제출").click()
+            if recorder.run("submit", page, timeout):
+                submitted += 1
+            next_button = _widget(page.button, "다음 문제")
+            if next_button.disabled:
+                break
+            next_button.click()
+            recorder.run("next", page, timeout)
+
+        ranking = AppTest.from_file(RANKING_PAGE, default_timeout=timeout)
+        ranking.session_state["user"] = user
+        recorder.run("ranking", ranking, timeout)
+
+    # 작업 프로세스에서는 atexit가 실행되지 않으므로 대기 중인 제출이 기록될 때까지 기다립니다.
+    if not wait_for_user_writes(user["id"]):
+        recorder.errors["db: 제출 기록 대기 시간 초과"] += 1
+    return user["id"], submitted, dict(recorder.latencies), recorder.errors
+
+
+def probe_lock_waits(db_path, stop, interval, waits):
+    conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+        except sqlite3.OperationalError:
+            pass  # timeout 안에 락을 얻지 못한 경우도 대기 시간으로 기록합니다.
+        waits.append((time.perf_counter() - started) * 1000)
+        stop.wait(interval)
+    conn.close()
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def summarize(name, values):
+    return (
+        f"{name:>12} {len(values):7d} "
+        f"{percentile(values, 50):9.1f} {percentile(values, 95):9.1f} "
+        f"{percentile(values, 99):9.1f} {max(values):9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--topics", type=int, default=3, help="학생당 푸는 주제 수")
+    parser.add_argument("--questions", type=int, default=5, help="주제당 푸는 문제 수")
+    parser.add_argument("--ramp", type=float, default=5, help="학생 접속 분산 시간(초)")
+    parser.add_argument("--timeout", type=float, default=30, help="페이지 실행 제한(초)")
+    parser.add_argument("--db", help="사용할 DB (기본: 임시 DB)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_path = args.db or os.path.join(tmp.name, "load.sqlite")
+    config.DB_PATH = db_path
+    students = make_students(args.users)
+    with db.connection() as conn:
+        result = import_students(conn, students)
+        last_id = conn.execute(
+            "SELECT IFNULL(MAX(id), 0) FROM question_results"
+        ).fetchone()[0]
+    print(f"학생 {args.users}명 (새로 등록 {result.inserted}명), DB: {db_path}")
+    db.close_all()
+
+    rng = random.Random(args.seed)
+    topics = list(config.TOPICS)
+    topics_per_user = min(args.topics, len(topics))
+
+    stop = threading.Event()
+    lock_waits = []
+    probe = threading.Thread(
+        target=probe_lock_waits, args=(db_path, stop, 0.05, lock_waits), daemon=True
+    )
+    probe.start()
+
+    latencies = defaultdict(list)
+    errors = Counter()
+    submitted = {}
+    # 열린 SQLite 연결과 스레드(락 측정 등)를 fork로 물려받으면 작업 프로세스가
+    # 멈출 수 있으므로 spawn으로 새 프로세스를 띄웁니다.
+    with ProcessPoolExecutor(
+        max_workers=args.users,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up,
+    ) as executor:
+        # 모든 작업 프로세스를 띄우고 초기화가 끝난 뒤에 측정을 시작합니다.
+        for future in [executor.submit(_ready) for _ in range(args.users)]:
+            future.result()
+        print("작업 프로세스 준비 완료")
+
+        started = time.perf_counter()
+        futures = []
+        for i, student in enumerate(students):
+            # 접속 시점을 ramp초에 걸쳐 분산합니다.
+            delay = started + args.ramp * i / args.users - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(
+                executor.submit(
+                    simulate,
+                    student,
+                    db_path,
+                    rng.sample(topics, topics_per_user),
+                    args.questions,
+                    args.timeout,
+                    args.seed + i,
+                )
+            )
+        for future in futures:
+            try:
+                user_id, user_submitted, user_latencies, user_errors = future.result()
+            except Exception as e:
+                errors[f"시나리오 실패: {type(e).__name__}: {e}"[:120]] += 1
+                continue
+            if user_id is not None:
+                submitted[user_id] = user_submitted
+            for action, values in user_latencies.items():
+                latencies[action].extend(values)
+            errors.update(user_errors)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe.join()
+
+    # 제출했다고 화면에 나온 답안이 모두 DB에 기록되었는지 확인합니다.
+    with db.connection() as conn:
+        recorded = dict(
+            conn.execute(
+                "SELECT user_id, COUNT(*) FROM question_results WHERE id > ? GROUP BY user_id",
+                (last_id,),
+            ).fetchall()
+        )
+    missing = sum(
+        max(count - recorded.get(user_id, 0), 0) for user_id, count in submitted.items()
+    )
+    if missing:
+        errors["db: 기록되지 않은 제출"] += missing
+    db.close_all()
+    tmp.cleanup()
+
+    print(f"\n{args.users}명, {elapsed:.1f}s")
+    print(f"{'동작':>12} {'횟수':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} (ms)")
+    for action in ("open_login", "login", "question", "submit", "next", "ranking"):
+        if latencies.get(action):
+            print(summarize(action, latencies[action]))
+    submits = len(latencies.get("submit", []))
+    print(f"제출 처리량: {submits / elapsed:.1f}건/s")
+
+    if lock_waits:
+        print("\n쓰기 락 대기 (BEGIN IMMEDIATE, 50ms 간격)")
+        print(summarize("lock_wait", lock_waits))
+        print(f"{'100ms 초과':>12} {sum(wait > 100 for wait in lock_waits):7d}")
+
+    total_errors = sum(errors.values())
+    locked = sum(
+        count for message, count in errors.items() if "database is locked" in message
+    )
+    print(f"\n오류 {total_errors}건 (database is locked: {locked}건)")
+    for message, count in errors.most_common(10):
+        print(f"  {count:5d}  {message}")
+
+
+if __name__ == "__main__":
+    # AppTest가 작업 프로세스의 __main__ 모듈을 바꾸므로, 작업 프로세스에 넘기는 함수는
+    # __main__이 아닌 모듈 이름으로 찾을 수 있어야 합니다.
+    from benchmarks.classroom_load import main as run
+
+    run()
@@ -0,0 +1,332 @@
+"""벤치마크용 가상 DB를 만듭니다.
+
+- 사용자: config.SCHOOLS/config.TEAMS에 나눠 배치하고, 활동량은 Zipf 분포(소수의 학생이 대부분 풀이)
+- 문제: config.TOPICS의 idx 범위에서 고르며, 앞쪽 주제/문제일수록 많이 풀고 문제마다 난이도가 다름
+- 시간: 평일 수업 시간(09~12시, 13~17시)에 몰리고, 매 시 정각 직후(수업 시작)에 더 몰림
+- 같은 seed면 항상 같은 DB가 만들어집니다.
+
+풀이 기록은 파이썬에서 만든 작은 분포 테이블(사용자/문제/분 단위 시간대)을
+SQLite 안에서 INSERT ... SELECT 한 번으로 펼쳐서 만듭니다. 인덱스와 트리거는 기록을 넣은 뒤
+만들고, 집계 테이블도 각각 INSERT ... SELECT 한 번으로 만듭니다.
+사용자별 총점은 원본 대신 question_attempts에서 더합니다.
+
+소요 시간: 1천만 행을 1분 안에 만드는 것이 목표였지만 아직 달성하지 못했습니다.
+단일 CPU에서 1천만 행(사용자 5000명) 전체 생성은 약 2분 40초가 걸립니다.
+(풀이 기록 23초, 집계 테이블 70초, 인덱스 67초) 집계와 인덱스는 1천만 행을 각각 정렬해야 해서
+SQLite의 단일 코어 정렬 속도에 묶입니다. 단계별 시간은 실행 후 출력됩니다.
+
+실행: python -m benchmarks.dataset --rows 10000000 --users 5000 [--output db/bench.sqlite]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+import config
+from utils.auth import hash_password
+from utils.helpers import local_timezone, now_local, utc_offset_seconds
+from utils.migrations import migrate
+from utils.rollups import (
+    rebuild_activity_rollup,
+    rebuild_group_stats,
+    rebuild_question_attempts,
+)
+
+# 행 번호를 섞을 때 쓰는 소수 (행 번호 * 곱수가 64비트 정수를 넘지 않도록 2^31 미만)
+_PRIME = 2147483629
+
+
+def _apportion(weights, total):
+    """total을 weights 비율로 나눈 정수 목록 (합이 정확히 total)"""
+    weight_sum = sum(weights)
+    exact = [weight * total / weight_sum for weight in weights]
+    counts = [int(value) for value in exact]
+    remainders = sorted(
+        range(len(weights)), key=lambda i: exact[i] - counts[i], reverse=True
+    )
+    for i in remainders[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _pick_table(conn, name, columns, values, weights, size):
+    """values를 weights 비율만큼 반복해 담은 size칸짜리 조회 테이블을 만듭니다."""
+    conn.execute(
+        f"CREATE TEMP TABLE {name} (slot INTEGER PRIMARY KEY, {', '.join(columns)})"
+    )
+    rows = []
+    for value, count in zip(values, _apportion(weights, size)):
+        rows.extend([value] * count)
+    conn.executemany(
+        f"INSERT INTO temp.{name} VALUES (?, {', '.join('?' for _ in columns)})",
+        ((slot, *value) for slot, value in enumerate(rows)),
+    )
+
+
+def _team_for(school, rng):
+    teams = [team for team in config.TEAMS if team.startswith(school)]
+    return rng.choice(teams or config.TEAMS)
+
+
+def _insert_users(conn, users, rng):
+    school_weights = [1 / (rank + 1) for rank in range(len(config.SCHOOLS))]
+    rows = []
+    for i in range(users):
+        school = rng.choices(config.SCHOOLS, school_weights)[0]
+        rows.append(
+            (
+                i + 1,
+                f"학생{i + 1}",
+                hash_password(f"{i % 10000:04d}"),
+                school,
+                _team_for(school, rng),
+            )
+        )
+    conn.executemany(
+        "INSERT INTO users (id, name, password, school, team) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _user_picks(conn, users, rng, zipf):
+    # 활동량 순위를 무작위로 섞어 Zipf 가중치를 주고, 사용자별 실력(정답률 보정)을 정합니다.
+    ranks = list(range(1, users + 1))
+    rng.shuffle(ranks)
+    values = [
+        (user_id, max(-300, min(300, int(rng.gauss(0, 120)))))
+        for user_id in range(1, users + 1)
+    ]
+    weights = [1 / rank**zipf for rank in ranks]
+    size = max(1 << 16, 4 * users)
+    _pick_table(conn, "user_pick", ["user_id", "skill"], values, weights, size)
+    return size
+
+
+def _question_picks(conn, rng):
+    # 앞쪽 주제일수록, 주제 안에서도 앞쪽 문제일수록 많이 풉니다. 난이도는 Beta 분포.
+    values = []
+    weights = []
+    for topic_rank, (topic, topic_config) in enumerate(config.TOPICS.items()):
+        idx_list = topic_config["idx_list"]
+        topic_weight = 1 / (topic_rank + 1) ** 0.7
+        for position, idx in enumerate(idx_list):
+            values.append((idx, topic, int(1000 * rng.betavariate(4, 2))))
+            share = 1.5 - position / len(idx_list)
+            weights.append(topic_weight / len(idx_list) * share)
+    size = 1 << 16
+    _pick_table(
+        conn, "question_pick", ["question_idx", "topic", "p"], values, weights, size
+    )
+    return size
+
+
+def _minute_weight(moment, day_factor, rng):
+    if moment.weekday() >= 5:
+        base = 0.05 if 10 <= moment.hour < 22 else 0.005
+    elif 9 <= moment.hour < 12 or 13 <= moment.hour < 17:
+        # 수업 시간, 수업 시작 직후 15분은 더 몰립니다.
+        base = 3.0 if moment.minute < 15 else 1.0
+    elif 19 <= moment.hour < 24:
+        base = 0.3
+    else:
+        base = 0.01
+    return base * day_factor * (0.5 + rng.random())
+
+
+def _time_slots(conn, rows, days, end, rng):
+    """분 단위 시간대별 행 수를 정해 temp.time_slot(minute, start_row, rows)에 넣습니다."""
+    tz = local_timezone()
+    start = (end - timedelta(days=days)).replace(second=0, microsecond=0)
+    day_factors = [rng.lognormvariate(0, 0.4) for _ in range(days + 1)]
+    weights = []
+    for minute in range(days * 1440):
+        moment = (start + timedelta(minutes=minute)).astimezone(tz)
+        weights.append(_minute_weight(moment, day_factors[minute // 1440], rng))
+
+    conn.execute(
+        "CREATE TEMP TABLE time_slot "
+        "(minute INTEGER PRIMARY KEY, start_row INTEGER, rows INTEGER)"
+    )
+    slots = []
+    offset = 0
+    for minute, count in enumerate(_apportion(weights, rows)):
+        if count:
+            slots.append((minute, offset, count))
+            offset += count
+    conn.executemany("INSERT INTO temp.time_slot VALUES (?, ?, ?)", slots)
+
+    # time_slot의 각 행을 rows번 반복하기 위한 번호 테이블
+    longest = max(count for _, _, count in slots)
+    conn.execute("CREATE TEMP TABLE row_number (n INTEGER PRIMARY KEY)")
+    conn.executemany(
+        "INSERT INTO temp.row_number VALUES (?)", ((n,) for n in range(longest))
+    )
+    return int(start.timestamp())
+
+
+def _insert_results(conn, start_ts, user_size, question_size, offset, rng):
+    # 행 번호 r에 서로 다른 곱수를 곱해 사용자, 문제, 정답 여부, 초를 독립적으로 고릅니다.
+    a, b, c, d = (rng.randrange(1 << 20, 1 << 31) for _ in range(4))
+    conn.execute(
+        f"""
+        INSERT INTO question_results
+            (question_idx, topic, user_id, correct, created_at, created_ts)
+        SELECT
+            q.question_idx,
+            q.topic,
+            u.user_id,
+            (r * {c} % {_PRIME}) % 1000 < MIN(950, MAX(50, q.p + u.skill)),
+            datetime(ts, 'unixepoch', '{offset:+d} seconds'),
+            ts
+        FROM (
+            SELECT s.start_row + n.n AS r,
+                {start_ts} + s.minute * 60 + ((s.start_row + n.n) * {d} % {_PRIME}) % 60
+                    AS ts
+            FROM temp.time_slot s
+            JOIN temp.row_number n ON n.n < s.rows
+        )
+        JOIN temp.user_pick u ON u.slot = (r * {a} % {_PRIME}) % {user_size}
+        JOIN temp.question_pick q ON q.slot = (r * {b} % {_PRIME}) % {question_size}
+        """
+    )
+
+
+def _update_user_totals(conn):
+    # 1천만 행의 원본 대신 (문제, 사용자)별로 이미 묶인 question_attempts에서 더합니다.
+    conn.execute(
+        """
+        CREATE TEMP TABLE user_totals AS
+        SELECT
+            user_id,
+            SUM(correct_count) AS correct,
+            SUM(attempt_count) - SUM(correct_count) AS incorrect
+        FROM question_attempts
+        GROUP BY user_id
+        """
+    )
+    conn.execute("CREATE UNIQUE INDEX temp.user_totals_id ON user_totals (user_id)")
+    conn.execute(
+        """
+        UPDATE users
+        SET correct = t.correct,
+            incorrect = t.incorrect,
+            points = 3 * t.correct + t.incorrect
+        FROM temp.user_totals t
+        WHERE users.id = t.user_id
+        """
+    )
+
+
+def generate(path, rows, users, days=60, seed=0, zipf=1.1, end=None):
+    """가상 DB를 path에 만들고 단계별 소요 시간(초)을 반환합니다."""
+    rng = random.Random(seed)
+    end = end or now_local().replace(second=0, microsecond=0)
+    timings = {}
+
+    def phase(name, started):
+        timings[name] = time.perf_counter() - started
+        return time.perf_counter()
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(path, isolation_level=None)
+    migrate(conn)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -400000")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    # 기록을 다 넣은 뒤 인덱스와 트리거를 만드는 편이 훨씬 빠릅니다.
+    # (트리거가 하는 일은 아래에서 한 번에 계산합니다: created_ts, school_stats/team_stats)
+    indexes = conn.execute(
+        """
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'question_results' AND sql IS NOT NULL
+        """
+    ).fetchall()
+    triggers = conn.execute(
+        """
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'trigger' AND tbl_name IN ('question_results', 'users')
+        """
+    ).fetchall()
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    for name, _ in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+
+    conn.execute("BEGIN")
+    _insert_users(conn, users, rng)
+    user_size = _user_picks(conn, users, rng, zipf)
+    question_size = _question_picks(conn, rng)
+    start_ts = _time_slots(conn, rows, days, end, rng)
+    started = phase("setup", started)
+
+    _insert_results(
+        conn, start_ts, user_size, question_size, utc_offset_seconds(end.date()), rng
+    )
+    conn.execute("COMMIT")
+    started = phase("question_results", started)
+
+    conn.execute("BEGIN")
+    rebuild_activity_rollup(conn)
+    rebuild_question_attempts(conn)
+    _update_user_totals(conn)
+    rebuild_group_stats(conn)
+    for _, sql in triggers:
+        conn.execute(sql)
+    conn.execute("COMMIT")
+    started = phase("rollups", started)
+
+    for _, sql in indexes:
+        conn.execute(sql)
+    started = phase("indexes", started)
+
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+    phase("analyze", started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 DB 생성")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument(
+        "--zipf", type=float, default=1.1, help="사용자 활동량 Zipf 지수"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--end", help="마지막 기록 시각 (YYYY-MM-DD, 기본: 현재). 같은 seed와 함께 고정하면 재현됩니다"
+    )
+    parser.add_argument("--output", default="db/bench.sqlite")
+    parser.add_argument("--force", action="store_true", help="기존 파일을 덮어씁니다")
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        if not args.force:
+            print(f"{args.output}이(가) 이미 있습니다. --force로 덮어쓸 수 있습니다.")
+            sys.exit(1)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.output + suffix):
+                os.remove(args.output + suffix)
+
+    end = None
+    if args.end:
+        end = datetime.fromisoformat(args.end).replace(tzinfo=local_timezone())
+    timings = generate(
+        args.output, args.rows, args.users, args.days, args.seed, args.zipf, end
+    )
+    print(f"{args.output}: users={args.users} rows={args.rows} seed={args.seed}")
+    for name, seconds in timings.items():
+        print(f"  {name:>16}: {seconds:6.1f}s")
+    print(f"  {'total':>16}: {sum(timings.values()):6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
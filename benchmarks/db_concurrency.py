@@ -0,0 +1,200 @@
+"""동시 제출(writer)과 대시보드 조회(reader) 상황에서 제출 지연 시간과 처리량을 측정합니다.
+
+기존 방식(호출마다 sqlite3.connect, 기본 rollback journal), utils.db의 풀링된 WAL 연결,
+utils.submissions의 write-behind 큐를 비교합니다.
+
+실행: python -m benchmarks.db_concurrency --writers 50 --readers 4 --submits 40
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import config
+from utils import db
+from utils.submissions import SubmissionQueue, Submission
+
+INSERT_RESULT = """
+INSERT INTO question_results (user_id, question_idx, topic, correct, created_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+UPDATE_USER = """
+UPDATE users
+SET points = points + ?, correct = correct + ?, incorrect = incorrect + ?
+WHERE id = ?
+"""
+DASHBOARD_QUERY = """
+SELECT u.id, COUNT(*), SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END)
+FROM question_results qr
+JOIN users u ON qr.user_id = u.id
+WHERE qr.topic = ?
+GROUP BY u.id
+"""
+
+
+def create_database(path, users):
+    conn = sqlite3.connect(path)
+    with open("db/db.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO users (name, password, school, team) VALUES (?, ?, ?, ?)",
+        [(f"user{i}", "x", config.SCHOOLS[0], config.TEAMS[0]) for i in range(users)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def write(conn, user_id, is_correct):
+    conn.execute(
+        INSERT_RESULT,
+        (user_id, 1, "cloudFundamentals", is_correct, datetime.now()),
+    )
+    conn.execute(
+        UPDATE_USER,
+        (3 if is_correct else 1, int(is_correct), int(not is_correct), user_id),
+    )
+    conn.commit()
+
+
+def submit_legacy(path, user_id, is_correct):
+    conn = sqlite3.connect(path)
+    try:
+        write(conn, user_id, is_correct)
+    finally:
+        conn.close()
+
+
+def submit_pooled(path, user_id, is_correct):
+    with db.connection() as conn:
+        write(conn, user_id, is_correct)
+
+
+_queue = None
+
+
+def submit_queued(path, user_id, is_correct):
+    now = datetime.now()
+    _queue.submit(
+        Submission(
+            user_id, 1, "cloudFundamentals", is_correct, now, int(now.timestamp())
+        )
+    )
+
+
+def read_legacy(path):
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(DASHBOARD_QUERY, ("cloudFundamentals",)).fetchall()
+    finally:
+        conn.close()
+
+
+def read_pooled(path):
+    with db.connection() as conn:
+        conn.execute(DASHBOARD_QUERY, ("cloudFundamentals",)).fetchall()
+
+
+def run(label, submit, read, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite")
+        create_database(path, args.writers)
+        config.DB_PATH = path
+        db.close_all()
+
+        latencies = []
+        errors = []
+        reads = [0]
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def writer(user_id):
+            local = []
+            for i in range(args.submits):
+                started = time.perf_counter()
+                try:
+                    submit(path, user_id, i % 2 == 0)
+                except sqlite3.OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                local.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(local)
+
+        def reader():
+            while not done.is_set():
+                try:
+                    read(path)
+                except sqlite3.OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                with lock:
+                    reads[0] += 1
+
+        readers = [threading.Thread(target=reader) for _ in range(args.readers)]
+        writers = [
+            threading.Thread(target=writer, args=(user_id,))
+            for user_id in range(1, args.writers + 1)
+        ]
+        for thread in readers:
+            thread.start()
+        started = time.perf_counter()
+        for thread in writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        if submit is submit_queued:
+            _queue.flush()
+        elapsed = time.perf_counter() - started
+        done.set()
+        for thread in readers:
+            thread.join()
+        db.close_all()
+
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(
+        f"{label:>8}: submits={len(latencies)} "
+        f"throughput={len(latencies) / elapsed:8.1f}/s "
+        f"p50={statistics.median(latencies) * 1000:7.2f}ms "
+        f"p95={pct(0.95):7.2f}ms p99={pct(0.99):7.2f}ms "
+        f"reads={reads[0]} errors={len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--submits", type=int, default=40)
+    args = parser.parse_args()
+
+    print(
+        f"writers={args.writers} readers={args.readers} "
+        f"submits/writer={args.submits}"
+    )
+    run("legacy", submit_legacy, read_legacy, args)
+    run("pooled", submit_pooled, read_pooled, args)
+
+    # write-behind 큐: 제출 지연 시간은 큐에 넣는 시간, 처리량은 모두 기록될 때까지 기준
+    global _queue
+    _queue = SubmissionQueue(
+        maxsize=config.WRITE_QUEUE_MAXSIZE,
+        batch_size=config.WRITE_QUEUE_BATCH_SIZE,
+        flush_interval=config.WRITE_QUEUE_FLUSH_INTERVAL,
+    )
+    run("queued", submit_queued, read_pooled, args)
+    _queue.shutdown()
+
+
+if __name__ == "__main__":
+    main()
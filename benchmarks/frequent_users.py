@@ -0,0 +1,82 @@
+"""get_frequent_users: 사용자별 groupby.filter(lambda) 방식과 벡터화 방식을 비교합니다.
+
+get_problem_attempts 결과와 같은 형태의 DataFrame(기본 5,000명 x 544문제)을 만들고,
+최소 시도 횟수별로 두 구현의 실행 시간과 결과 일치 여부를 출력합니다.
+
+실행: python -m benchmarks.frequent_users [--users 5000] [--questions 544]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.dashboard import get_frequent_users
+
+
+def legacy_frequent_users(problem_attempts, min_attempts):
+    user_problem_attempts = (
+        problem_attempts.groupby(["user_id", "question_idx"])
+        .agg({"user_name": "first", "attempt_count": "sum"})
+        .reset_index()
+    )
+
+    all_problems = problem_attempts["question_idx"].unique()
+    frequent_users = user_problem_attempts.groupby("user_id").filter(
+        lambda x: all(x["attempt_count"] >= min_attempts)
+        and len(x) == len(all_problems)
+    )
+
+    result = frequent_users.groupby("user_id").agg({"user_name": "first"}).reset_index()
+
+    return result.sort_values("user_name")
+
+
+def make_attempts(users, questions, seed=0):
+    rng = np.random.default_rng(seed)
+    user_ids = np.repeat(np.arange(1, users + 1), questions)
+    question_idx = np.tile(np.arange(questions), users)
+    # 일부 사용자는 모든 문제를 여러 번 풀도록 시도 횟수 분포를 사용자별로 다르게 합니다.
+    base = np.repeat(rng.integers(1, 5, size=users), questions)
+    attempt_count = base + rng.integers(0, 3, size=users * questions)
+    frame = pd.DataFrame(
+        {
+            "question_idx": question_idx,
+            "user_id": user_ids,
+            "user_name": pd.Series(user_ids).map(lambda i: f"user{i}"),
+            "attempt_count": attempt_count,
+            "correct_count": attempt_count // 2,
+        }
+    )
+    # 일부 (사용자, 문제) 조합은 시도 기록이 없도록 지웁니다.
+    return frame[rng.random(len(frame)) > 0.0005].reset_index(drop=True)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=544)
+    args = parser.parse_args()
+
+    attempts = make_attempts(args.users, args.questions)
+    print(f"users={args.users} questions={args.questions} rows={len(attempts)}")
+    print("최소 시도 횟수별 실행 시간 (ms): groupby.filter -> 벡터화")
+    for min_attempts in (1, 2, 3, 4):
+        legacy_ms, legacy = timed(legacy_frequent_users, attempts, min_attempts)
+        fast_ms, fast = timed(get_frequent_users, attempts, min_attempts)
+        same = legacy["user_id"].tolist() == fast["user_id"].tolist()
+        print(
+            f"  {min_attempts}: {legacy_ms:9.1f} -> {fast_ms:7.1f} "
+            f"(사용자 {len(fast)}명, 결과 일치: {same})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""수업 시작 시 로그인 폭주: N명이 D초 안에 로그인할 때의 응답 시간을 측정합니다.
+
+학생 5,000명이 등록된 DB에서 300명이 10초 동안 고르게 로그인하는 상황을 기본값으로,
+인덱스 없이 비밀번호까지 WHERE에 넣던 기존 방식(legacy)과
+UNIQUE 인덱스로 한 행을 찾은 뒤 해시를 비교하는 login()(indexed)을 비교합니다.
+
+실행: python -m benchmarks.login_burst [--students 5000] [--logins 300] [--seconds 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from utils import db
+from utils.auth import hash_password, login
+from utils.student_import import StudentRow, import_students
+
+LEGACY_QUERY = (
+    "SELECT * FROM users WHERE name = ? AND school = ? AND team = ? AND password = ?"
+)
+
+
+def legacy_login(username, school, team, password):
+    with db.connection() as conn:
+        return conn.execute(
+            LEGACY_QUERY, (username, school, team, hash_password(password))
+        ).fetchone()
+
+
+def make_students(count):
+    return [
+        StudentRow(
+            i,
+            f"학생{i}",
+            config.SCHOOLS[i % len(config.SCHOOLS)],
+            config.TEAMS[i % len(config.TEAMS)],
+            f"{i % 10000:04d}",
+        )
+        for i in range(count)
+    ]
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def run_burst(login_func, students, logins, seconds, seed=0):
+    rng = random.Random(seed)
+    targets = [rng.choice(students) for _ in range(logins)]
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def attempt(i):
+        nonlocal failures
+        # 로그인 요청을 seconds초 동안 고르게 보냅니다.
+        delay = start + seconds * i / logins - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        row = targets[i]
+        started = time.perf_counter()
+        user = login_func(row.name, row.school, row.team, row.pin)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if not user:
+                failures += 1
+
+    with ThreadPoolExecutor(max_workers=min(logins, 64)) as pool:
+        list(pool.map(attempt, range(logins)))
+    return latencies, failures, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--logins", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    students = make_students(args.students)
+    with tempfile.TemporaryDirectory() as tmp:
+        config.DB_PATH = os.path.join(tmp, "login.sqlite")
+        with db.connection() as conn:
+            import_students(conn, students)
+
+        for mode, login_func in (("legacy", legacy_login), ("indexed", login)):
+            if mode == "legacy":
+                # 인덱스가 없던 원래 스키마처럼 전체 스캔으로 조회합니다.
+                with db.connection() as conn:
+                    conn.execute("DROP INDEX idx_users_identity")
+                    conn.commit()
+            else:
+                with db.connection() as conn:
+                    conn.execute(
+                        "CREATE UNIQUE INDEX idx_users_identity "
+                        "ON users (name, school, team)"
+                    )
+                    conn.commit()
+
+            latencies, failures, elapsed = run_burst(
+                login_func, students, args.logins, args.seconds
+            )
+            print(
+                f"{mode:>8}: {len(latencies)}회 / {elapsed:.1f}s, 실패 {failures}, "
+                f"p50 {percentile(latencies, 50):.2f}ms "
+                f"p95 {percentile(latencies, 95):.2f}ms "
+                f"p99 {percentile(latencies, 99):.2f}ms"
+            )
+        db.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Problem-Centric Dashboard 조회: 원본 GROUP BY와 question_attempts 요약 테이블을 비교합니다.
+
+모든 사용자가 모든 문제를 1~4회 푼 DB(기본 1,000명 x 544문제)를 만들고,
+주제별로 전체 기간 조회 시간을 측정합니다.
+
+실행: python -m benchmarks.problem_attempts [--users 1000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import config
+from utils import dashboard
+from utils.migrations import migrate
+
+RAW_QUERY = """
+SELECT qr.question_idx, u.id, u.name, COUNT(*),
+    SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END),
+    MIN(qr.created_ts), MAX(qr.created_ts)
+FROM question_results qr
+JOIN users u ON qr.user_id = u.id
+WHERE qr.topic = ?
+GROUP BY qr.question_idx, u.id, u.name
+ORDER BY qr.question_idx, COUNT(*) DESC
+"""
+
+
+def populate(conn, users, seed=0):
+    rng = random.Random(seed)
+    conn.executemany(
+        "INSERT INTO users (name, password, school, team) VALUES (?, 'x', ?, ?)",
+        ((f"user{i}", rng.choice(config.SCHOOLS), rng.choice(config.TEAMS))
+         for i in range(users)),
+    )
+    start = datetime.now() - timedelta(days=60)
+
+    def generate():
+        for topic, topic_config in config.TOPICS.items():
+            for question_idx in topic_config["idx_list"]:
+                for user_id in range(1, users + 1):
+                    for _ in range(rng.randint(1, 4)):
+                        created = start + timedelta(seconds=rng.randrange(60 * 86400))
+                        yield (
+                            question_idx,
+                            topic,
+                            user_id,
+                            rng.random() < 0.6,
+                            created.strftime("%Y-%m-%d %H:%M:%S"),
+                        )
+
+    conn.executemany(
+        """
+        INSERT INTO question_results (question_idx, topic, user_id, correct, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        generate(),
+    )
+    conn.commit()
+
+
+def timed(conn, query, params):
+    started = time.perf_counter()
+    rows = conn.execute(query, params).fetchall()
+    return (time.perf_counter() - started) * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.sqlite"))
+        with open("db/db.sql", "r", encoding="utf-8") as f:
+            conn.executescript(f.read())
+
+        started = time.perf_counter()
+        populate(conn, args.users)
+        total = conn.execute("SELECT COUNT(*) FROM question_results").fetchone()[0]
+        print(f"users={args.users} rows={total} 생성: {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        migrate(conn)
+        print(f"마이그레이션 (요약 테이블 생성 포함): {time.perf_counter() - started:.1f}s")
+
+        print("주제별 전체 기간 조회 (ms): 원본 GROUP BY -> question_attempts")
+        for topic in config.TOPICS:
+            raw_ms, raw_rows = timed(conn, RAW_QUERY, (topic,))
+            query, params = dashboard.problem_attempts_query(topic)
+            summary_ms, summary_rows = timed(conn, query, params)
+            print(
+                f"{topic:>30}: {raw_ms:8.1f} -> {summary_ms:8.1f} "
+                f"(rows {raw_rows} / {summary_rows})"
+            )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""JSON 로딩(load_homework_questions)과 컴파일된 문제 은행의 로딩 지연 시간을 비교합니다.
+
+실행: python -m benchmarks.question_bank_load [--repeat 200]
+컴파일된 파일이 없으면 먼저 python -m utils.compiled_bank 로 생성합니다.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+import config
+from utils.compiled_bank import CompiledBank, compile_bank
+from utils.helpers import load_homework_questions
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--topic", default="cloudFundamentals", choices=config.TOPICS)
+    args = parser.parse_args()
+
+    if not os.path.exists(config.COMPILED_BANK_FILE):
+        compile_bank()
+
+    file_path = config.TOPICS[args.topic]["file"]
+    idx_list = config.TOPICS[args.topic]["idx_list"]
+    rng = random.Random(0)
+
+    def json_cold():
+        load_homework_questions(file_path)
+
+    def compiled_cold():
+        bank = CompiledBank(config.COMPILED_BANK_FILE)
+        bank.get_question(idx_list[0])
+        bank.close()
+
+    def json_question():
+        # 기존 방식: 세션이 시작될 때마다 주제 전체를 파싱한 뒤 한 문제를 꺼냄
+        position = rng.randrange(len(idx_list))
+        load_homework_questions(file_path)[position]
+
+    bank = CompiledBank(config.COMPILED_BANK_FILE)
+
+    def compiled_question():
+        bank.get_question(rng.choice(idx_list))
+
+    print(f"topic={args.topic} repeat={args.repeat} (단위: µs, median / p95)")
+    for label, func in [
+        ("cold start: json", json_cold),
+        ("cold start: compiled", compiled_cold),
+        ("question: json", json_question),
+        ("question: compiled", compiled_question),
+    ]:
+        median, p95 = timed(func, args.repeat)
+        print(f"{label:>22}: {median:10.1f} / {p95:10.1f}")
+    bank.close()
+
+
+if __name__ == "__main__":
+    main()
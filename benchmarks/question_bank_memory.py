@@ -0,0 +1,66 @@
+"""N개의 가상 세션이 문제 은행을 들고 있을 때의 메모리 사용량을 비교합니다.
+
+실행: python -m benchmarks.question_bank_memory --sessions 300
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import config
+from utils.helpers import load_homework_questions
+from utils.question_bank import clear_cache, get_topic_questions
+
+
+def simulate_per_session(file_path, sessions):
+    # 기존 방식: 세션마다 JSON 전체를 파싱해서 session_state에 보관
+    return [
+        {"questions": load_homework_questions(file_path), "current_question": 0}
+        for _ in range(sessions)
+    ]
+
+
+def simulate_shared(file_path, sessions):
+    # 공유 방식: 세션에는 현재 문제 위치만 보관하고, 문제는 공유 은행에서 참조
+    states = []
+    for _ in range(sessions):
+        get_topic_questions(file_path)
+        states.append({"current_question": 0})
+    return states
+
+
+def measure(func, file_path, sessions):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    states = func(file_path, sessions)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del states
+    return current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--topic", default="cloudFundamentals", choices=config.TOPICS)
+    args = parser.parse_args()
+
+    file_path = config.TOPICS[args.topic]["file"]
+    print(f"topic={args.topic} sessions={args.sessions}")
+    for label, func in [
+        ("per-session", simulate_per_session),
+        ("shared", simulate_shared),
+    ]:
+        clear_cache()
+        current, peak, elapsed = measure(func, file_path, args.sessions)
+        print(
+            f"{label:>12}: retained={current / 2**20:8.2f} MiB "
+            f"peak={peak / 2**20:8.2f} MiB time={elapsed * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""DB 조회 함수와 답안 제출 경로 벤치마크 모음.
+
+benchmarks.dataset으로 만든 가상 DB(기본 1만/100만/1000만 행)에서 다음 함수의
+실행 시간을 재고, 결과를 JSON으로 저장하거나 저장해 둔 기준(baseline)과 비교합니다.
+
+- 답안 제출: save_question_result (제출 큐 없이 바로 기록)
+- 로그인: login
+- 랭킹: get_overall_ranking, get_school_ranking, get_team_ranking,
+  build_snapshot (랭킹 페이지 스냅샷)
+- 대시보드: get_daily_stats, get_topic_progress, get_hourly_activity,
+  get_problem_attempts, get_frequent_users
+
+대시보드 함수는 결과 캐시를 거치지 않고 매번 DB를 조회합니다. 날짜 범위는
+대시보드 기본값(최근 30일)과 같고, 가상 DB의 마지막 시각은 고정되어 있어 매번 같은 데이터를 씁니다.
+가상 DB는 --data-dir에 한 번 만들어 두고 재사용합니다. (1000만 행은 생성에 수 분 걸립니다)
+
+중앙값이 기준보다 --threshold 비율 이상, 그리고 --min-delta-ms 이상 느려지면
+회귀로 보고 종료 코드 1로 끝납니다.
+
+실행:
+  python -m benchmarks.suite --sizes 10k,1m --output bench.json
+  python -m benchmarks.suite --baseline bench.json [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import config
+from benchmarks.dataset import generate
+from utils import db, slow_queries
+from utils.auth import login
+from utils.dashboard import (
+    get_daily_stats,
+    get_frequent_users,
+    get_hourly_activity,
+    get_problem_attempts,
+    get_topic_progress,
+)
+from utils.helpers import local_timezone
+from utils.leaderboard import build_snapshot
+from utils.ranking import get_overall_ranking, get_school_ranking, get_team_ranking
+
+# 이름 -> (결과 행 수, 사용자 수)
+SIZES = {
+    "10k": (10_000, 500),
+    "1m": (1_000_000, 5000),
+    "10m": (10_000_000, 5000),
+}
+SEED = 0
+END = datetime(2026, 3, 2, 18, 0)  # 가상 DB의 마지막 기록 시각 (월요일 저녁)
+DAYS = 60
+DASHBOARD_DAYS = 30
+FREQUENT_MIN_ATTEMPTS = 2
+BENCH_USER = ("벤치마크", config.SCHOOLS[0], config.TEAMS[0])
+
+
+def dataset_path(data_dir, size):
+    return os.path.join(data_dir, f"bench-{size}.sqlite")
+
+
+def ensure_dataset(data_dir, size):
+    """size 크기의 가상 DB가 없으면 만들고 경로를 반환합니다."""
+    rows, users = SIZES[size]
+    path = dataset_path(data_dir, size)
+    if not os.path.exists(path):
+        print(f"가상 DB 생성: {path} ({rows:,}행, 사용자 {users:,}명)", file=sys.stderr)
+        os.makedirs(data_dir, exist_ok=True)
+        # 중간에 멈춰도 불완전한 DB가 남지 않도록 임시 파일에 만든 뒤 옮깁니다.
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        end = END.replace(tzinfo=local_timezone())
+        generate(tmp_path, rows, users, DAYS, SEED, end=end)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _uncached(func):
+    # versioned_cache로 감싼 함수는 원래 함수를 직접 호출해 매번 DB를 조회합니다.
+    return getattr(func, "__wrapped__", func)
+
+
+def _busiest_weekday(end):
+    day = end.date() - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def read_cases():
+    """(이름, 함수) 목록. 조회만 하므로 몇 번을 실행해도 DB가 바뀌지 않습니다."""
+    topic = next(iter(config.TOPICS))
+    day = _busiest_weekday(END)
+    end_date = END.date()
+    start_date = end_date - timedelta(days=DASHBOARD_DAYS)
+
+    with db.connection() as conn:
+        user = conn.execute(
+            "SELECT id, name, school, team FROM users ORDER BY id LIMIT 1"
+        ).fetchone()
+    # benchmarks.dataset은 id번 사용자의 PIN을 (id - 1) % 10000의 4자리로 만듭니다.
+    pin = f"{(user['id'] - 1) % 10000:04d}"
+
+    attempts = _uncached(get_problem_attempts)(topic, start_date, end_date)
+
+    return [
+        ("login", lambda: login(user["name"], user["school"], user["team"], pin)),
+        ("get_overall_ranking", lambda: get_overall_ranking()),
+        ("build_snapshot", build_snapshot),
+        ("get_school_ranking", get_school_ranking),
+        ("get_team_ranking", get_team_ranking),
+        ("get_daily_stats", lambda: _uncached(get_daily_stats)(day, topic)),
+        (
+            "get_topic_progress",
+            lambda: _uncached(get_topic_progress)(topic, start_date, end_date),
+        ),
+        ("get_hourly_activity", lambda: _uncached(get_hourly_activity)(day, topic)),
+        (
+            "get_problem_attempts",
+            lambda: _uncached(get_problem_attempts)(topic, start_date, end_date),
+        ),
+        (
+            "get_frequent_users",
+            lambda: get_frequent_users(attempts, FREQUENT_MIN_ATTEMPTS),
+        ),
+    ]
+
+
+def _remove_bench_user(conn):
+    # 벤치마크 사용자의 기록과 집계를 지워 가상 DB를 원래 상태로 되돌립니다.
+    row = conn.execute(
+        "SELECT id FROM users WHERE name = ? AND school = ? AND team = ?", BENCH_USER
+    ).fetchone()
+    if row is None:
+        return
+    for table in ("question_results", "activity_rollup", "question_attempts"):
+        conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (row[0],))
+    conn.execute("DELETE FROM users WHERE id = ?", (row[0],))  # 소속/팀 집계는 트리거가 갱신
+    conn.commit()
+
+
+def measure_submit(min_time, min_runs, max_runs):
+    """벤치마크 전용 사용자로 답안을 기록하고, 끝나면 그 기록을 모두 지웁니다."""
+    # q_page_format은 streamlit을 불러오므로 제출 벤치마크에서만 가져옵니다.
+    from q_page_format import save_question_result
+
+    topics = list(config.TOPICS.items())
+    with db.connection() as conn:
+        _remove_bench_user(conn)
+        user_id = conn.execute(
+            "INSERT INTO users (name, school, team, password) VALUES (?, ?, ?, '')",
+            BENCH_USER,
+        ).lastrowid
+        conn.commit()
+
+    count = 0
+
+    def submit():
+        nonlocal count
+        topic, topic_config = topics[count % len(topics)]
+        idx_list = topic_config["idx_list"]
+        question_idx = idx_list[count % len(idx_list)]
+        save_question_result(user_id, question_idx, count % 3 != 0, topic)
+        count += 1
+
+    try:
+        return measure(submit, min_time, min_runs, max_runs)
+    finally:
+        with db.connection() as conn:
+            _remove_bench_user(conn)
+
+
+def measure(func, min_time, min_runs, max_runs):
+    """한 번 미리 실행한 뒤, min_runs회 이상 min_time초 동안(최대 max_runs회) 실행 시간을 잽니다."""
+    func()
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_runs and (
+        len(times) < min_runs or time.perf_counter() - started < min_time
+    ):
+        t = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - t) * 1000)
+    return {
+        "runs": len(times),
+        "min_ms": round(min(times), 4),
+        "median_ms": round(statistics.median(times), 4),
+        "p95_ms": round(statistics.quantiles(times, n=20)[18], 4),
+        "max_ms": round(max(times), 4),
+    }
+
+
+def run_size(path, min_time, min_runs, max_runs):
+    config.DB_PATH = path
+    db.close_all()
+    results = {}
+    for name, func in read_cases():
+        results[name] = measure(func, min_time, min_runs, max_runs)
+        print(f"  {name:>22}: {results[name]['median_ms']:10.3f} ms", file=sys.stderr)
+    # 쓰기는 조회를 모두 잰 뒤에 실행합니다.
+    results["save_question_result"] = measure_submit(min_time, min_runs, max_runs)
+    print(
+        f"  {'save_question_result':>22}: "
+        f"{results['save_question_result']['median_ms']:10.3f} ms",
+        file=sys.stderr,
+    )
+    db.close_all()
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """기준과 비교한 (크기, 이름, 기준 중앙값, 현재 중앙값, 회귀 여부) 목록을 반환합니다."""
+    rows = []
+    for size, cases in results.items():
+        base_cases = baseline.get("results", {}).get(size, {})
+        for name, stats in cases.items():
+            base = base_cases.get(name)
+            if base is None:
+                continue
+            before, after = base["median_ms"], stats["median_ms"]
+            regressed = (
+                after > before * (1 + threshold) and after - before > min_delta_ms
+            )
+            rows.append((size, name, before, after, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", default=",".join(SIZES), help=f"실행할 크기 ({', '.join(SIZES)})"
+    )
+    parser.add_argument("--data-dir", default="db", help="가상 DB를 보관할 폴더")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 JSON 파일")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="회귀로 볼 느려진 비율 (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=0.5, help="이보다 작은 차이는 무시합니다"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="함수별 최소 측정 시간(초)"
+    )
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=200)
+    args = parser.parse_args()
+
+    sizes = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"알 수 없는 크기: {', '.join(unknown)}")
+    args.min_runs = max(args.min_runs, 2)
+
+    # 큐를 거치면 제출 시간이 아니라 큐에 넣는 시간만 재게 됩니다.
+    config.WRITE_QUEUE_ENABLED = False
+    # 느린 쿼리 기록(EXPLAIN, 파일 쓰기)이 측정 시간에 섞이지 않게 끕니다.
+    slow_queries.set_threshold_ms(None)
+
+    results = {}
+    for size in sizes:
+        path = ensure_dataset(args.data_dir, size)
+        print(f"{size} ({path})", file=sys.stderr)
+        results[size] = run_size(path, args.min_time, args.min_runs, args.max_runs)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": SEED,
+            "end": END.isoformat(),
+            "sizes": {size: SIZES[size] for size in sizes},
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold, args.min_delta_ms)
+        print(f"\n기준 비교: {args.baseline}", file=sys.stderr)
+        print(
+            f"{'크기':>5} {'함수':>22} {'기준':>10} {'현재':>10} {'변화':>8}",
+            file=sys.stderr,
+        )
+        for size, name, before, after, regressed in rows:
+            change = (after - before) / before * 100 if before else 0
+            mark = "  회귀" if regressed else ""
+            print(
+                f"{size:>5} {name:>22} {before:10.3f} {after:10.3f} {change:+7.1f}%{mark}",
+                file=sys.stderr,
+            )
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""날짜 조건 쿼리: date(created_at) 방식과 created_ts 범위 조건 방식을 비교합니다.
+
+기존 스키마(db/db.sql + 0001 인덱스)로 N건의 풀이 기록을 만든 뒤 기존 쿼리를 측정하고,
+마이그레이션(created_ts 백필 포함)을 적용한 뒤 현재 대시보드 쿼리를 측정합니다.
+
+실행: python -m benchmarks.timestamp_filters --rows 5000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import config
+from utils import dashboard
+from utils.migrations import migrate
+
+TOPIC = "cloudFundamentals"
+
+LEGACY_QUERIES = {
+    "get_daily_stats": """
+    SELECT u.id, u.name, u.school, u.team, COUNT(*),
+        SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN qr.correct = 0 THEN 1 ELSE 0 END)
+    FROM question_results qr
+    JOIN users u ON qr.user_id = u.id
+    WHERE date(qr.created_at) = ?
+    AND qr.topic = ?
+    GROUP BY u.id, u.name, u.school, u.team
+    """,
+    "get_hourly_activity": """
+    SELECT u.id, u.name, strftime('%H', qr.created_at) as hour, COUNT(*)
+    FROM question_results qr
+    JOIN users u ON qr.user_id = u.id
+    WHERE date(qr.created_at) = ?
+    AND qr.topic = ?
+    GROUP BY u.id, u.name, strftime('%H', qr.created_at)
+    ORDER BY u.id, hour
+    """,
+    "get_problem_attempts (7일)": """
+    SELECT qr.question_idx, u.id, u.name, COUNT(*),
+        SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END),
+        MIN(qr.created_at), MAX(qr.created_at)
+    FROM question_results qr
+    JOIN users u ON qr.user_id = u.id
+    WHERE qr.topic = ?
+    AND DATE(qr.created_at) BETWEEN ? AND ?
+    GROUP BY qr.question_idx, u.id, u.name
+    ORDER BY qr.question_idx, COUNT(*) DESC
+    """,
+}
+
+
+def populate(conn, rows, users, days, seed=0):
+    rng = random.Random(seed)
+    topics = list(config.TOPICS)
+    idx_lists = [config.TOPICS[topic]["idx_list"] for topic in topics]
+    start = datetime.combine(date.today() - timedelta(days=days), datetime.min.time())
+    span = days * 86400
+
+    conn.executemany(
+        "INSERT INTO users (name, password, school, team) VALUES (?, 'x', ?, ?)",
+        (
+            (f"user{i}", rng.choice(config.SCHOOLS), rng.choice(config.TEAMS))
+            for i in range(users)
+        ),
+    )
+
+    def generate():
+        for _ in range(rows):
+            t = rng.randrange(len(topics))
+            created = start + timedelta(seconds=rng.randrange(span))
+            yield (
+                rng.choice(idx_lists[t]),
+                topics[t],
+                rng.randrange(1, users + 1),
+                rng.random() < 0.6,
+                created.strftime("%Y-%m-%d %H:%M:%S"),
+            )
+
+    conn.executemany(
+        """
+        INSERT INTO question_results (question_idx, topic, user_id, correct, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        generate(),
+    )
+    conn.commit()
+
+
+def timed(conn, query, params, repeat):
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(conn.execute(query, params).fetchall())
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # created_at 문자열은 서버 시간대로 읽히므로(0002 마이그레이션), 대시보드 기준 시간대와 맞춰야
+    # 두 방식의 결과 행 수가 같습니다.
+    os.environ["TZ"] = config.TIMEZONE
+    time.tzset()
+
+    day = date.today() - timedelta(days=args.days // 2)
+    week_end = day + timedelta(days=6)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.sqlite"))
+        with open("db/db.sql", "r", encoding="utf-8") as f:
+            conn.executescript(f.read())
+
+        started = time.perf_counter()
+        populate(conn, args.rows, args.users, args.days)
+        print(f"rows={args.rows} 생성: {time.perf_counter() - started:.1f}s")
+
+        # 기존 방식: 0001 인덱스만 있는 상태
+        conn.execute(
+            "CREATE INDEX idx_legacy_topic_created_at "
+            "ON question_results (topic, created_at)"
+        )
+        conn.execute(
+            "CREATE INDEX idx_legacy_topic_question_user "
+            "ON question_results (topic, question_idx, user_id)"
+        )
+        conn.commit()
+        legacy = {
+            "get_daily_stats": (day.isoformat(), TOPIC),
+            "get_hourly_activity": (day.isoformat(), TOPIC),
+            "get_problem_attempts (7일)": (
+                TOPIC,
+                day.isoformat(),
+                week_end.isoformat(),
+            ),
+        }
+        results = {}
+        for name, params in legacy.items():
+            results[name] = [timed(conn, LEGACY_QUERIES[name], params, args.repeat)]
+        conn.execute("DROP INDEX idx_legacy_topic_created_at")
+        conn.execute("DROP INDEX idx_legacy_topic_question_user")
+        conn.commit()
+
+        started = time.perf_counter()
+        migrate(conn)
+        print(f"마이그레이션 (created_ts 백필 포함): {time.perf_counter() - started:.1f}s")
+
+        current = {
+            "get_daily_stats": dashboard.daily_stats_query(day, TOPIC),
+            "get_hourly_activity": dashboard.hourly_activity_query(day, TOPIC),
+            "get_problem_attempts (7일)": dashboard.problem_attempts_query(
+                TOPIC, day, week_end
+            ),
+        }
+        for name, (query, params) in current.items():
+            results[name].append(timed(conn, query, params, args.repeat))
+        conn.close()
+
+    print("쿼리 (best of repeat, ms): date(created_at) -> created_ts 범위")
+    for name, ((old_ms, old_rows), (new_ms, new_rows)) in results.items():
+        print(
+            f"{name:>28}: {old_ms:9.1f} -> {new_ms:9.1f} "
+            f"(rows {old_rows} / {new_rows})"
+        )
+
+
+if __name__ == "__main__":
+    main()
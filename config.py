@@ -7,6 +7,9 @@ APP_ICON = "🧭"
 # 챌린지 설정
 CHALLENGE_SIZE = 2  # 퀴즈 문제 수
 
+# 컴파일된 문제 은행 파일 (python -m utils.compiled_bank 로 생성)
+COMPILED_BANK_FILE = "exam/questions.bin"
+
 # config.py
 
 TOPICS = {
@@ -616,6 +619,60 @@ TOPICS = {
         ],
     },
 }
+# 풀이 기록과 대시보드의 기준 시간대 (question_results.created_ts는 epoch 초로 저장)
+TIMEZONE = "Asia/Seoul"
+
+# 데이터베이스 설정
+DB_PATH = "db/db.sqlite"
+DB_POOL_SIZE = 16  # 풀에 보관할 최대 유휴 연결 수
+DB_BUSY_TIMEOUT_MS = 5000
+DB_CACHE_SIZE = -32000  # 음수는 KiB 단위 (약 32MB)
+DB_MMAP_SIZE = 256 * 1024 * 1024
+
+# 답안 제출 write-behind 큐 설정
+WRITE_QUEUE_ENABLED = True
+WRITE_QUEUE_MAXSIZE = 10000  # 가득 차면 제출한 스레드에서 직접 기록
+WRITE_QUEUE_BATCH_SIZE = 500  # 한 트랜잭션에 기록할 최대 제출 수
+WRITE_QUEUE_FLUSH_INTERVAL = 0.05  # 배치를 모으는 최대 대기 시간(초)
+WRITE_QUEUE_MAX_BACKOFF = 5.0  # 잠금 대기로 실패한 배치를 다시 시도하는 간격의 최대값(초)
+WRITE_QUEUE_SPILL_FILE = "db/pending_submissions.jsonl"  # 기록하지 못한 제출 보관 (다음 시작 시 다시 기록)
+
+# 대시보드 조회 결과 캐시 (LRU)
+DASHBOARD_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DASHBOARD_CACHE_MAX_ENTRIES = 512
+
+# 문제별 상세 정보 페이지 크기와 한 번의 rerun에서 그리는 사용자 metric 최대 수
+PROBLEM_DETAIL_PAGE_SIZES = [10, 20, 50]
+PROBLEM_DETAIL_MAX_METRICS = 300
+
+# 성능 측정 (관리자 페이지 "성능" 탭에서 켜고 끌 수 있음)
+TRACING_ENABLED = False
+TRACING_MAX_SAMPLES = 2000  # 구간별로 p50/p95 계산에 쓰는 최근 샘플 수
+TRACING_RECENT_RERUNS = 50  # 보관할 최근 rerun 수
+
+# 느린 SQL 기록 (None이면 기록하지 않음, 관리자 페이지 "느린 쿼리" 탭에서 변경 가능)
+SLOW_QUERY_THRESHOLD_MS = 200
+SLOW_QUERY_LOG_FILE = "logs/slow_queries.log"
+SLOW_QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 3
+# 바인딩 파라미터 값도 기록할지 (기본은 개수만 남기고 값은 가림. password가 들어간 SQL은 항상 가림)
+SLOW_QUERY_LOG_PARAMS = False
+
+# 세션별 프로파일러 (관리자 페이지 "프로파일러" 탭에서 대상 사용자 지정)
+PROFILER_INTERVAL_MS = 5  # 호출 스택 샘플링 간격
+PROFILER_MAX_SECONDS = 60  # rerun 하나를 샘플링하는 최대 시간
+PROFILER_MAX_PROFILES = 20  # 보관할 프로파일 수
+PROFILER_QUERY_PARAM = False  # True이면 ?profile=N 으로 현재 세션의 다음 N회 rerun을 프로파일링
+
+# 서비스 중 집계 테이블 재계산 (utils.rollups.rebuild_in_chunks)
+ROLLUP_REBUILD_CHUNK_QUESTIONS = 20  # question_attempts를 한 트랜잭션에서 다시 계산할 문제 수
+ROLLUP_REBUILD_PAUSE = 0.005  # 트랜잭션 사이에 답안 기록에 양보하는 최소 시간(초)
+
+# 랭킹 페이지 스냅샷 갱신 주기(초): 이보다 오래된 스냅샷을 읽으면 다시 만듭니다.
+LEADERBOARD_REFRESH_SECONDS = 5
+# 스냅샷에 담을 전체/소속별/팀별 랭킹 상위 인원 (그 뒤 페이지는 SQL로 조회해 캐시)
+LEADERBOARD_SNAPSHOT_ROWS = 200
+
 # 관리자 설정
 ADMIN_PASSWORD = "4808"
 
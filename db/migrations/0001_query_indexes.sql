@@ -0,0 +1,17 @@
+-- 대시보드 및 로그인 쿼리 패턴에 맞춘 인덱스
+
+-- get_daily_stats, get_hourly_activity: topic + 날짜 조건
+CREATE INDEX IF NOT EXISTS idx_question_results_topic_created_at
+    ON question_results (topic, created_at);
+
+-- get_topic_progress, get_problem_attempts: topic + 문제별/사용자별 집계
+CREATE INDEX IF NOT EXISTS idx_question_results_topic_question_user
+    ON question_results (topic, question_idx, user_id);
+
+-- 사용자별 풀이 기록 조회
+CREATE INDEX IF NOT EXISTS idx_question_results_user_created_at
+    ON question_results (user_id, created_at);
+
+-- login: name, school, team으로 사용자 조회
+CREATE INDEX IF NOT EXISTS idx_users_name_school_team
+    ON users (name, school, team);
@@ -0,0 +1,51 @@
+"""question_results에 epoch 초 단위 created_ts 컬럼을 추가하고 기존 기록을 채웁니다.
+
+created_ts 없이 들어온 created_at은 스키마 기본값 datetime('now', 'localtime')과 같이
+서버 시간대 기준 로컬 시각 문자열입니다. (이전 버전 앱도 datetime.now()로 기록)
+그래서 config.TIMEZONE의 고정 오프셋 대신 SQLite의 'utc' 변환으로 서버 시간대를 그대로 따릅니다.
+일광 절약 시간도 날짜별로 반영되지만, 일광 절약 시간이 끝나는 날 두 번 나타나는
+한 시간은 둘 중 어느 쪽인지 구분할 수 없습니다. (config.TIMEZONE인 Asia/Seoul은 해당 없음)
+
+date(created_at)처럼 컬럼을 함수로 감싸면 인덱스를 쓸 수 없으므로, 대시보드는
+created_ts에 대한 범위 조건으로 조회합니다.
+"""
+
+
+def migrate(conn):
+    conn.execute("ALTER TABLE question_results ADD COLUMN created_ts INTEGER")
+    conn.execute(
+        """
+        UPDATE question_results
+        SET created_ts = CAST(strftime('%s', created_at, 'utc') AS INTEGER)
+        WHERE created_ts IS NULL
+        """
+    )
+
+    # created_ts 없이 추가된 기록(기본값 created_at 사용)도 채웁니다.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_question_results_created_ts
+        AFTER INSERT ON question_results
+        WHEN NEW.created_ts IS NULL
+        BEGIN
+            UPDATE question_results
+            SET created_ts = CAST(strftime('%s', NEW.created_at, 'utc') AS INTEGER)
+            WHERE id = NEW.id;
+        END
+        """
+    )
+
+    conn.execute("DROP INDEX IF EXISTS idx_question_results_topic_created_at")
+    conn.execute("DROP INDEX IF EXISTS idx_question_results_user_created_at")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_question_results_topic_created_ts
+            ON question_results (topic, created_ts)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_question_results_user_created_ts
+            ON question_results (user_id, created_ts)
+        """
+    )
@@ -0,0 +1,20 @@
+"""Homework Dashboard용 (topic, day, user_id, hour)별 집계 테이블을 만들고 채웁니다."""
+
+from utils.rollups import rebuild_activity_rollup
+
+
+def migrate(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS activity_rollup (
+            topic TEXT NOT NULL,
+            day TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            hour INTEGER NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (topic, day, user_id, hour)
+        ) WITHOUT ROWID
+        """
+    )
+    rebuild_activity_rollup(conn)
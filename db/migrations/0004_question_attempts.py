@@ -0,0 +1,21 @@
+"""Problem-Centric Dashboard용 (topic, question_idx, user_id)별 시도 요약 테이블을 만들고 채웁니다."""
+
+from utils.rollups import rebuild_question_attempts
+
+
+def migrate(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS question_attempts (
+            topic TEXT NOT NULL,
+            question_idx INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            attempt_count INTEGER NOT NULL DEFAULT 0,
+            correct_count INTEGER NOT NULL DEFAULT 0,
+            first_attempt INTEGER,
+            last_attempt INTEGER,
+            PRIMARY KEY (topic, question_idx, user_id)
+        ) WITHOUT ROWID
+        """
+    )
+    rebuild_question_attempts(conn)
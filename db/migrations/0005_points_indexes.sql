@@ -0,0 +1,10 @@
+-- 랭킹: 점수 순 정렬, 소속/팀 필터, 내 순위(COUNT(points > ?)) 조회용 인덱스
+
+CREATE INDEX IF NOT EXISTS idx_users_points
+    ON users (points DESC);
+
+CREATE INDEX IF NOT EXISTS idx_users_school_points
+    ON users (school, points DESC);
+
+CREATE INDEX IF NOT EXISTS idx_users_team_points
+    ON users (team, points DESC);
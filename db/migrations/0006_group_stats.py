@@ -0,0 +1,73 @@
+"""소속(school_stats)/팀(team_stats)별 총점, 인원, 정답/오답 수 집계 테이블을 만듭니다.
+
+users의 INSERT/DELETE/UPDATE 트리거로 갱신하므로 답안 제출, 회원가입,
+관리자 페이지의 수정/삭제가 모두 반영됩니다. 소속/팀이 없는 사용자는 ''로 집계합니다.
+"""
+
+from utils.migrations import split_statements
+from utils.rollups import rebuild_group_stats
+
+_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    {column} TEXT PRIMARY KEY,
+    total_points INTEGER NOT NULL DEFAULT 0,
+    member_count INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    incorrect INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# {sign}가 +이면 NEW 행을 더하고, -이면 OLD 행을 뺍니다.
+_APPLY = """
+    INSERT INTO {table} ({column}, total_points, member_count, correct, incorrect)
+    VALUES (
+        IFNULL({row}.{column}, ''),
+        {sign}IFNULL({row}.points, 0),
+        {sign}1,
+        {sign}IFNULL({row}.correct, 0),
+        {sign}IFNULL({row}.incorrect, 0)
+    )
+    ON CONFLICT ({column}) DO UPDATE SET
+        total_points = total_points + excluded.total_points,
+        member_count = member_count + excluded.member_count,
+        correct = correct + excluded.correct,
+        incorrect = incorrect + excluded.incorrect;
+"""
+
+_CLEANUP = """
+    DELETE FROM {table} WHERE {column} = IFNULL(OLD.{column}, '') AND member_count <= 0;
+"""
+
+
+def _trigger_sql(table, column):
+    add = _APPLY.format(table=table, column=column, row="NEW", sign="+")
+    remove = _APPLY.format(table=table, column=column, row="OLD", sign="-")
+    cleanup = _CLEANUP.format(table=table, column=column)
+    return f"""
+CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON users
+BEGIN
+{add}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON users
+BEGIN
+{remove}
+{cleanup}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_{table}_update
+AFTER UPDATE OF {column}, points, correct, incorrect ON users
+BEGIN
+{remove}
+{add}
+{cleanup}
+END;
+"""
+
+
+def migrate(conn):
+    for table, column in (("school_stats", "school"), ("team_stats", "team")):
+        script = _TABLE.format(table=table, column=column) + _trigger_sql(table, column)
+        for statement in split_statements(script):
+            conn.execute(statement)
+    rebuild_group_stats(conn)
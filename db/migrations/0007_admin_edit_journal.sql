@@ -0,0 +1,13 @@
+-- 관리자 일괄 수정 되돌리기 기록
+-- payload: {"columns": [...], "key_columns": [...], "updated": [[...]], "deleted": [[...]]}
+-- (수정/삭제되기 전의 행 전체)
+
+CREATE TABLE IF NOT EXISTS admin_edit_journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    updated_count INTEGER NOT NULL,
+    deleted_count INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    undone_at TIMESTAMP
+);
@@ -0,0 +1,75 @@
+"""같은 (이름, 학교, 팀)으로 중복 가입된 사용자를 합치고 UNIQUE 인덱스를 만듭니다.
+
+가장 먼저 가입한 계정(id가 가장 작은 계정)을 남기고, 나머지 계정의 풀이 기록과
+점수/정답/오답 수를 옮긴 뒤 삭제합니다. 비밀번호는 남기는 계정의 것을 사용합니다.
+"""
+
+from utils.rollups import rebuild_activity_rollup, rebuild_question_attempts
+
+
+def migrate(conn):
+    conn.execute(
+        "CREATE TEMP TABLE user_merge (old_id INTEGER PRIMARY KEY, keep_id INTEGER)"
+    )
+    conn.execute(
+        """
+        INSERT INTO user_merge (old_id, keep_id)
+        SELECT u.id, k.keep_id
+        FROM users u
+        JOIN (
+            SELECT name, school, team, MIN(id) AS keep_id
+            FROM users
+            GROUP BY name, school, team
+            HAVING COUNT(*) > 1
+        ) k ON u.name = k.name AND u.school IS k.school AND u.team IS k.team
+        WHERE u.id != k.keep_id
+        """
+    )
+
+    if conn.execute("SELECT COUNT(*) FROM user_merge").fetchone()[0]:
+        conn.execute(
+            """
+            UPDATE question_results
+            SET user_id = (
+                SELECT keep_id FROM user_merge WHERE old_id = question_results.user_id
+            )
+            WHERE user_id IN (SELECT old_id FROM user_merge)
+            """
+        )
+        conn.execute(
+            """
+            UPDATE users
+            SET points = IFNULL(points, 0) + (
+                    SELECT IFNULL(SUM(d.points), 0) FROM users d
+                    JOIN user_merge m ON d.id = m.old_id
+                    WHERE m.keep_id = users.id
+                ),
+                correct = IFNULL(correct, 0) + (
+                    SELECT IFNULL(SUM(d.correct), 0) FROM users d
+                    JOIN user_merge m ON d.id = m.old_id
+                    WHERE m.keep_id = users.id
+                ),
+                incorrect = IFNULL(incorrect, 0) + (
+                    SELECT IFNULL(SUM(d.incorrect), 0) FROM users d
+                    JOIN user_merge m ON d.id = m.old_id
+                    WHERE m.keep_id = users.id
+                )
+            WHERE id IN (SELECT keep_id FROM user_merge)
+            """
+        )
+        conn.execute("DELETE FROM users WHERE id IN (SELECT old_id FROM user_merge)")
+
+        # 사용자별 집계 테이블은 다시 계산합니다. (소속/팀 집계는 users 트리거가 갱신합니다)
+        rebuild_activity_rollup(conn)
+        rebuild_question_attempts(conn)
+
+    conn.execute("DROP TABLE temp.user_merge")
+
+    # 로그인/회원가입 조회에 쓰던 일반 인덱스를 UNIQUE 인덱스로 바꿉니다.
+    conn.execute("DROP INDEX IF EXISTS idx_users_name_school_team")
+    conn.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_users_identity
+            ON users (name, school, team)
+        """
+    )
@@ -0,0 +1,18 @@
+-- 새로 가입하거나 수정하는 사용자는 학교와 팀이 있어야 합니다.
+-- UNIQUE 인덱스 idx_users_identity (name, school, team)는 NULL끼리 다른 값으로 보므로,
+-- 팀(또는 학교)이 비어 있으면 같은 사람이 여러 번 가입할 수 있습니다.
+-- 이미 팀이 없는 기존 사용자는 그대로 두고, 이름/학교/팀을 바꿀 때부터 검사합니다.
+
+CREATE TRIGGER IF NOT EXISTS trg_users_identity_insert
+BEFORE INSERT ON users
+WHEN NEW.school IS NULL OR NEW.school = '' OR NEW.team IS NULL OR NEW.team = ''
+BEGIN
+    SELECT RAISE(ABORT, 'users.school and users.team are required');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_users_identity_update
+BEFORE UPDATE OF name, school, team ON users
+WHEN NEW.school IS NULL OR NEW.school = '' OR NEW.team IS NULL OR NEW.team = ''
+BEGIN
+    SELECT RAISE(ABORT, 'users.school and users.team are required');
+END;
@@ -1,49 +1,20 @@
 import streamlit as st
-import sqlite3
-import pandas as pd
+from utils.dashboard import get_frequent_users, get_problem_attempts
+from utils.submissions import wait_for_user_writes
 import config
+import math
 from datetime import datetime, timedelta
-
-
-# 데이터베이스 연결 함수
-def get_db_connection():
-    conn = sqlite3.connect("db/db.sqlite")
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-# 주제별 문제 풀이 현황을 가져오는 함수 (날짜 필터링 추가)
-def get_problem_attempts(topic, start_date=None, end_date=None):
-    conn = get_db_connection()
-    query = """
-    SELECT 
-        qr.question_idx,
-        u.id as user_id,
-        u.name as user_name,
-        COUNT(*) as attempt_count,
-        SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END) as correct_count,
-        MIN(qr.created_at) as first_attempt,
-        MAX(qr.created_at) as last_attempt
-    FROM question_results qr
-    JOIN users u ON qr.user_id = u.id
-    WHERE qr.topic = ?
-    """
-    params = [topic]
-    if start_date and end_date:
-        query += " AND DATE(qr.created_at) BETWEEN ? AND ?"
-        params.extend([start_date, end_date])
-    query += " GROUP BY qr.question_idx, u.id, u.name ORDER BY qr.question_idx, attempt_count DESC"
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
-
-    df["first_attempt"] = pd.to_datetime(df["first_attempt"])
-    df["last_attempt"] = pd.to_datetime(df["last_attempt"])
-
-    return df
+from utils.question_bank import check_for_updates, lookup_question
+from sidebar import display_my_rank
+from utils.profiler import profiled_page
+from utils.tracing import traced_page
 
 
 # 사용자별 시도 횟수를 3열로 표시하는 함수
-def display_user_attempts(user_data):
+# max_users명까지만 metric으로 그리고, 나머지는 표 하나로 보여줍니다.
+def display_user_attempts(user_data, max_users):
+    hidden = user_data.iloc[max_users:]
+    user_data = user_data.iloc[:max_users]
     cols = st.columns(3)
     for idx, row in enumerate(user_data.iterrows()):
         _, row = row
@@ -61,6 +32,13 @@ def display_user_attempts(user_data):
             with cols[2 - remaining_cols]:
                 st.write("")
 
+    if not hidden.empty:
+        with st.expander(f"나머지 사용자 {len(hidden)}명"):
+            st.dataframe(
+                hidden[["user_id", "user_name", "attempt_count", "correct_count"]],
+                hide_index=True,
+            )
+
 
 # 사용자 목록을 가져오는 함수
 def get_user_list(problem_attempts):
@@ -68,24 +46,16 @@ def get_user_list(problem_attempts):
     return user_list.sort_values("user_name")
 
 
-# 모든 문제에 대해 특정 횟수 이상 시도한 사용자 목록을 가져오는 함수
-def get_frequent_users(problem_attempts, min_attempts):
-    user_problem_attempts = (
-        problem_attempts.groupby(["user_id", "question_idx"])
-        .agg({"user_name": "first", "attempt_count": "sum"})
-        .reset_index()
-    )
-
-    all_problems = problem_attempts["question_idx"].unique()
-    frequent_users = user_problem_attempts.groupby("user_id").filter(
-        lambda x: all(x["attempt_count"] >= min_attempts)
-        and len(x) == len(all_problems)
+# 사용자 명단은 인원이 많아도 요소 하나로 그리도록 표 하나로 표시합니다.
+def display_user_table(users):
+    st.dataframe(
+        users[["user_name", "user_id"]].rename(
+            columns={"user_name": "이름", "user_id": "ID"}
+        ),
+        hide_index=True,
+        use_container_width=True,
     )
 
-    result = frequent_users.groupby("user_id").agg({"user_name": "first"}).reset_index()
-
-    return result.sort_values("user_name")
-
 
 @st.experimental_fragment
 def date_filter_section():
@@ -109,19 +79,30 @@ def date_filter_section():
 
 
 @st.experimental_fragment
-def display_problem_details(idx, problem_data):
+def display_problem_details(idx, problem_data, max_users):
     total_attempts = problem_data["attempt_count"].sum()
     total_correct = problem_data["correct_count"].sum()
     accuracy = (total_correct / total_attempts) * 100 if total_attempts > 0 else 0
 
     st.write(f"**문제 IDX {idx}**")
+    entry = lookup_question(idx)
+    if entry is not None:
+        st.caption(
+            f"{config.TOPICS[entry.topic]['title']} · "
+            f"{', '.join(entry.category)} · {', '.join(entry.subcategory)}"
+        )
+        with st.expander("문제 보기"):
+            st.write(entry.question["question"]["kor"])
+            for key, value in entry.question["choices"]["kor"].items():
+                marker = "✅" if key in entry.question["answers"] else "▫️"
+                st.write(f"{marker} {key}: {value}")
     col1, col2, col3 = st.columns(3)
     col1.metric("총 시도 횟수", total_attempts)
     col2.metric("총 정답 횟수", total_correct)
     col3.metric("정답률", f"{accuracy:.2f}%")
 
     user_data = problem_data.sort_values("attempt_count", ascending=False)
-    display_user_attempts(user_data)
+    display_user_attempts(user_data, max_users)
 
 
 @st.experimental_fragment
@@ -129,120 +110,155 @@ def display_frequent_users(problem_attempts, min_attempts):
     frequent_users = get_frequent_users(problem_attempts, min_attempts)
 
     if not frequent_users.empty:
-        st.write(f"모든 문제를 각각 {min_attempts}회 이상 시도한 사용자 목록:")
-        cols = st.columns(3)
-        for idx, (_, user) in enumerate(frequent_users.iterrows()):
-            with cols[idx % 3]:
-                st.write(f"{user['user_name']} (ID: {user['user_id']})")
+        st.write(
+            f"모든 문제를 각각 {min_attempts}회 이상 시도한 사용자 {len(frequent_users)}명:"
+        )
+        display_user_table(frequent_users)
     else:
         st.write(f"모든 문제를 각각 {min_attempts}회 이상 시도한 사용자가 없습니다.")
 
 
-st.set_page_config(
-    page_title="Comprehensive Problem Dashboard", page_icon="📊", layout="wide"
-)
+# rerun 전체 시간 측정 (관리자 페이지 "성능" 탭)과, 관리자가 지정한 세션이면 프로파일링
+@traced_page("problem_dashboard")
+@profiled_page("problem_dashboard")
+def main():
+    st.set_page_config(
+        page_title="Comprehensive Problem Dashboard", page_icon="📊", layout="wide"
+    )
 
-st.title("📊 Comprehensive Problem Dashboard")
+    st.title("📊 Comprehensive Problem Dashboard")
 
-# 주제 선택
-topic_options = list(config.TOPICS.keys())
-selected_topic = st.selectbox("주제 선택", topic_options)
+    # 문제 파일이 바뀌었는지는 rerun마다 한 번만 확인합니다. (문제별 lookup_question은 확인하지 않음)
+    check_for_updates()
 
-if selected_topic:
-    # 날짜 필터링 옵션
-    st.subheader("날짜 필터링", divider="rainbow")
-    start_date, end_date = date_filter_section()
+    # 본인이 방금 제출한 답안이 반영된 뒤 조회합니다.
+    if "user" in st.session_state:
+        if not wait_for_user_writes(st.session_state["user"]["id"]):
+            st.warning("방금 제출한 답안이 아직 저장되지 않아 결과에 빠져 있을 수 있습니다.")
 
-    problem_attempts = get_problem_attempts(selected_topic, start_date, end_date)
+    # 주제 선택
+    topic_options = list(config.TOPICS.keys())
+    selected_topic = st.selectbox("주제 선택", topic_options)
 
-    st.subheader(
-        f"{config.TOPICS[selected_topic]['title']} 문제별 풀이 현황", divider="rainbow"
-    )
+    if selected_topic:
+        # 날짜 필터링 옵션
+        st.subheader("날짜 필터링", divider="rainbow")
+        start_date, end_date = date_filter_section()
 
-    if not problem_attempts.empty:
-        # 날짜 범위 표시
-        if start_date and end_date:
-            st.write(f"데이터 기간: {start_date} ~ {end_date}")
-        else:
-            first_attempt = problem_attempts["first_attempt"].min()
-            last_attempt = problem_attempts["last_attempt"].max()
-            st.write(
-                f"데이터 기간: 전체 (첫 시도: {first_attempt.strftime('%Y-%m-%d')}, 마지막 시도: {last_attempt.strftime('%Y-%m-%d')})"
-            )
+        problem_attempts = get_problem_attempts(selected_topic, start_date, end_date)
 
-        # 문제 idx 선택 (전체 옵션 추가)
-        question_idx_list = ["전체"] + sorted(
-            problem_attempts["question_idx"].unique().tolist()
+        st.subheader(
+            f"{config.TOPICS[selected_topic]['title']} 문제별 풀이 현황", divider="rainbow"
         )
-        selected_idx = st.selectbox("문제 IDX 선택", question_idx_list)
 
-        if selected_idx == "전체":
-            st.divider()
-            st.subheader("전체 문제 요약", divider="rainbow")
-
-            # 전체 문제에 대한 요약 정보
-            total_attempts = problem_attempts["attempt_count"].sum()
-            total_correct = problem_attempts["correct_count"].sum()
-            accuracy = (
-                (total_correct / total_attempts) * 100 if total_attempts > 0 else 0
-            )
-            unique_problems = problem_attempts["question_idx"].nunique()
-            unique_users = problem_attempts["user_id"].nunique()
-
-            col1, col2, col3, col4, col5 = st.columns(5)
-            col1.metric("총 문제 수", unique_problems)
-            col2.metric("총 사용자 수", unique_users)
-            col3.metric("총 시도 횟수", total_attempts)
-            col4.metric("총 정답 횟수", total_correct)
-            col5.metric("전체 정답률", f"{accuracy:.2f}%")
-
-            # 사용자 명단 표시
-            st.divider()
-            st.subheader("참여 사용자 명단", divider="rainbow")
-            user_list = get_user_list(problem_attempts)
-
-            cols = st.columns(3)
-            for idx, (_, user) in enumerate(user_list.iterrows()):
-                with cols[idx % 3]:
-                    st.write(f"{user['user_name']} (ID: {user['user_id']})")
-
-            # 모든 문제에 대해 특정 횟수 이상 시도한 사용자 명단
-            st.divider()
-            st.subheader("모든 문제를 자주 시도한 사용자 명단", divider="rainbow")
-            min_attempts = st.number_input(
-                "각 문제당 최소 시도 횟수", min_value=1, value=3, step=1
+        if not problem_attempts.empty:
+            # 날짜 범위 표시
+            if start_date and end_date:
+                st.write(f"데이터 기간: {start_date} ~ {end_date}")
+            else:
+                first_attempt = problem_attempts["first_attempt"].min()
+                last_attempt = problem_attempts["last_attempt"].max()
+                st.write(
+                    f"데이터 기간: 전체 (첫 시도: {first_attempt.strftime('%Y-%m-%d')}, 마지막 시도: {last_attempt.strftime('%Y-%m-%d')})"
+                )
+
+            # 문제 idx 선택 (전체 옵션 추가)
+            question_idx_list = ["전체"] + sorted(
+                problem_attempts["question_idx"].unique().tolist()
             )
-            display_frequent_users(problem_attempts, min_attempts)
-
-            # 문제별 요약 및 사용자별 상세 정보
-            st.divider()
-            st.subheader("문제별 상세 정보", divider="rainbow")
-            for idx in sorted(problem_attempts["question_idx"].unique()):
-                problem_data = problem_attempts[problem_attempts["question_idx"] == idx]
-                display_problem_details(idx, problem_data)
-                st.write("---")
+            selected_idx = st.selectbox("문제 IDX 선택", question_idx_list)
+
+            if selected_idx == "전체":
+                st.divider()
+                st.subheader("전체 문제 요약", divider="rainbow")
+
+                # 전체 문제에 대한 요약 정보
+                total_attempts = problem_attempts["attempt_count"].sum()
+                total_correct = problem_attempts["correct_count"].sum()
+                accuracy = (
+                    (total_correct / total_attempts) * 100 if total_attempts > 0 else 0
+                )
+                unique_problems = problem_attempts["question_idx"].nunique()
+                unique_users = problem_attempts["user_id"].nunique()
+
+                col1, col2, col3, col4, col5 = st.columns(5)
+                col1.metric("총 문제 수", unique_problems)
+                col2.metric("총 사용자 수", unique_users)
+                col3.metric("총 시도 횟수", total_attempts)
+                col4.metric("총 정답 횟수", total_correct)
+                col5.metric("전체 정답률", f"{accuracy:.2f}%")
+
+                # 사용자 명단 표시
+                st.divider()
+                st.subheader("참여 사용자 명단", divider="rainbow")
+                display_user_table(get_user_list(problem_attempts))
+
+                # 모든 문제에 대해 특정 횟수 이상 시도한 사용자 명단
+                st.divider()
+                st.subheader("모든 문제를 자주 시도한 사용자 명단", divider="rainbow")
+                min_attempts = st.number_input(
+                    "각 문제당 최소 시도 횟수", min_value=1, value=3, step=1
+                )
+                display_frequent_users(problem_attempts, min_attempts)
+
+                # 문제별 요약 및 사용자별 상세 정보
+                st.divider()
+                st.subheader("문제별 상세 정보", divider="rainbow")
+                # 문제별로 한 번만 그룹화하고, 현재 페이지의 문제만 그립니다.
+                groups = problem_attempts.groupby("question_idx", sort=True)
+                question_ids = list(groups.groups)
+
+                col1, col2 = st.columns(2)
+                page_size = col1.selectbox(
+                    "페이지당 문제 수", config.PROBLEM_DETAIL_PAGE_SIZES
+                )
+                total_pages = max(1, math.ceil(len(question_ids) / page_size))
+                page = col2.number_input(
+                    f"페이지 (총 {total_pages})", min_value=1, max_value=total_pages, step=1
+                )
+                page_ids = question_ids[(page - 1) * page_size : page * page_size]
+
+                # 한 페이지에서 그리는 사용자 metric 수가 상한을 넘지 않도록 문제당 인원을 나눕니다.
+                max_users = max(1, config.PROBLEM_DETAIL_MAX_METRICS // len(page_ids))
+                rendered = 0
+                for idx in page_ids:
+                    problem_data = groups.get_group(idx)
+                    display_problem_details(idx, problem_data, max_users)
+                    rendered += min(len(problem_data), max_users)
+                    st.write("---")
+                st.caption(
+                    f"문제 {len(page_ids)}개, 사용자 지표 {rendered}개 표시 "
+                    f"(문제당 최대 {max_users}명)"
+                )
+
+            else:
+                # 선택된 문제의 데이터 필터링
+                filtered_data = problem_attempts[
+                    problem_attempts["question_idx"] == selected_idx
+                ]
+                display_problem_details(
+                    selected_idx, filtered_data, config.PROBLEM_DETAIL_MAX_METRICS
+                )
+
+                # 전체 데이터 표시
+                st.subheader("상세 데이터")
+                st.dataframe(filtered_data)
 
         else:
-            # 선택된 문제의 데이터 필터링
-            filtered_data = problem_attempts[
-                problem_attempts["question_idx"] == selected_idx
-            ]
-            display_problem_details(selected_idx, filtered_data)
-
-            # 전체 데이터 표시
-            st.subheader("상세 데이터")
-            st.dataframe(filtered_data)
+            st.info(
+                f"{config.TOPICS[selected_topic]['title']} 주제에 대한 선택한 기간의 풀이 데이터가 없습니다."
+            )
 
+    # 사이드바에 사용자 정보 및 로그아웃 버튼 표시 (옵션)
+    if "user" in st.session_state:
+        st.sidebar.success(f"{st.session_state['user']['name']}님 로그인됨")
+        display_my_rank()
+        if st.sidebar.button("로그아웃"):
+            del st.session_state["user"]
+            st.rerun()
     else:
-        st.info(
-            f"{config.TOPICS[selected_topic]['title']} 주제에 대한 선택한 기간의 풀이 데이터가 없습니다."
-        )
+        st.sidebar.info("로그인이 필요합니다.")
+
 
-# 사이드바에 사용자 정보 및 로그아웃 버튼 표시 (옵션)
-if "user" in st.session_state:
-    st.sidebar.success(f"{st.session_state['user']['name']}님 로그인됨")
-    if st.sidebar.button("로그아웃"):
-        del st.session_state["user"]
-        st.rerun()
-else:
-    st.sidebar.info("로그인이 필요합니다.")
+if __name__ == "__main__":
+    main()
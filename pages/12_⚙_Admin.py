@@ -1,56 +1,504 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
 import config
+from datetime import datetime
+from utils.bulk_edit import (
+    apply_plan,
+    plan_from_editor,
+    preview_plan,
+    recent_edits,
+    undo_edit,
+)
+from utils.db import connection
+from utils.helpers import local_timezone
+from utils.result_cache import bump_all_versions
+from utils.rollups import check_all, rebuild_in_chunks, refresh_rollup_rows
+from utils.student_import import import_students, read_students
+from utils import profiler, slow_queries, tracing
+from utils.table_browser import (
+    FILTER_OPERATORS,
+    approximate_count,
+    fetch_page,
+    list_tables,
+    search_values,
+    searchable_columns,
+    table_info,
+)
 
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    conn = sqlite3.connect("db/db.sqlite")
-    conn.row_factory = sqlite3.Row
-    return conn
+# 테이블 목록과 구조 가져오기
+def get_tables():
+    with connection() as conn:
+        return list_tables(conn)
 
 
-# 테이블 목록 가져오기
-def get_tables():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    conn.close()
-    return [table[0] for table in tables]
+def get_table_info(table_name):
+    with connection() as conn:
+        return table_info(conn, table_name)
+
+
+# 현재 페이지의 테이블 데이터 가져오기
+def get_table_page(info, ordering, descending, filters, cursor, page_size):
+    with connection() as conn:
+        columns, rows, next_cursor = fetch_page(
+            conn, info, ordering, descending, filters, cursor, page_size
+        )
+    return pd.DataFrame(rows, columns=columns), next_cursor
+
+
+# ID 값을 검색어로 찾는 선택 상자
+def id_value_picker(info, id_column, label, key):
+    search = st.text_input(f"{label} 검색", key=f"{key}_search")
+    with connection() as conn:
+        values = search_values(conn, info, id_column, search)
+    if search and not values:
+        st.caption("검색 결과가 없습니다.")
+    return st.selectbox(label, values, key=key)
+
+
+# 테이블 탐색기: 서버에서 필터링/정렬하고 한 페이지씩 보여줍니다.
+def display_table_browser(info):
+    with connection() as conn:
+        count, exact = approximate_count(conn, info)
+    st.subheader(f"{info.name} 테이블 데이터")
+    st.caption(f"{count:,}행" if exact else f"약 {count:,}행 (추정)")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        ordering = st.selectbox("정렬 기준", list(info.orderings))
+    with col2:
+        descending = st.checkbox("내림차순")
+    with col3:
+        page_size = st.selectbox("페이지당 행 수", [50, 100, 500])
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        filter_column = st.selectbox("필터 열", ["(없음)"] + info.columns)
+    with col2:
+        operator = st.selectbox("조건", list(FILTER_OPERATORS))
+    with col3:
+        filter_value = st.text_input("값")
+    filters = []
+    if filter_column != "(없음)":
+        filters.append((filter_column, operator, filter_value))
+
+    # 조회 조건이 바뀌면 첫 페이지부터 다시 보여줍니다.
+    state = (info.name, ordering, descending, page_size, tuple(filters))
+    if st.session_state.get("browser_state") != state:
+        st.session_state.browser_state = state
+        st.session_state.browser_cursors = [None]
+    cursors = st.session_state.browser_cursors
+
+    df, next_cursor = get_table_page(
+        info, ordering, descending, filters, cursors[-1], page_size
+    )
+    if st.toggle("일괄 편집"):
+        editor_key = "bulk_editor_{}_{}".format(
+            st.session_state.get("bulk_editor_version", 0), hash((state, len(cursors)))
+        )
+        display_bulk_editor(info, df, editor_key)
+    else:
+        st.dataframe(df, hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button("이전 페이지", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("다음 페이지", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+    with col3:
+        st.caption(f"{len(cursors)} 페이지")
+
+
+# 일괄 편집: 표에서 고치거나 지운 행을 모아 미리 본 뒤 한 번에 적용합니다.
+def display_bulk_editor(info, df, editor_key):
+    st.data_editor(
+        df,
+        key=editor_key,
+        hide_index=True,
+        num_rows="dynamic",
+        disabled=[column for column in info.key_columns if column in df.columns],
+    )
+    editor_state = st.session_state.get(editor_key, {})
+    if editor_state.get("added_rows"):
+        st.caption("새로 추가한 행은 반영되지 않습니다.")
+
+    plan = plan_from_editor(info, df, editor_state)
+    if not plan.updates and not plan.deletes:
+        return
+
+    with connection() as conn:
+        changes, columns, deleted_rows = preview_plan(conn, plan)
+    st.write(f"**미리보기**: 값 {len(changes)}개 수정, {len(deleted_rows)}행 삭제")
+    if changes:
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    (", ".join(map(str, key)), column, str(old), str(new))
+                    for key, column, old, new in changes
+                ],
+                columns=["키", "열", "이전 값", "새 값"],
+            ),
+            hide_index=True,
+        )
+    if deleted_rows:
+        st.dataframe(pd.DataFrame(deleted_rows, columns=columns), hide_index=True)
+
+    if st.button("변경 사항 적용", type="primary"):
+        with connection() as conn:
+            journal_id = apply_plan(conn, plan)
+        bump_all_versions()
+        st.session_state.bulk_editor_version = (
+            st.session_state.get("bulk_editor_version", 0) + 1
+        )
+        st.success(f"적용했습니다. (되돌리기 기록 #{journal_id})")
+        st.rerun()
+
+
+# 최근 일괄 수정 기록과 되돌리기
+def display_edit_journal():
+    # 직전에 되돌리면서 건너뛴 값이 있으면 한 번 보여줍니다.
+    skipped = st.session_state.pop("undo_conflicts", None)
+    if skipped:
+        edit_id, conflicts = skipped
+        st.warning(
+            f"#{edit_id}을(를) 되돌렸지만, 그 뒤에 바뀐 {len(conflicts)}곳은 그대로 두었습니다."
+        )
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    (", ".join(map(str, key)), column or "(행)", detail)
+                    for key, column, detail in conflicts
+                ],
+                columns=["키", "열", "내용"],
+            ),
+            hide_index=True,
+        )
+
+    with connection() as conn:
+        edits = recent_edits(conn)
+    if not edits:
+        st.caption("일괄 수정 기록이 없습니다.")
+        return
+
+    for edit_id, table_name, updated, deleted, created_at, undone_at in edits:
+        col1, col2 = st.columns([5, 1])
+        summary = (
+            f"#{edit_id} {table_name} · {updated}행 수정, {deleted}행 삭제 · "
+            f"{created_at}"
+        )
+        if undone_at:
+            summary += f" (되돌림: {undone_at})"
+        col1.write(summary)
+        if undone_at is None and col2.button("되돌리기", key=f"undo_{edit_id}"):
+            try:
+                with connection() as conn:
+                    result = undo_edit(conn, edit_id)
+            except ValueError as e:
+                st.error(str(e))
+                continue
+            bump_all_versions()
+            if result.conflicts:
+                st.session_state.undo_conflicts = (edit_id, result.conflicts)
+            st.rerun()
+
+
+# CSV로 학생 계정 일괄 등록
+def display_student_import():
+    uploaded = st.file_uploader("학생 CSV (name,school,team,pin)", type="csv")
+    if uploaded is None:
+        return
+    try:
+        rows, skipped = read_students(uploaded.getvalue().decode("utf-8-sig"))
+    except (UnicodeDecodeError, ValueError) as e:
+        st.error(f"CSV를 읽을 수 없습니다: {e}")
+        return
+
+    st.write(f"등록할 학생 {len(rows)}명, 형식 오류 {len(skipped)}건")
+    if st.button("학생 등록", disabled=not rows):
+        with st.spinner("등록 중..."):
+            with connection() as conn:
+                result = import_students(conn, rows)
+        bump_all_versions()
+        skipped += result.skipped
+        st.success(f"{result.inserted}명을 등록했습니다.")
+    if skipped:
+        st.warning(f"{len(skipped)}건을 건너뛰었습니다.")
+        st.dataframe(
+            pd.DataFrame(
+                sorted(skipped), columns=["줄", "이름", "학교", "팀", "사유"]
+            ),
+            hide_index=True,
+        )
+
+
+def local_time(timestamp):
+    return datetime.fromtimestamp(timestamp, local_timezone()).strftime("%H:%M:%S")
+
+
+# 성능 탭: 구간별 실행 시간 히스토그램과 최근 rerun 구성
+def display_performance():
+    enabled = st.toggle("시간 측정 켜기", value=tracing.is_enabled())
+    if enabled != tracing.is_enabled():
+        tracing.set_enabled(enabled)
+        st.rerun()
+    if st.button("측정값 초기화"):
+        tracing.reset()
+        st.rerun()
+    st.caption(
+        "이 서버 프로세스의 모든 세션을 합친 값입니다. "
+        f"p50/p95는 구간별 최근 {config.TRACING_MAX_SAMPLES}회 기준이며, "
+        "캐시에서 바로 반환된 대시보드 조회는 포함되지 않습니다."
+    )
+
+    stats = tracing.snapshot()
+    if not stats:
+        st.info("측정값이 없습니다. 측정을 켠 뒤 다른 페이지를 사용해보세요.")
+        return
+
+    st.write("**구간별 실행 시간 (ms)**")
+    st.dataframe(
+        pd.DataFrame(stats, columns=["구간", "횟수", "합계", "p50", "p95", "최대"]).round(2),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    reruns = tracing.recent_reruns()
+    if reruns:
+        st.write("**최근 rerun (ms)**")
+        st.caption("나머지 = 전체 - 측정한 구간 합계 (위젯 렌더링, 페이지 코드 등)")
+        rows = []
+        for rerun in reruns:
+            measured = sum(elapsed for _, elapsed in rerun.spans)
+            top = sorted(rerun.spans, key=lambda s: s[1], reverse=True)[:5]
+            rows.append(
+                (
+                    local_time(rerun.started_at),
+                    rerun.page,
+                    round(rerun.total_ms, 1),
+                    round(measured, 1),
+                    round(rerun.total_ms - measured, 1),
+                    ", ".join(f"{name} {elapsed:.1f}" for name, elapsed in top),
+                )
+            )
+        st.dataframe(
+            pd.DataFrame(
+                rows,
+                columns=["시각", "페이지", "전체", "측정 구간", "나머지", "주요 구간"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+# 느린 쿼리 탭: 기준 시간 설정과 최근 기록
+def display_slow_queries():
+    col1, col2 = st.columns(2)
+    with col1:
+        current = slow_queries.threshold_ms()
+        enabled = st.toggle("느린 쿼리 기록", value=current is not None)
+        threshold = st.number_input(
+            "기준 시간 (ms)",
+            min_value=1,
+            value=int(current or config.SLOW_QUERY_THRESHOLD_MS or 200),
+            disabled=not enabled,
+        )
+        new_threshold = threshold if enabled else None
+        if new_threshold != current:
+            slow_queries.set_threshold_ms(new_threshold)
+            st.rerun()
+    with col2:
+        limit = st.selectbox("표시할 기록 수", [50, 200, 1000])
+        st.caption(f"로그 파일: {config.SLOW_QUERY_LOG_FILE}")
+
+    entries = slow_queries.read_entries(limit)
+    if not entries:
+        st.info("기록된 느린 쿼리가 없습니다.")
+        return
+
+    st.dataframe(
+        pd.DataFrame(
+            [
+                (entry.logged_at, entry.duration_ms, entry.rows, entry.sql[:200])
+                for entry in entries
+            ],
+            columns=["시각", "시간(ms)", "행 수", "SQL"],
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    selected = st.selectbox(
+        "상세 보기",
+        range(len(entries)),
+        format_func=lambda i: (
+            f"{entries[i].logged_at} · {entries[i].duration_ms:.1f}ms · "
+            f"{entries[i].sql[:60]}"
+        ),
+    )
+    entry = entries[selected]
+    st.code(entry.sql, language="sql")
+    st.write(f"파라미터: `{entry.params}` · 행 수: {entry.rows} · 스레드: {entry.thread}")
+    st.code("\n".join(entry.plan) or "(실행 계획 없음)", language="text")
+
+
+# 이름으로 학생 찾기 (이름, 학교, 팀 인덱스 사용)
+def find_users(name_prefix, limit=20):
+    name_prefix = name_prefix.strip()
+    if not name_prefix:
+        return []
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, name, school, team FROM users
+            WHERE name >= ? AND name < ?
+            ORDER BY name, school, team
+            LIMIT ?
+            """,
+            (name_prefix, name_prefix + "\U0010ffff", limit),
+        ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+# 프로파일러 탭: 학생별 rerun 프로파일 예약과 결과 보기
+def display_profiler():
+    st.caption(
+        "지정한 학생의 문제 풀이 페이지/대시보드 rerun을 다음 N회만 샘플링합니다. "
+        f"호출 스택을 {config.PROFILER_INTERVAL_MS}ms마다 기록합니다."
+    )
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        search = st.text_input("학생 이름 검색", key="profile_user_search")
+        users = find_users(search)
+        if search and not users:
+            st.caption("검색 결과가 없습니다.")
+    with col2:
+        user = st.selectbox(
+            "학생",
+            users,
+            format_func=lambda u: f"#{u[0]} {u[1]} ({u[2]} / {u[3]})",
+        )
+    with col3:
+        reruns = st.number_input("rerun 횟수", min_value=1, max_value=50, value=5)
+    if st.button("프로파일 예약", disabled=user is None):
+        profiler.request(user[0], reruns)
+        st.rerun()
+
+    for user_id, remaining in profiler.pending_requests().items():
+        col1, col2 = st.columns([5, 1])
+        col1.write(f"예약: 사용자 #{user_id}, 남은 rerun {remaining}회")
+        if col2.button("취소", key=f"cancel_profile_{user_id}"):
+            profiler.cancel(user_id)
+            st.rerun()
+    if config.PROFILER_QUERY_PARAM:
+        st.caption("주소에 ?profile=N 을 붙이면 그 세션의 다음 N회 rerun도 기록됩니다.")
+
+    profiles = profiler.profiles()
+    if not profiles:
+        st.info("기록된 프로파일이 없습니다.")
+        return
+
+    selected = st.selectbox(
+        "프로파일",
+        profiles,
+        format_func=lambda p: (
+            f"#{p.id} {p.page} · 사용자 #{p.user_id} · "
+            f"{local_time(p.started_at)} · {p.duration_ms:.0f}ms"
+        ),
+    )
+    col1, col2, col3 = st.columns(3)
+    col1.metric("rerun 시간", f"{selected.duration_ms:.0f}ms")
+    col2.metric("샘플 수", selected.samples)
+    with col3:
+        st.download_button(
+            "flamegraph용 folded 파일",
+            profiler.folded(selected),
+            file_name=f"profile-{selected.id}-{selected.page}.folded",
+        )
+        if st.button("프로파일 모두 지우기"):
+            profiler.clear_profiles()
+            st.rerun()
+
+    if not selected.samples:
+        st.info("rerun이 샘플링 간격보다 짧아 기록된 샘플이 없습니다.")
+        return
+
+    st.write("**호출 트리** (1% 미만 생략)")
+    st.code(
+        "\n".join(
+            f"{count / selected.samples:6.1%} "
+            f"{profiler.sample_ms(selected, count):7.0f}ms  {'  ' * depth}{name}"
+            for depth, name, count in profiler.call_tree(selected)
+        ),
+        language="text",
+    )
+    st.write("**함수별 시간** (자기 시간 순)")
+    st.dataframe(
+        pd.DataFrame(
+            [
+                (
+                    name,
+                    round(profiler.sample_ms(selected, own), 1),
+                    round(profiler.sample_ms(selected, total), 1),
+                )
+                for name, own, total in profiler.self_time(selected)
+            ],
+            columns=["함수", "자기 시간(ms)", "포함 시간(ms)"],
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
 
 
-# 테이블 데이터 가져오기
-def get_table_data(table_name):
-    conn = get_db_connection()
-    query = f"SELECT * FROM {table_name}"
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+# 한 테이블의 행을 고치거나 지웁니다.
+# question_results이면 바뀌기 전/후 행이 속한 집계 행을 같은 트랜잭션에서 다시 계산합니다.
+def change_rows(table_name, id_column, id_value, statement, params):
+    rollup_source = "user_id, question_idx, topic, created_ts"
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            affected = []
+            if table_name == "question_results":
+                affected = conn.execute(
+                    f"SELECT rowid, {rollup_source} FROM question_results "
+                    f"WHERE {id_column} = ?",
+                    (id_value,),
+                ).fetchall()
+            conn.execute(statement, params)
+            if affected:
+                results = [tuple(row)[1:] for row in affected]
+                for row in affected:
+                    after = conn.execute(
+                        f"SELECT {rollup_source} FROM question_results WHERE rowid = ?",
+                        (row[0],),
+                    ).fetchone()
+                    if after is not None:
+                        results.append(tuple(after))
+                refresh_rollup_rows(conn, results)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    bump_all_versions()
 
 
 # 데이터 수정하기
 def update_data(table_name, id_column, id_value, column, new_value):
-    conn = get_db_connection()
-    cursor = conn.cursor()
     query = f"UPDATE {table_name} SET {column} = ? WHERE {id_column} = ?"
-    cursor.execute(query, (new_value, id_value))
-    conn.commit()
-    conn.close()
+    change_rows(table_name, id_column, id_value, query, (new_value, id_value))
 
 
 # 데이터 삭제하기
 def delete_data(table_name, id_column, id_value):
-    conn = get_db_connection()
-    cursor = conn.cursor()
     query = f"DELETE FROM {table_name} WHERE {id_column} = ?"
-    cursor.execute(query, (id_value,))
-    conn.commit()
-    conn.close()
+    change_rows(table_name, id_column, id_value, query, (id_value,))
 
 
 # 메인 앱
+@tracing.traced_page("admin")
 def main():
     st.set_page_config(page_title="관리자 대시보드", page_icon="🔒", layout="wide")
     st.title("🔒 관리자 대시보드")
@@ -72,49 +520,91 @@ def main():
         return
 
     # 관리자 인증 후 대시보드 표시
-    tables = get_tables()
-    selected_table = st.selectbox("테이블 선택", tables)
+    data_tab, performance_tab, slow_query_tab, profiler_tab = st.tabs(
+        ["데이터 관리", "성능", "느린 쿼리", "프로파일러"]
+    )
+    with data_tab:
+        tables = get_tables()
+        selected_table = st.selectbox("테이블 선택", tables)
 
-    if selected_table:
-        df = get_table_data(selected_table)
-        st.subheader(f"{selected_table} 테이블 데이터")
-        st.dataframe(df)
+        if selected_table:
+            info = get_table_info(selected_table)
+            display_table_browser(info)
+            id_columns = searchable_columns(info)
 
-        # 데이터 수정
-        st.subheader("데이터 수정")
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            id_column = st.selectbox("ID 열 선택", df.columns)
-        with col2:
-            id_value = st.selectbox("ID 값 선택", df[id_column].unique())
-        with col3:
-            column_to_update = st.selectbox("수정할 열 선택", df.columns)
-        with col4:
-            new_value = st.text_input("새 값 입력")
-        if st.button("수정"):
-            update_data(
-                selected_table, id_column, id_value, column_to_update, new_value
-            )
-            st.success("데이터가 수정되었습니다.")
-            st.rerun()
+            # 데이터 수정
+            st.subheader("데이터 수정")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                id_column = st.selectbox("ID 열 선택", id_columns)
+            with col2:
+                id_value = id_value_picker(
+                    info, id_column, "ID 값 선택", "update_id_value"
+                )
+            with col3:
+                column_to_update = st.selectbox("수정할 열 선택", info.columns)
+            with col4:
+                new_value = st.text_input("새 값 입력")
+            if st.button("수정", disabled=id_value is None):
+                update_data(
+                    selected_table, id_column, id_value, column_to_update, new_value
+                )
+                st.success("데이터가 수정되었습니다.")
+                st.rerun()
 
-        # 데이터 삭제
-        st.subheader("데이터 삭제")
+            # 데이터 삭제
+            st.subheader("데이터 삭제")
+            col1, col2 = st.columns(2)
+            with col1:
+                delete_id_column = st.selectbox(
+                    "삭제할 행의 ID 열 선택", id_columns, key="delete_id_column"
+                )
+            with col2:
+                delete_id_value = id_value_picker(
+                    info, delete_id_column, "삭제할 행의 ID 값 선택", "delete_id_value"
+                )
+            if st.button("삭제", type="primary", disabled=delete_id_value is None):
+                delete_data(selected_table, delete_id_column, delete_id_value)
+                st.success("데이터가 삭제되었습니다.")
+                st.rerun()
+
+        st.subheader("학생 일괄 등록")
+        display_student_import()
+
+        st.subheader("일괄 수정 기록")
+        display_edit_journal()
+
+        # 집계 테이블 (DB를 이 페이지 밖에서 직접 고친 뒤 확인/재계산)
+        st.subheader("집계 테이블")
         col1, col2 = st.columns(2)
         with col1:
-            delete_id_column = st.selectbox(
-                "삭제할 행의 ID 열 선택", df.columns, key="delete_id_column"
-            )
+            if st.button("집계 테이블 확인"):
+                with connection() as conn:
+                    for name, count in check_all(conn).items():
+                        if count == 0:
+                            st.success(f"{name}: 원본과 일치합니다.")
+                        else:
+                            st.warning(f"{name}: 원본과 {count}행이 다릅니다.")
         with col2:
-            delete_id_value = st.selectbox(
-                "삭제할 행의 ID 값 선택",
-                df[delete_id_column].unique(),
-                key="delete_id_value",
-            )
-        if st.button("삭제", type="primary"):
-            delete_data(selected_table, delete_id_column, delete_id_value)
-            st.success("데이터가 삭제되었습니다.")
-            st.rerun()
+            if st.button("집계 테이블 재계산"):
+                # 답안 기록이 막히지 않도록 짧은 트랜잭션으로 나누어 재계산합니다.
+                progress_bar = st.progress(0.0, text="집계 테이블 재계산 중...")
+                with connection() as conn:
+                    rebuild_in_chunks(
+                        conn, lambda done, total: progress_bar.progress(done / total)
+                    )
+                progress_bar.empty()
+                bump_all_versions()
+                st.success("집계 테이블을 다시 계산했습니다.")
+
+    with performance_tab:
+        display_performance()
+
+    with slow_query_tab:
+        display_slow_queries()
+
+    with profiler_tab:
+        display_profiler()
 
     # 로그아웃 버튼
     if st.sidebar.button("로그아웃"):
@@ -1,54 +1,30 @@
 import streamlit as st
 import sqlite3
-from utils.helpers import load_homework_questions
-from datetime import datetime
+from utils.submissions import pending_write_status, save_submission
+from utils.question_bank import get_question, get_topic_size
 import config
-
-
-def get_db_connection():
-    conn = sqlite3.connect("db/db.sqlite")
-    conn.row_factory = sqlite3.Row
-    return conn
+from sidebar import display_my_rank
+from utils.profiler import profiled_page
+from utils.tracing import traced_page
 
 
 def save_question_result(user_id, quiz_idx, is_correct, quiz_topic):
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
-        cursor.execute(
-            """
-        INSERT INTO question_results (user_id, question_idx, topic, correct, created_at)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-            (user_id, quiz_idx, quiz_topic, is_correct, datetime.now()),
-        )
-
-        points_to_add = 3 if is_correct else 1
-        cursor.execute(
-            """
-        UPDATE users
-        SET points = points + ?,
-            correct = correct + ?,
-            incorrect = incorrect + ?
-        WHERE id = ?
-        """,
-            (points_to_add, 1 if is_correct else 0, 0 if is_correct else 1, user_id),
-        )
-
-        conn.commit()
+        save_submission(user_id, quiz_idx, quiz_topic, is_correct)
     except sqlite3.Error as e:
         st.error(f"데이터베이스 오류: {e}")
-    finally:
-        conn.close()
 
 
-def initialize_session_state(questions, topic):
+def initialize_session_state(total_questions, topic):
     if f"{topic}_current_question" not in st.session_state:
         st.session_state[f"{topic}_current_question"] = 0
     if f"{topic}_answers" not in st.session_state:
         st.session_state[f"{topic}_answers"] = {}
-    if f"{topic}_total_questions" not in st.session_state:
-        st.session_state[f"{topic}_total_questions"] = len(questions)
+    # 문제 파일이 갱신되어 문제 수가 바뀔 수 있으므로 매번 갱신합니다.
+    st.session_state[f"{topic}_total_questions"] = total_questions
+    st.session_state[f"{topic}_current_question"] = min(
+        st.session_state[f"{topic}_current_question"], total_questions - 1
+    )
     if f"{topic}_user_answer" not in st.session_state:
         st.session_state[f"{topic}_user_answer"] = None
     if f"{topic}_show_result" not in st.session_state:
@@ -119,6 +95,8 @@ def display_progress(current_q, total_questions):
     return progress, question_count
 
 
+@traced_page("question")
+@profiled_page("question")
 def render_question_page(topic):
     st.set_page_config(
         page_title=f"{topic.upper()} Homework", page_icon="👟", layout="wide"
@@ -137,19 +115,13 @@ def render_question_page(topic):
 
     topic_config = config.TOPICS[topic]
 
-    if f"{topic}_questions" not in st.session_state:
-        st.session_state[f"{topic}_questions"] = load_homework_questions(
-            topic_config["file"]
-        )
-
-    questions = st.session_state[f"{topic}_questions"]
-
-    initialize_session_state(questions, topic)
+    # 문제 은행은 프로세스 전체에서 공유하고, 세션에는 현재 문제 위치만 저장합니다.
+    initialize_session_state(get_topic_size(topic), topic)
 
     st.header(f"{username}님의 {topic_config['title']} 숙제", divider="rainbow")
 
     current_q = st.session_state[f"{topic}_current_question"]
-    question = questions[current_q]
+    question = get_question(topic, current_q)
     quiz_idx = question["idx"]
 
     user_answer = display_question(question, current_q, topic)
@@ -171,6 +143,15 @@ def render_question_page(topic):
 
             save_question_result(user_id, quiz_idx, is_correct, topic)
 
+    # 기록이 실패해 재시도 중이거나, 저장하지 못해 따로 보관한 답안이 있으면 알려줍니다.
+    pending, write_error = pending_write_status(user_id)
+    if write_error and pending:
+        st.warning(
+            f"제출한 답안 {pending}건이 아직 저장되지 않아 다시 저장하는 중입니다. ({write_error})"
+        )
+    elif write_error:
+        st.error(f"저장하지 못한 답안이 있어 따로 보관했습니다. ({write_error})")
+
     if st.session_state[f"{topic}_show_result"]:
         display_result(
             question, user_answer, st.session_state[f"{topic}_answers"][current_q]
@@ -209,6 +190,7 @@ def render_question_page(topic):
 
     if "user" in st.session_state:
         st.sidebar.success(f"{st.session_state['user']['name']}님 로그인됨")
+        display_my_rank()
         if st.sidebar.button("로그아웃", key=f"logout_button_{topic}"):
             del st.session_state["user"]
             st.rerun()
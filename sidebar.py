@@ -0,0 +1,21 @@
+import streamlit as st
+from utils.leaderboard import get_leaderboard_snapshot
+from utils.ranking import get_user_rank
+
+
+# 로그인한 사용자의 현재 순위를 사이드바에 표시하는 함수
+def display_my_rank():
+    if "user" not in st.session_state:
+        return
+
+    result = get_user_rank(st.session_state["user"]["id"])
+    if result is None:
+        return
+
+    rank, points = result
+    # 스냅샷은 최대 LEADERBOARD_REFRESH_SECONDS만큼 늦으므로, 그사이 가입한 사용자 때문에
+    # 순위가 전체 인원보다 커 보이지 않게 합니다.
+    total_users = max(rank, get_leaderboard_snapshot().total_users)
+    st.sidebar.metric(
+        "내 순위", f"{rank}위 / {total_users}명", f"{points}점", delta_color="off"
+    )
@@ -0,0 +1,48 @@
+import hashlib
+import hmac
+import sqlite3
+
+from utils.db import connection
+from utils.tracing import traced
+
+
+# (name, school, team) UNIQUE 인덱스로 한 행만 찾은 뒤 비밀번호 해시를 비교합니다.
+LOGIN_QUERY = "SELECT * FROM users WHERE name = ? AND school = ? AND team = ?"
+
+
+# 비밀번호 해시 함수
+def hash_password(password):
+    return hashlib.sha256(str(password).encode()).hexdigest()
+
+
+# 로그인 함수
+@traced
+def login(username, school, team, password):
+    with connection() as conn:
+        user = conn.execute(LOGIN_QUERY, (username, school, team)).fetchone()
+    if user is None:
+        return None
+    if not hmac.compare_digest(user["password"], hash_password(password)):
+        return None
+    return user
+
+
+# 회원가입 함수
+# (name, school, team) UNIQUE 인덱스는 NULL끼리 중복으로 보지 않으므로 소속과 팀을 모두 받습니다.
+@traced
+def register(username, school, team, password):
+    if not (username and school and team):
+        raise ValueError("이름, 소속, 팀은 필수입니다.")
+    hashed_password = hash_password(password)
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "INSERT INTO users (name, school, team, password) VALUES (?, ?, ?, ?)",
+                (username, school, team, hashed_password),
+            )
+            conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            return False
@@ -0,0 +1,301 @@
+import json
+import math
+from collections import defaultdict, namedtuple
+
+from utils.rollups import refresh_rollup_rows
+from utils.table_browser import quote, table_info
+
+# 관리자 페이지 일괄 수정
+# 편집한 행/삭제한 행을 모아 한 트랜잭션에서 executemany로 적용하고,
+# 바뀌기 전의 행을 admin_edit_journal에 남겨 되돌릴 수 있게 합니다.
+# question_results를 바꾸면 바뀌기 전/후 행이 속한 집계 행만 같은 트랜잭션에서 다시 계산합니다.
+
+# updates: [(키 값 튜플, {열: 새 값})], deletes: [키 값 튜플]
+EditPlan = namedtuple("EditPlan", ["table", "key_columns", "updates", "deletes"])
+# conflicts: 그 뒤에 값이 바뀌어 되돌리지 않은 [(키 값 튜플, 열 또는 None(삭제된 행), 설명)]
+UndoResult = namedtuple("UndoResult", ["table", "restored", "conflicts"])
+
+
+def _plain(value):
+    # pandas/numpy 값을 sqlite3에 넘길 수 있는 파이썬 값으로 바꿉니다.
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def plan_from_editor(info, df, editor_state):
+    """st.data_editor의 변경 내역(edited_rows, deleted_rows)으로 EditPlan을 만듭니다.
+
+    키 열의 변경과 추가된 행은 무시합니다.
+    """
+    keys = info.key_columns
+
+    def key_of(position):
+        row = df.iloc[int(position)]
+        return tuple(_plain(row[column]) for column in keys)
+
+    deletes = [key_of(position) for position in editor_state.get("deleted_rows", [])]
+    deleted = set(deletes)
+    updates = []
+    for position, changes in editor_state.get("edited_rows", {}).items():
+        key = key_of(position)
+        changes = {
+            column: _plain(value)
+            for column, value in changes.items()
+            if column not in keys
+        }
+        if changes and key not in deleted:
+            updates.append((key, changes))
+    return EditPlan(info.name, tuple(keys), updates, deletes)
+
+
+def _select_columns(info):
+    if info.key_columns == ["rowid"]:
+        return ["rowid"] + list(info.columns)
+    return list(info.columns)
+
+
+def _where(key_columns):
+    return " AND ".join(f"{quote(column)} = ?" for column in key_columns)
+
+
+def _fetch_rows(conn, info, keys):
+    columns = _select_columns(info)
+    query = f"""
+    SELECT {", ".join(quote(column) for column in columns)}
+    FROM {quote(info.name)}
+    WHERE {_where(info.key_columns)}
+    """
+    rows = {}
+    for key in keys:
+        row = conn.execute(query, key).fetchone()
+        if row is not None:
+            rows[key] = list(row)
+    return columns, rows
+
+
+def _rollup_rows(conn, info, keys):
+    # 집계 행을 다시 계산할 question_results 행 [(user_id, question_idx, topic, created_ts)]
+    if info.name != "question_results":
+        return []
+    query = f"""
+    SELECT user_id, question_idx, topic, created_ts
+    FROM question_results
+    WHERE {_where(info.key_columns)}
+    """
+    rows = []
+    for key in keys:
+        row = conn.execute(query, key).fetchone()
+        if row is not None:
+            rows.append(tuple(row))
+    return rows
+
+
+def preview_plan(conn, plan):
+    """수정될 값 목록 [(키, 열, 이전 값, 새 값)]과 삭제될 행 목록을 반환합니다."""
+    info = table_info(conn, plan.table)
+    columns, before = _fetch_rows(conn, info, [key for key, _ in plan.updates])
+    changes = []
+    for key, values in plan.updates:
+        row = before.get(key)
+        for column, value in values.items():
+            old = row[columns.index(column)] if row is not None else None
+            if old != value:
+                changes.append((key, column, old, value))
+    _, deleted = _fetch_rows(conn, info, plan.deletes)
+    return changes, columns, list(deleted.values())
+
+
+def apply_plan(conn, plan):
+    """EditPlan을 한 트랜잭션으로 적용하고 되돌리기 기록 id를 반환합니다."""
+    info = table_info(conn, plan.table)
+    table = quote(info.name)
+    where = _where(info.key_columns)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        columns, updated = _fetch_rows(conn, info, [key for key, _ in plan.updates])
+        _, deleted = _fetch_rows(conn, info, plan.deletes)
+        touched = list(updated) + list(deleted)
+        before = _rollup_rows(conn, info, touched)
+
+        # 되돌릴 때 바꾼 열만, 그 뒤로 바뀌지 않았을 때만 되돌리도록 열별 (이전 값, 새 값)을 남깁니다.
+        changes = []
+        for key, values in plan.updates:
+            row = updated.get(key)
+            if row is None:
+                continue
+            changed = {
+                column: [row[columns.index(column)], value]
+                for column, value in values.items()
+                if row[columns.index(column)] != value
+            }
+            if changed:
+                changes.append([list(key), changed])
+
+        # 바꾸는 열 조합이 같은 행끼리 묶어서 executemany로 수정합니다.
+        groups = defaultdict(list)
+        for key, values in plan.updates:
+            changed = tuple(sorted(values))
+            groups[changed].append([values[column] for column in changed] + list(key))
+        for changed, params in groups.items():
+            assignments = ", ".join(f"{quote(column)} = ?" for column in changed)
+            conn.executemany(f"UPDATE {table} SET {assignments} WHERE {where}", params)
+        conn.executemany(f"DELETE FROM {table} WHERE {where}", plan.deletes)
+        if before:
+            refresh_rollup_rows(conn, before + _rollup_rows(conn, info, touched))
+
+        payload = {
+            "columns": columns,
+            "key_columns": list(info.key_columns),
+            "updated": list(updated.values()),
+            "changes": changes,
+            "deleted": list(deleted.values()),
+        }
+        cursor = conn.execute(
+            """
+            INSERT INTO admin_edit_journal
+                (table_name, updated_count, deleted_count, payload)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                info.name,
+                len(updated),
+                len(deleted),
+                json.dumps(payload, ensure_ascii=False, default=str),
+            ),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return cursor.lastrowid
+
+
+def recent_edits(conn, limit=10):
+    return conn.execute(
+        """
+        SELECT id, table_name, updated_count, deleted_count, created_at, undone_at
+        FROM admin_edit_journal
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (limit,),
+    ).fetchall()
+
+
+def _undo_changes(conn, table, keys, changes, conflicts):
+    # 현재 값이 일괄 수정에서 넣은 값과 같은 열만 이전 값으로 되돌립니다.
+    restored = 0
+    for key, changed in changes:
+        current = conn.execute(
+            f"""
+            SELECT {", ".join(quote(column) for column in changed)}
+            FROM {table}
+            WHERE {_where(keys)}
+            """,
+            key,
+        ).fetchone()
+        if current is None:
+            conflicts.append((tuple(key), None, "행이 삭제되어 되돌리지 않았습니다."))
+            continue
+        columns = []
+        for column, value in zip(changed, current):
+            old, new = changed[column]
+            if value == new:
+                columns.append(column)
+            else:
+                conflicts.append(
+                    (
+                        tuple(key),
+                        column,
+                        f"값이 {new!r}에서 {value!r}(으)로 바뀌어 되돌리지 않았습니다.",
+                    )
+                )
+        if columns:
+            assignments = ", ".join(f"{quote(column)} = ?" for column in columns)
+            conn.execute(
+                f"UPDATE {table} SET {assignments} WHERE {_where(keys)}",
+                [changed[column][0] for column in columns] + list(key),
+            )
+            restored += 1
+    return restored
+
+
+def _restore_deleted(conn, table, columns, keys, rows, conflicts):
+    # 같은 키의 행이 그 사이에 다시 생겼으면 덮어쓰지 않습니다.
+    restored = 0
+    for row in rows:
+        key = [row[columns.index(column)] for column in keys]
+        exists = conn.execute(
+            f"SELECT 1 FROM {table} WHERE {_where(keys)}", key
+        ).fetchone()
+        if exists:
+            conflicts.append(
+                (tuple(key), None, "같은 키의 행이 있어 다시 추가하지 않았습니다.")
+            )
+            continue
+        conn.execute(
+            f"""
+            INSERT INTO {table} ({", ".join(quote(column) for column in columns)})
+            VALUES ({", ".join("?" for _ in columns)})
+            """,
+            row,
+        )
+        restored += 1
+    return restored
+
+
+def undo_edit(conn, journal_id):
+    """기록된 일괄 수정을 되돌리고 UndoResult를 반환합니다.
+
+    수정된 행은 바꾼 열만 이전 값으로, 삭제된 행은 다시 추가합니다. 일괄 수정 뒤에
+    다른 값으로 바뀐 열이나 다시 생긴 행은 건드리지 않고 conflicts에 남깁니다.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            """
+            SELECT table_name, payload, undone_at
+            FROM admin_edit_journal
+            WHERE id = ?
+            """,
+            (journal_id,),
+        ).fetchone()
+        if row is None or row[2] is not None:
+            raise ValueError(f"되돌릴 수 없는 기록입니다: {journal_id}")
+
+        info = table_info(conn, row[0])
+        payload = json.loads(row[1])
+        columns = payload["columns"]
+        keys = payload["key_columns"]
+        table = quote(info.name)
+        conflicts = []
+        touched = [tuple(key) for key, _ in payload["changes"]] + [
+            tuple(row[columns.index(column)] for column in keys)
+            for row in payload["deleted"]
+        ]
+        before = _rollup_rows(conn, info, touched)
+
+        restored = _undo_changes(conn, table, keys, payload["changes"], conflicts)
+        restored += _restore_deleted(
+            conn, table, columns, keys, payload["deleted"], conflicts
+        )
+        rows = before + _rollup_rows(conn, info, touched)
+        if rows:
+            refresh_rollup_rows(conn, rows)
+        conn.execute(
+            """
+            UPDATE admin_edit_journal
+            SET undone_at = datetime('now', 'localtime')
+            WHERE id = ?
+            """,
+            (journal_id,),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return UndoResult(info.name, restored, conflicts)
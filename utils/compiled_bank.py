@@ -0,0 +1,279 @@
+"""exam/*.json 문제 은행을 검증하고 메모리 매핑 가능한 바이너리 파일로 컴파일합니다.
+
+실행: python -m utils.compiled_bank [--output exam/questions.bin]
+
+파일 구조 (모든 정수는 little-endian)
+- 헤더: magic(4s) version(H) reserved(H) max_idx(I) count(I) topics_offset(I) topics_length(I)
+- 인덱스 테이블: idx 0 ~ max_idx 각각에 대해 (offset(I), length(I), topic_no(H), reserved(H))
+  length가 0이면 해당 idx의 문제가 없다는 뜻입니다.
+- 토픽 테이블: [[topic, [idx, ...]], ...] 형태의 JSON (토픽 순서와 토픽별 문제 순서)
+- 본문: 문제별 JSON (utf-8, 공백 없음)
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import config
+
+MAGIC = b"IQB1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+ENTRY = struct.Struct("<IIHH")
+
+
+class BankValidationError(Exception):
+    def __init__(self, errors):
+        super().__init__(f"문제 은행 검증 실패 ({len(errors)}건)")
+        self.errors = errors
+
+
+def _validate_question(question, file_path, position, errors):
+    where = f"{file_path}[{position}]"
+    idx = question.get("idx")
+    if not isinstance(idx, int) or isinstance(idx, bool) or idx < 0:
+        errors.append(f"{where}: idx가 0 이상의 정수가 아닙니다 ({idx!r})")
+        return None
+
+    for field in ("question", "choices"):
+        value = question.get(field)
+        if not isinstance(value, dict) or not {"kor", "eng"} <= value.keys():
+            errors.append(f"{where} idx={idx}: {field}에 kor/eng가 없습니다")
+            return idx
+
+    answers = question.get("answers")
+    if not isinstance(answers, list) or not answers:
+        errors.append(f"{where} idx={idx}: answers가 비어 있습니다")
+        return idx
+
+    for lang in ("kor", "eng"):
+        choices = question["choices"][lang]
+        if not isinstance(choices, dict):
+            errors.append(f"{where} idx={idx}: choices.{lang}가 dict가 아닙니다")
+            continue
+        for answer in answers:
+            if answer not in choices:
+                errors.append(
+                    f"{where} idx={idx}: 정답 {answer!r}가 choices.{lang}에 없습니다"
+                )
+    return idx
+
+
+def validate_bank(topics=None):
+    """모든 주제 파일을 한 번에 검증하고 (topic, questions) 목록을 반환합니다.
+
+    문제가 있으면 모든 오류를 모아 BankValidationError로 알립니다.
+    """
+    topics = config.TOPICS if topics is None else topics
+    errors = []
+    loaded = []
+    seen_idx = {}
+    seen_old_idx = {}
+
+    for topic, topic_config in topics.items():
+        file_path = topic_config["file"]
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                questions = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            errors.append(f"{file_path}: 읽을 수 없습니다 ({e})")
+            continue
+
+        file_idx_list = []
+        for position, question in enumerate(questions):
+            idx = _validate_question(question, file_path, position, errors)
+            if idx is None:
+                continue
+            file_idx_list.append(idx)
+            if idx in seen_idx:
+                errors.append(f"{file_path}: idx={idx}가 {seen_idx[idx]}에도 있습니다")
+            else:
+                seen_idx[idx] = file_path
+
+            old_idx = question.get("oldIdx", question.get("oldidx"))
+            if old_idx is not None:
+                if old_idx in seen_old_idx:
+                    errors.append(
+                        f"{file_path}: oldIdx={old_idx}가 "
+                        f"idx={seen_old_idx[old_idx]}와 중복됩니다"
+                    )
+                else:
+                    seen_old_idx[old_idx] = idx
+
+        expected = topic_config.get("idx_list", [])
+        if file_idx_list != expected:
+            missing = sorted(set(expected) - set(file_idx_list))
+            extra = sorted(set(file_idx_list) - set(expected))
+            if missing or extra:
+                detail = f"누락={missing} 추가={extra}"
+            else:
+                detail = "순서 불일치"
+            errors.append(
+                f"{file_path}: config.TOPICS['{topic}']['idx_list']와 다릅니다 ({detail})"
+            )
+
+        loaded.append((topic, questions))
+
+    if errors:
+        raise BankValidationError(errors)
+    return loaded
+
+
+def compile_bank(output_path=None, topics=None):
+    """문제 은행을 검증한 뒤 바이너리 파일로 저장하고 문제 수를 반환합니다."""
+    output_path = output_path or config.COMPILED_BANK_FILE
+    loaded = validate_bank(topics)
+
+    records = {}
+    topic_table = []
+    for topic_no, (topic, questions) in enumerate(loaded):
+        topic_table.append([topic, [question["idx"] for question in questions]])
+        for question in questions:
+            payload = json.dumps(
+                question, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            records[question["idx"]] = (topic_no, payload)
+
+    max_idx = max(records) if records else 0
+    topics_blob = json.dumps(
+        topic_table, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    topics_offset = HEADER.size + ENTRY.size * (max_idx + 1)
+
+    table = bytearray(ENTRY.size * (max_idx + 1))
+    body = bytearray()
+    offset = topics_offset + len(topics_blob)
+    for idx in sorted(records):
+        topic_no, payload = records[idx]
+        ENTRY.pack_into(
+            table, ENTRY.size * idx, offset + len(body), len(payload), topic_no, 0
+        )
+        body += payload
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, max_idx, len(records), topics_offset, len(topics_blob)
+    )
+
+    # 실행 중인 서버가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(table)
+        f.write(topics_blob)
+        f.write(body)
+    os.replace(tmp_path, output_path)
+    return len(records)
+
+
+class CompiledBank:
+    """컴파일된 문제 은행 파일을 메모리 매핑해서 idx 단위로 읽습니다."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, max_idx, count, topics_offset, topics_length = (
+            HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path}: 지원하지 않는 문제 은행 형식입니다")
+
+        self.max_idx = max_idx
+        self.count = count
+        topic_table = json.loads(
+            self._mm[topics_offset : topics_offset + topics_length].decode("utf-8")
+        )
+        self.topics = [topic for topic, _ in topic_table]
+        self.topic_idx_lists = {
+            topic: tuple(idx_list) for topic, idx_list in topic_table
+        }
+
+    def _entry(self, idx):
+        if not 0 <= idx <= self.max_idx:
+            return None
+        offset, length, topic_no, _ = ENTRY.unpack_from(
+            self._mm, HEADER.size + ENTRY.size * idx
+        )
+        if length == 0:
+            return None
+        return offset, length, topic_no
+
+    def __contains__(self, idx):
+        return self._entry(idx) is not None
+
+    def get_question(self, idx):
+        entry = self._entry(idx)
+        if entry is None:
+            raise KeyError(idx)
+        offset, length, _ = entry
+        return json.loads(self._mm[offset : offset + length].decode("utf-8"))
+
+    def get_topic(self, idx):
+        entry = self._entry(idx)
+        if entry is None:
+            raise KeyError(idx)
+        return self.topics[entry[2]]
+
+    def close(self):
+        self._mm.close()
+
+
+_lock = threading.Lock()
+_opened = None
+
+
+def open_compiled_bank(path=None):
+    """프로세스에서 공유하는 CompiledBank를 반환합니다. 파일이 없으면 None을 반환합니다.
+
+    파일이 다시 빌드되면(mtime 변경) 새로 엽니다.
+    """
+    global _opened
+    path = path or config.COMPILED_BANK_FILE
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    bank = _opened
+    if bank is not None and bank.path == path and bank.mtime_ns == mtime_ns:
+        return bank
+
+    with _lock:
+        if _opened is None or _opened.path != path or _opened.mtime_ns != mtime_ns:
+            # 이전 mmap은 다른 세션이 아직 참조 중일 수 있으므로 닫지 않고 GC에 맡깁니다.
+            _opened = CompiledBank(path)
+        return _opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 은행 검증 및 컴파일")
+    parser.add_argument("--output", default=config.COMPILED_BANK_FILE)
+    parser.add_argument(
+        "--check", action="store_true", help="검증만 하고 파일은 만들지 않습니다"
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.check:
+            loaded = validate_bank()
+            count = sum(len(questions) for _, questions in loaded)
+            print(f"검증 완료: {len(loaded)}개 주제, {count}개 문제")
+        else:
+            count = compile_bank(args.output)
+            print(f"컴파일 완료: {count}개 문제 -> {args.output}")
+    except BankValidationError as e:
+        print(e, file=sys.stderr)
+        for error in e.errors:
+            print(f"  - {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import pandas as pd
+
+import config
+from utils.db import connection
+from utils.helpers import day_range
+from utils.result_cache import versioned_cache
+from utils.tracing import span, traced
+
+
+# 날짜별 문제 풀이 현황 쿼리 (activity_rollup 사용)
+def daily_stats_query(date, topic):
+    query = """
+    SELECT 
+        u.id as user_id,
+        u.name as user_name,
+        u.school,
+        u.team,
+        SUM(r.attempts) as total_attempts,
+        SUM(r.correct) as correct_answers,
+        SUM(r.attempts - r.correct) as incorrect_answers
+    FROM activity_rollup r
+    JOIN users u ON r.user_id = u.id
+    WHERE r.topic = ?
+    AND r.day = ?
+    GROUP BY u.id, u.name, u.school, u.team
+    """
+    return query, (topic, date.isoformat())
+
+
+# 주제별 문제 확인 현황 쿼리 (날짜 필터링 추가)
+def topic_progress_query(topic, start_date=None, end_date=None):
+    idx_list = ",".join(map(str, config.TOPICS[topic].get("idx_list", [])))
+    query = f"""
+    SELECT 
+        u.id as user_id,
+        u.name as user_name,
+        u.school,
+        u.team,
+        COUNT(DISTINCT qr.question_idx) as checked_questions,
+        SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END) as correct_answers,
+        COUNT(*) as total_attempts
+    FROM question_results qr
+    JOIN users u ON qr.user_id = u.id
+    WHERE qr.question_idx IN ({idx_list})
+    AND qr.topic = ?
+    """
+    params = [topic]
+    if start_date and end_date:
+        query += " AND qr.created_ts >= ? AND qr.created_ts < ?"
+        params.extend(day_range(start_date, end_date))
+    query += " GROUP BY u.id, u.name, u.school, u.team"
+    return query, params
+
+
+# 시간대별 활동 쿼리 (사용자별, activity_rollup 사용)
+def hourly_activity_query(date, topic):
+    query = """
+    SELECT 
+        u.id as user_id,
+        u.name as user_name,
+        printf('%02d', r.hour) as hour,
+        SUM(r.attempts) as activity_count
+    FROM activity_rollup r
+    JOIN users u ON r.user_id = u.id
+    WHERE r.topic = ?
+    AND r.day = ?
+    GROUP BY u.id, u.name, r.hour
+    ORDER BY u.id, hour
+    """
+    return query, (topic, date.isoformat())
+
+
+# 주제별 문제 풀이 현황 쿼리 (날짜 필터링 추가)
+# 전체 기간은 question_attempts 요약 테이블을, 기간을 선택하면 원본 기록을 사용합니다.
+def problem_attempts_query(topic, start_date=None, end_date=None):
+    if not (start_date and end_date):
+        query = """
+        SELECT 
+            qa.question_idx,
+            u.id as user_id,
+            u.name as user_name,
+            qa.attempt_count,
+            qa.correct_count,
+            qa.first_attempt,
+            qa.last_attempt
+        FROM question_attempts qa
+        JOIN users u ON qa.user_id = u.id
+        WHERE qa.topic = ?
+        ORDER BY qa.question_idx
+        """
+        return query, [topic]
+
+    query = """
+    SELECT 
+        qr.question_idx,
+        u.id as user_id,
+        u.name as user_name,
+        COUNT(*) as attempt_count,
+        SUM(CASE WHEN qr.correct = 1 THEN 1 ELSE 0 END) as correct_count,
+        MIN(qr.created_ts) as first_attempt,
+        MAX(qr.created_ts) as last_attempt
+    FROM question_results qr
+    JOIN users u ON qr.user_id = u.id
+    WHERE qr.topic = ?
+    """
+    query += " AND qr.created_ts >= ? AND qr.created_ts < ?"
+    query += " GROUP BY qr.question_idx, u.id, u.name ORDER BY qr.question_idx, attempt_count DESC"
+    return query, [topic, *day_range(start_date, end_date)]
+
+
+@traced
+def _to_local_datetime(timestamps):
+    # epoch 초를 config.TIMEZONE 기준 시각(시간대 정보 없음)으로 변환합니다.
+    return (
+        pd.to_datetime(timestamps, unit="s", utc=True)
+        .dt.tz_convert(config.TIMEZONE)
+        .dt.tz_localize(None)
+    )
+
+
+def _read(query, params):
+    with connection() as conn, span("dashboard.read_sql"):
+        return pd.read_sql_query(query, conn, params=params)
+
+
+# 날짜별 문제 풀이 현황을 가져오는 함수
+@versioned_cache
+@traced
+def get_daily_stats(date, topic):
+    return _read(*daily_stats_query(date, topic))
+
+
+# 주제별 문제 확인 현황을 가져오는 함수 (날짜 필터링 추가)
+@versioned_cache
+@traced
+def get_topic_progress(topic, start_date=None, end_date=None):
+    return _read(*topic_progress_query(topic, start_date, end_date))
+
+
+# 시간대별 활동을 가져오는 함수 (사용자별)
+@versioned_cache
+@traced
+def get_hourly_activity(date, topic):
+    return _read(*hourly_activity_query(date, topic))
+
+
+# 주제별 문제 풀이 현황을 가져오는 함수 (날짜 필터링 추가)
+@versioned_cache
+@traced
+def get_problem_attempts(topic, start_date=None, end_date=None):
+    df = _read(*problem_attempts_query(topic, start_date, end_date))
+
+    for column in ("first_attempt", "last_attempt"):
+        df[column] = _to_local_datetime(df[column])
+
+    return df
+
+
+# 모든 문제를 각각 min_attempts회 이상 시도한 사용자 목록 (get_problem_attempts 결과 사용)
+@traced
+def get_frequent_users(problem_attempts, min_attempts):
+    # 사용자별로 min_attempts회 이상 시도한 문제 수를 세어, 전체 문제 수와 같은 사용자만 남깁니다.
+    attempts = problem_attempts.groupby(["user_id", "question_idx"], sort=False)[
+        "attempt_count"
+    ].sum()
+    enough = (attempts >= min_attempts).groupby(level="user_id", sort=False).sum()
+    total_problems = problem_attempts["question_idx"].nunique()
+    user_ids = enough.index[enough == total_problems]
+
+    names = problem_attempts.drop_duplicates("user_id").set_index("user_id")
+    result = names.loc[user_ids, ["user_name"]].reset_index()
+    return result.sort_values("user_name")
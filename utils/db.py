@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import config
+from utils.migrations import migrate
+from utils.slow_queries import SlowQueryConnection
+from utils.tracing import traced
+
+
+# 공용 SQLite 연결 계층
+# Streamlit은 rerun마다 새 스크립트 스레드를 사용하므로, 연결을 스레드에 묶어두면
+# rerun마다 다시 연결하게 됩니다. 대신 영구 연결을 풀에 보관하고, 실행 중인 스레드가
+# 하나를 빌려 쓰는 동안에는 같은 스레드의 중첩 호출도 같은 연결을 사용합니다.
+_pool_lock = threading.Lock()
+_pool = []
+_local = threading.local()
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+@traced(name="db.connect")
+def _connect(path=None):
+    path = path or config.DB_PATH
+    conn = sqlite3.connect(
+        path,
+        timeout=config.DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        factory=SlowQueryConnection,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA busy_timeout = {int(config.DB_BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = {int(config.DB_CACHE_SIZE)}")
+    conn.execute(f"PRAGMA mmap_size = {int(config.DB_MMAP_SIZE)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    # 프로세스에서 처음 연결할 때 스키마 마이그레이션을 적용합니다.
+    if path not in _migrated:
+        with _migrate_lock:
+            if path not in _migrated:
+                migrate(conn)
+                _migrated.add(path)
+    return conn
+
+
+def _acquire():
+    with _pool_lock:
+        if _pool:
+            return _pool.pop()
+    return _connect()
+
+
+def _release(conn):
+    # 끝나지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리합니다.
+    if conn.in_transaction:
+        conn.rollback()
+    with _pool_lock:
+        if len(_pool) < config.DB_POOL_SIZE:
+            _pool.append(conn)
+            return
+    conn.close()
+
+
+@contextmanager
+def connection():
+    """풀에서 연결을 빌려 사용합니다.
+
+    블록이 예외로 끝나면 열린 트랜잭션을 롤백하고, 끝나면 연결을 풀에 반납합니다.
+    같은 스레드에서 중첩해서 호출하면 같은 연결을 돌려줍니다.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+
+    conn = _acquire()
+    _local.conn = conn
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        _local.conn = None
+        _release(conn)
+
+
+def close_all():
+    """풀에 보관된 연결을 모두 닫습니다."""
+    with _pool_lock:
+        conns = list(_pool)
+        _pool.clear()
+    for conn in conns:
+        conn.close()
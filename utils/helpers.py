@@ -1,5 +1,8 @@
 import json
-from datetime import date
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import config
 
 
 def load_questions(file_path):
@@ -40,3 +43,33 @@ def save_result(results, file_path, name, success):
 
     with open(file_path, "w") as f:
         json.dump(results, f)
+
+
+def local_timezone():
+    """기록과 대시보드에서 사용하는 기준 시간대 (config.TIMEZONE)"""
+    return ZoneInfo(config.TIMEZONE)
+
+
+def now_local():
+    return datetime.now(local_timezone())
+
+
+def to_timestamp(value):
+    """datetime(시간대 없으면 기준 시간대로 간주)을 epoch 초로 변환합니다."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=local_timezone())
+    return int(value.timestamp())
+
+
+def utc_offset_seconds(day):
+    """기준 시간대에서 해당 날짜 정오의 UTC 오프셋(초)"""
+    noon = datetime.combine(day, time(12), local_timezone())
+    return int(noon.utcoffset().total_seconds())
+
+
+def day_range(start_day, end_day=None):
+    """start_day 00:00 ~ end_day 다음날 00:00 (기준 시간대)을 [start_ts, end_ts) epoch 초로 반환합니다."""
+    end_day = end_day or start_day
+    start = datetime.combine(start_day, time(0), local_timezone())
+    end = datetime.combine(end_day + timedelta(days=1), time(0), local_timezone())
+    return int(start.timestamp()), int(end.timestamp())
@@ -0,0 +1,155 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import config
+from utils.ranking import (
+    count_ranked_users,
+    get_group_top_rankings,
+    get_overall_ranking,
+    get_ranking_filters,
+    get_school_ranking,
+    get_team_ranking,
+)
+from utils.result_cache import dashboard_cache
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# 모든 세션이 공유하는 읽기 전용 랭킹 스냅샷
+# DataFrame을 수정하지 말고 필터링/슬라이싱한 새 DataFrame만 사용해야 합니다.
+# overall은 필터 없는 전체 랭킹, school_tops/team_tops는 {이름: 랭킹}으로 소속/팀 필터를 건
+# 랭킹의 앞쪽 config.LEADERBOARD_SNAPSHOT_ROWS명입니다. 인원 수는 schools/teams의 member_count.
+# 소속과 팀을 함께 고르거나 그 뒤 페이지를 볼 때는 get_ranking_page()가 SQL로 가져와
+# 스냅샷이 바뀔 때까지 결과 캐시에 둡니다. (count_ranking()도 마찬가지)
+LeaderboardSnapshot = namedtuple(
+    "LeaderboardSnapshot",
+    [
+        "overall",
+        "total_users",
+        "school_names",
+        "team_names",
+        "schools",
+        "teams",
+        "school_tops",
+        "team_tops",
+        "built_at",
+    ],
+)
+
+_lock = threading.Lock()
+_snapshot = None
+_refreshing = False
+
+
+def _group_tops(groups, column):
+    # 소속/팀 안에서 앞쪽 LEADERBOARD_SNAPSHOT_ROWS명만 이름별로 나눕니다.
+    rows = groups[groups[f"{column}_row"] <= config.LEADERBOARD_SNAPSHOT_ROWS]
+    return {
+        name: group.drop(columns=["school_row", "team_row"]).reset_index(drop=True)
+        for name, group in rows.groupby(column, sort=False)
+    }
+
+
+@traced
+def build_snapshot():
+    school_names, team_names = get_ranking_filters()
+    groups = get_group_top_rankings(config.LEADERBOARD_SNAPSHOT_ROWS)
+    return LeaderboardSnapshot(
+        overall=get_overall_ranking(limit=config.LEADERBOARD_SNAPSHOT_ROWS),
+        total_users=count_ranked_users(),
+        school_names=school_names,
+        team_names=team_names,
+        schools=get_school_ranking(),
+        teams=get_team_ranking(),
+        school_tops=_group_tops(groups, "school"),
+        team_tops=_group_tops(groups, "team"),
+        built_at=time.time(),
+    )
+
+
+def _member_count(stats, column, name):
+    members = stats.loc[stats[column] == name, "member_count"]
+    return int(members.iloc[0]) if len(members) else 0
+
+
+def _snapshot_top(snapshot, school, team):
+    # (스냅샷에 담긴 상위 랭킹, 필터에 맞는 사용자 수), 소속과 팀을 함께 고르면 (None, None)
+    if school is None and team is None:
+        return snapshot.overall, snapshot.total_users
+    if team is None:
+        top = snapshot.school_tops.get(school, snapshot.overall.iloc[0:0])
+        return top, _member_count(snapshot.schools, "school", school)
+    if school is None:
+        top = snapshot.team_tops.get(team, snapshot.overall.iloc[0:0])
+        return top, _member_count(snapshot.teams, "team", team)
+    return None, None
+
+
+def count_ranking(snapshot, school=None, team=None):
+    """필터에 맞는 사용자 수. 스냅샷에 없으면 SQL로 세어 스냅샷이 바뀔 때까지 캐시합니다."""
+    _, total = _snapshot_top(snapshot, school, team)
+    if total is None:
+        key = ("ranking_count", school, team, snapshot.built_at)
+        total = dashboard_cache.get(key)
+        if total is None:
+            total = count_ranked_users(school, team)
+            dashboard_cache.put(key, total)
+    return total
+
+
+def get_ranking_page(snapshot, school=None, team=None, limit=50, offset=0):
+    """필터에 맞는 랭킹의 한 페이지를 반환합니다.
+
+    스냅샷에 담긴 범위는 스냅샷에서 자르고, 나머지는 SQL로 조회해 같은 스냅샷을 보는 동안
+    결과 캐시에서 재사용합니다.
+    """
+    top, total = _snapshot_top(snapshot, school, team)
+    if top is not None and min(offset + limit, total) <= len(top):
+        return top.iloc[offset : offset + limit]
+
+    key = ("ranking_page", school, team, limit, offset, snapshot.built_at)
+    page = dashboard_cache.get(key)
+    if page is None:
+        page = get_overall_ranking(school, team, limit, offset)
+        dashboard_cache.put(key, page)
+    return page
+
+
+def _refresh():
+    global _snapshot, _refreshing
+    try:
+        _snapshot = build_snapshot()
+    except Exception:
+        # 갱신에 실패하면 이전 스냅샷을 계속 사용합니다.
+        logger.exception("랭킹 스냅샷을 갱신하지 못했습니다.")
+    finally:
+        with _lock:
+            _refreshing = False
+
+
+def get_leaderboard_snapshot():
+    """프로세스에서 공유하는 랭킹 스냅샷을 반환합니다.
+
+    처음 호출될 때 스냅샷을 만들고, 이후에는 config.LEADERBOARD_REFRESH_SECONDS보다
+    오래된 스냅샷을 읽을 때만 백그라운드에서 한 번 다시 만듭니다. (그동안은 이전 스냅샷 사용)
+    아무도 랭킹(랭킹 페이지, 사이드바의 내 순위)을 보지 않으면 다시 만들지 않습니다.
+    """
+    global _snapshot, _refreshing
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot = build_snapshot()
+            return _snapshot
+
+    if time.time() - snapshot.built_at > config.LEADERBOARD_REFRESH_SECONDS:
+        with _lock:
+            start = not _refreshing
+            _refreshing = True
+        if start:
+            threading.Thread(
+                target=_refresh, name="leaderboard-refresher", daemon=True
+            ).start()
+    return snapshot
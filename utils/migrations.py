@@ -0,0 +1,147 @@
+"""버전이 매겨진 스키마 마이그레이션을 적용합니다.
+
+db/migrations 의 `NNNN_이름.sql` 또는 `NNNN_이름.py`(migrate(conn) 함수 정의) 파일을
+번호 순서대로 적용하고, 적용한 버전을 schema_migrations 테이블에 기록합니다.
+서버는 첫 DB 연결 시 자동으로 적용하며, 직접 실행할 수도 있습니다.
+
+실행: python -m utils.migrations [--db db/db.sqlite] [--status]
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sqlite3
+
+import config
+
+SCHEMA_FILE = "db/db.sql"
+MIGRATIONS_DIR = "db/migrations"
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.(sql|py)$")
+
+
+def split_statements(sql):
+    """SQL 스크립트를 문장 단위로 나눕니다. (트리거 본문의 ;도 올바르게 처리)"""
+    statements = []
+    buffer = ""
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip() and not all(
+        part.strip().startswith("--") or not part.strip()
+        for part in buffer.splitlines()
+    ):
+        raise ValueError(f"완결되지 않은 SQL 문장이 있습니다: {buffer.strip()[:80]}")
+    return statements
+
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _FILENAME.match(filename)
+        if match:
+            migrations.append(
+                (int(match.group(1)), match.group(2), os.path.join(directory, filename))
+            )
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"{directory}: 마이그레이션 번호가 중복됩니다")
+    return migrations
+
+
+def _ensure_tables(conn):
+    with open(SCHEMA_FILE, "r", encoding="utf-8") as f:
+        schema = f.read()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for statement in split_statements(schema):
+            conn.execute(statement)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+            )
+            """
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def applied_versions(conn):
+    return {
+        row[0] for row in conn.execute("SELECT version FROM schema_migrations")
+    }
+
+
+def _apply(conn, version, name, path):
+    if path.endswith(".sql"):
+        with open(path, "r", encoding="utf-8") as f:
+            for statement in split_statements(f.read()):
+                conn.execute(statement)
+    else:
+        spec = importlib.util.spec_from_file_location(f"migration_{version}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.migrate(conn)
+    conn.execute(
+        "INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name)
+    )
+
+
+def migrate(conn, directory=MIGRATIONS_DIR):
+    """적용되지 않은 마이그레이션을 순서대로 적용하고, 적용한 버전 목록을 반환합니다.
+
+    각 마이그레이션은 BEGIN IMMEDIATE 트랜잭션 안에서 적용되므로, 여러 프로세스가
+    동시에 시작해도 한 번만 적용됩니다.
+    """
+    _ensure_tables(conn)
+    applied = []
+    for version, name, path in list_migrations(directory):
+        if version in applied_versions(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 락을 잡은 뒤 다른 프로세스가 먼저 적용했는지 다시 확인합니다.
+            if version not in applied_versions(conn):
+                _apply(conn, version, name, path)
+                applied.append(version)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    parser.add_argument("--db", default=config.DB_PATH)
+    parser.add_argument(
+        "--status", action="store_true", help="적용 상태만 출력합니다"
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.status:
+            _ensure_tables(conn)
+            done = applied_versions(conn)
+            for version, name, _ in list_migrations():
+                state = "applied" if version in done else "pending"
+                print(f"{version:04d} {name}: {state}")
+        else:
+            applied = migrate(conn)
+            print(f"적용한 마이그레이션: {applied or '없음'}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
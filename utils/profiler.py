@@ -0,0 +1,258 @@
+"""특정 세션의 rerun만 골라서 프로파일링합니다.
+
+관리자 페이지의 "프로파일러" 탭에서 사용자와 rerun 횟수를 지정하면, 그 사용자의
+문제 풀이 페이지/대시보드 rerun을 지정한 횟수만큼 샘플링합니다.
+config.PROFILER_QUERY_PARAM이 켜져 있으면 ?profile=5 처럼 주소에 붙여 현재 세션의
+다음 rerun을 직접 지정할 수도 있습니다.
+
+샘플링 프로파일러: 별도 스레드가 config.PROFILER_INTERVAL_MS마다 rerun 스레드의
+호출 스택을 읽어 세므로, 다른 세션에는 영향이 없고 프로파일 대상도 거의 느려지지 않습니다.
+샘플 간격은 GIL을 기다리느라 설정보다 길어질 수 있으므로, 시간은 샘플 비율에 rerun 시간을 곱해 계산합니다.
+결과는 flamegraph 도구(flamegraph.pl, speedscope 등)가 읽는 folded 형식
+("바깥;...;안쪽 샘플 수")으로 내려받거나, 관리자 페이지에서 호출 트리로 볼 수 있습니다.
+"""
+
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque, namedtuple
+
+import streamlit as st
+
+import config
+
+# stacks: Counter({"바깥;...;안쪽": 샘플 수})
+Profile = namedtuple(
+    "Profile",
+    ["id", "page", "user_id", "started_at", "duration_ms", "samples", "stacks"],
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 측정용 데코레이터 프레임은 스택에서 뺍니다.
+_WRAPPER_FILES = {
+    os.path.join(ROOT, "utils", "profiler.py"),
+    os.path.join(ROOT, "utils", "tracing.py"),
+}
+
+_lock = threading.Lock()
+_requests = {}  # user_id -> 남은 rerun 수
+_profiles = deque(maxlen=config.PROFILER_MAX_PROFILES)
+_ids = itertools.count(1)
+
+
+def request(user_id, reruns):
+    """user_id 사용자의 다음 reruns회 rerun을 프로파일링하도록 예약합니다."""
+    with _lock:
+        _requests[user_id] = reruns
+
+
+def cancel(user_id):
+    with _lock:
+        _requests.pop(user_id, None)
+
+
+def pending_requests():
+    with _lock:
+        return dict(_requests)
+
+
+def profiles():
+    """기록된 프로파일 목록 (최신 순)"""
+    with _lock:
+        return list(reversed(_profiles))
+
+
+def clear_profiles():
+    with _lock:
+        _profiles.clear()
+
+
+def _take_request():
+    # 현재 세션이 프로파일 대상이면 남은 횟수를 하나 줄이고 True를 반환합니다.
+    if config.PROFILER_QUERY_PARAM:
+        value = st.query_params.get("profile")
+        if value and value != st.session_state.get("_profile_param"):
+            st.session_state["_profile_param"] = value
+            if value.isdigit():
+                st.session_state["_profile_remaining"] = int(value)
+        remaining = st.session_state.get("_profile_remaining", 0)
+        if remaining > 0:
+            st.session_state["_profile_remaining"] = remaining - 1
+            return True
+
+    user = st.session_state.get("user")
+    if user is None or not _requests:
+        return False
+    with _lock:
+        remaining = _requests.get(user["id"], 0)
+        if remaining <= 0:
+            return False
+        if remaining == 1:
+            del _requests[user["id"]]
+        else:
+            _requests[user["id"]] = remaining - 1
+    return True
+
+
+def _frame_name(frame):
+    # 같은 함수는 한 칸으로 모이도록 줄 번호 대신 함수 시작 줄을 씁니다.
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_app_code(frame):
+    filename = frame.f_code.co_filename
+    return filename.startswith(ROOT) and "site-packages" not in filename
+
+
+class _Sampler:
+    """thread_id 스레드의 호출 스택을 interval초마다 셉니다."""
+
+    def __init__(self, thread_id, interval, max_seconds):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.deadline = time.monotonic() + max_seconds
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="rerun-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def _sample(self, frame):
+        names = []
+        in_app = False
+        # Streamlit 실행 코드 위쪽은 매번 같으므로, 앱 코드가 처음 나오는 지점부터 남깁니다.
+        for current in reversed(_walk(frame)):
+            if not in_app and _is_app_code(current):
+                in_app = True
+            if in_app and current.f_code.co_filename not in _WRAPPER_FILES:
+                names.append(_frame_name(current))
+        if names:
+            self.stacks[";".join(names)] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or time.monotonic() > self.deadline:
+                break  # rerun 스레드가 끝났거나 최대 시간을 넘긴 경우
+            self._sample(frame)
+            del frame
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _walk(frame):
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+class _Run:
+    __slots__ = ("page", "user_id", "started", "started_at", "sampler")
+
+    def __init__(self, page):
+        user = st.session_state.get("user")
+        self.page = page
+        self.user_id = user["id"] if user else None
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.sampler = _Sampler(
+            threading.get_ident(),
+            config.PROFILER_INTERVAL_MS / 1000,
+            config.PROFILER_MAX_SECONDS,
+        )
+
+    def end(self):
+        if self.sampler is None:
+            return
+        self.sampler.stop()
+        stacks, self.sampler = self.sampler.stacks, None
+        profile = Profile(
+            next(_ids),
+            self.page,
+            self.user_id,
+            self.started_at,
+            (time.perf_counter() - self.started) * 1000,
+            sum(stacks.values()),
+            stacks,
+        )
+        with _lock:
+            _profiles.append(profile)
+
+
+def profiled_page(page):
+    """페이지 함수의 rerun을 대상 세션일 때만 샘플링하는 데코레이터 (st.stop()/st.rerun() 포함)"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _take_request():
+                return func(*args, **kwargs)
+            run = _Run(page)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                run.end()
+
+        return wrapper
+
+    return decorator
+
+
+def folded(profile):
+    """flamegraph 도구용 folded 형식 문자열"""
+    return "".join(
+        f"{stack} {count}\n" for stack, count in sorted(profile.stacks.items())
+    )
+
+
+def sample_ms(profile, count):
+    """샘플 수를 rerun 시간 중 그 비율만큼의 시간(ms)으로 바꿉니다."""
+    return profile.duration_ms * count / profile.samples if profile.samples else 0.0
+
+
+def self_time(profile, limit=30):
+    """함수별 (이름, 자기 자신에서 보낸 샘플 수, 포함 샘플 수) 목록 (자기 시간 순)"""
+    own = Counter()
+    total = Counter()
+    for stack, count in profile.stacks.items():
+        names = stack.split(";")
+        own[names[-1]] += count
+        for name in set(names):
+            total[name] += count
+    return [(name, count, total[name]) for name, count in own.most_common(limit)]
+
+
+def call_tree(profile, min_share=0.01):
+    """호출 트리를 (깊이, 이름, 샘플 수) 목록으로 반환합니다. min_share 미만 가지는 생략합니다."""
+    tree = {}
+    for stack, count in profile.stacks.items():
+        node = tree
+        for name in stack.split(";"):
+            child = node.setdefault(name, [0, {}])
+            child[0] += count
+            node = child[1]
+
+    minimum = profile.samples * min_share
+    lines = []
+
+    def visit(node, depth):
+        for name, (count, children) in sorted(
+            node.items(), key=lambda item: item[1][0], reverse=True
+        ):
+            if count < minimum:
+                continue
+            lines.append((depth, name, count))
+            visit(children, depth + 1)
+
+    visit(tree, 0)
+    return lines
@@ -0,0 +1,98 @@
+"""대시보드, 로그인, 랭킹 쿼리가 인덱스를 사용하는지 EXPLAIN QUERY PLAN으로 확인합니다.
+
+마이그레이션을 적용한 임시 DB에서 각 쿼리의 실행 계획을 확인하고,
+테이블 전체를 훑는(SCAN) 단계가 있으면 실패합니다.
+
+실행: python -m utils.query_plans [--verbose]
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+
+from utils import auth, dashboard, ranking
+from utils.migrations import migrate
+
+_TOPIC = "cloudFundamentals"
+_DAY = date(2024, 9, 2)
+
+
+def planned_queries():
+    """(이름, 쿼리, 파라미터) 목록을 반환합니다."""
+    return [
+        ("get_daily_stats", *dashboard.daily_stats_query(_DAY, _TOPIC)),
+        ("get_topic_progress", *dashboard.topic_progress_query(_TOPIC)),
+        (
+            "get_topic_progress (기간)",
+            *dashboard.topic_progress_query(_TOPIC, _DAY, _DAY),
+        ),
+        ("get_hourly_activity", *dashboard.hourly_activity_query(_DAY, _TOPIC)),
+        ("get_problem_attempts", *dashboard.problem_attempts_query(_TOPIC)),
+        (
+            "get_problem_attempts (기간)",
+            *dashboard.problem_attempts_query(_TOPIC, _DAY, _DAY),
+        ),
+        ("login", auth.LOGIN_QUERY, ("name", "school", "team")),
+        ("get_overall_ranking", *ranking.overall_ranking_query()),
+        (
+            "get_overall_ranking (소속 필터)",
+            *ranking.overall_ranking_query(school="Nxtcloud", offset=50),
+        ),
+        ("get_user_rank", *ranking.user_rank_query(1)),
+    ]
+
+
+def explain(conn, query, params):
+    return [
+        row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", tuple(params))
+    ]
+
+
+def full_scans(plan):
+    """인덱스 없이 테이블 전체를 읽는 단계를 반환합니다."""
+    return [
+        step
+        for step in plan
+        if re.match(r"^SCAN \w+( |$)", step) and "INDEX" not in step
+    ]
+
+
+def check_query_plans(conn, verbose=False):
+    failures = []
+    for name, query, params in planned_queries():
+        plan = explain(conn, query, params)
+        scans = full_scans(plan)
+        if verbose or scans:
+            print(f"[{'FAIL' if scans else 'OK'}] {name}")
+            for step in plan:
+                print(f"    {step}")
+        if scans:
+            failures.append((name, scans))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "plans.sqlite"))
+        try:
+            migrate(conn)
+            failures = check_query_plans(conn, args.verbose)
+        finally:
+            conn.close()
+
+    if failures:
+        print(f"인덱스를 사용하지 않는 쿼리 {len(failures)}개", file=sys.stderr)
+        sys.exit(1)
+    print("모든 쿼리가 인덱스를 사용합니다.")
+
+
+if __name__ == "__main__":
+    main()
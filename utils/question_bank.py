@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+import config
+from utils.compiled_bank import open_compiled_bank
+
+
+# 프로세스 전체에서 공유하는 읽기 전용 문제 은행
+# 모든 세션이 같은 객체를 참조하고, 세션에는 문제 위치(인덱스)만 저장합니다.
+_lock = threading.Lock()
+_banks = {}  # file_path -> (mtime_ns, size, sha256, questions)
+_bank_version = 0  # 주제 파일의 내용이 바뀌어 다시 파싱할 때마다 1씩 증가
+
+
+def _freeze(value):
+    """JSON 값을 수정 불가능한 형태(MappingProxyType, tuple)로 변환합니다."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _read_file(file_path):
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def get_topic_questions(file_path):
+    """주제 파일의 문제 목록을 공유 캐시에서 반환합니다.
+
+    파일의 mtime 또는 크기가 바뀌면 해시를 다시 계산하고, 내용이 달라진 경우에만 다시 파싱합니다.
+    """
+    global _bank_version
+    stat = os.stat(file_path)
+    cached = _banks.get(file_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[3]
+
+    with _lock:
+        cached = _banks.get(file_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[3]
+
+        raw, digest = _read_file(file_path)
+        if cached and cached[2] == digest:
+            questions = cached[3]
+        else:
+            questions = _freeze(json.loads(raw.decode("utf-8")))
+            _bank_version += 1
+        _banks[file_path] = (stat.st_mtime_ns, stat.st_size, digest, questions)
+        return questions
+
+
+def clear_cache():
+    global _bank_version
+    with _lock:
+        _banks.clear()
+        _bank_version += 1
+
+
+def check_for_updates():
+    """모든 주제 파일이 바뀌었는지 확인하고 문제 은행 버전을 반환합니다.
+
+    lookup_question()/lookup_old_idx()는 파일을 확인하지 않고 이 버전만 비교하므로,
+    페이지에서 rerun마다 한 번 호출합니다.
+    """
+    for topic_config in config.TOPICS.values():
+        get_topic_questions(topic_config["file"])
+    return _bank_version
+
+
+def _compiled_bank_for(topic):
+    # 컴파일된 파일이 주제 JSON보다 최신일 때만 사용하고, 아니면 JSON으로 대체합니다.
+    bank = open_compiled_bank()
+    if bank is None or topic not in bank.topic_idx_lists:
+        return None
+    if os.stat(config.TOPICS[topic]["file"]).st_mtime_ns > bank.mtime_ns:
+        return None
+    return bank
+
+
+def get_topic_size(topic):
+    bank = _compiled_bank_for(topic)
+    if bank is not None:
+        return len(bank.topic_idx_lists[topic])
+    return len(get_topic_questions(config.TOPICS[topic]["file"]))
+
+
+def get_question(topic, position):
+    """주제 내 position 번째 문제를 반환합니다. 컴파일된 파일이 있으면 해당 문제만 읽습니다."""
+    bank = _compiled_bank_for(topic)
+    if bank is not None:
+        return bank.get_question(bank.topic_idx_lists[topic][position])
+    return get_topic_questions(config.TOPICS[topic]["file"])[position]
+
+
+# 전체 주제를 아우르는 문제 레지스트리 (idx / oldIdx -> 문제 정보)
+QuestionEntry = namedtuple(
+    "QuestionEntry",
+    ["idx", "old_idx", "topic", "position", "category", "subcategory", "question"],
+)
+
+_registry = None  # (만들 때의 문제 은행 버전, by_idx, by_old_idx)
+
+
+def _build_registry(topic_questions):
+    by_idx = {}
+    by_old_idx = {}
+    for topic, questions in topic_questions:
+        for position, question in enumerate(questions):
+            old_idx = question.get("oldIdx", question.get("oldidx"))
+            entry = QuestionEntry(
+                idx=question["idx"],
+                old_idx=old_idx,
+                topic=topic,
+                position=position,
+                category=question.get("category", ()),
+                subcategory=question.get("subcategory", ()),
+                question=question,
+            )
+            by_idx[entry.idx] = entry
+            if old_idx is not None:
+                by_old_idx[old_idx] = entry
+    return MappingProxyType(by_idx), MappingProxyType(by_old_idx)
+
+
+def _get_registry():
+    global _registry
+    registry = _registry
+    if registry is not None and registry[0] == _bank_version:
+        return registry
+
+    # 처음이거나 check_for_updates()가 바뀐 파일을 찾은 경우에만 다시 만듭니다.
+    topic_questions = [
+        (topic, get_topic_questions(topic_config["file"]))
+        for topic, topic_config in config.TOPICS.items()
+    ]
+    version = _bank_version
+    with _lock:
+        if _registry is None or _registry[0] != version:
+            _registry = (version, *_build_registry(topic_questions))
+        return _registry
+
+
+def lookup_question(idx):
+    """idx로 문제 정보(QuestionEntry)를 찾습니다. 없으면 None을 반환합니다."""
+    return _get_registry()[1].get(idx)
+
+
+def lookup_old_idx(old_idx):
+    """이전 문제 번호(oldIdx)로 문제 정보(QuestionEntry)를 찾습니다."""
+    return _get_registry()[2].get(old_idx)
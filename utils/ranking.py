@@ -0,0 +1,166 @@
+import pandas as pd
+
+from utils.db import connection
+from utils.tracing import traced
+
+
+def _filter_clause(school=None, team=None):
+    conditions = []
+    params = []
+    if school is not None:
+        conditions.append("school = ?")
+        params.append(school)
+    if team is not None:
+        conditions.append("team = ?")
+        params.append(team)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+# 전체 랭킹 쿼리 (필터/페이지 단위)
+# rank는 필터와 관계없이 전체 사용자 중 순위이며, 점수가 더 높은 사용자 수 + 1 입니다.
+def overall_ranking_query(school=None, team=None, limit=50, offset=0):
+    where, params = _filter_clause(school, team)
+    query = f"""
+    SELECT
+        (SELECT COUNT(*) FROM users AS higher WHERE higher.points > u.points) + 1
+            AS rank,
+        id, name, school, team, points, correct, incorrect
+    FROM users AS u
+    {where}
+    ORDER BY points DESC, id
+    LIMIT ? OFFSET ?
+    """
+    return query, [*params, limit, offset]
+
+
+# 내 순위 쿼리: points 인덱스에서 나보다 점수가 높은 사용자 수를 셉니다.
+def user_rank_query(user_id):
+    query = """
+    SELECT
+        (SELECT COUNT(*) FROM users AS higher WHERE higher.points > me.points) + 1
+            AS rank,
+        me.points
+    FROM users AS me
+    WHERE me.id = ?
+    """
+    return query, (user_id,)
+
+
+# 소속별/팀별 상위 limit명을 한 번에 가져오는 쿼리 (랭킹 스냅샷용)
+# rank는 overall_ranking_query와 같은 기준(전체 사용자 중 나보다 점수가 높은 사용자 수 + 1)입니다.
+def group_top_rankings_query(limit):
+    query = """
+    SELECT rank, school_row, team_row, id, name, school, team, points, correct, incorrect
+    FROM (
+        SELECT
+            RANK() OVER (ORDER BY points DESC) AS rank,
+            ROW_NUMBER() OVER (PARTITION BY school ORDER BY points DESC, id)
+                AS school_row,
+            ROW_NUMBER() OVER (PARTITION BY team ORDER BY points DESC, id) AS team_row,
+            id, name, school, team, points, correct, incorrect
+        FROM users
+    )
+    WHERE school_row <= ? OR team_row <= ?
+    ORDER BY points DESC, id
+    """
+    return query, (limit, limit)
+
+
+# 전체 랭킹 데이터를 가져오는 함수
+@traced
+def get_overall_ranking(school=None, team=None, limit=50, offset=0):
+    query, params = overall_ranking_query(school, team, limit, offset)
+    with connection() as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    return df
+
+
+# 소속별/팀별 상위 limit명 (school_row, team_row: 소속/팀 안에서의 순서)
+@traced
+def get_group_top_rankings(limit):
+    query, params = group_top_rankings_query(limit)
+    with connection() as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    return df
+
+
+# 필터 조건에 맞는 사용자 수 (페이지 수 계산용)
+@traced
+def count_ranked_users(school=None, team=None):
+    where, params = _filter_clause(school, team)
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM users {where}", params).fetchone()[0]
+
+
+# 랭킹 필터에 사용할 소속/팀 목록
+@traced
+def get_ranking_filters():
+    with connection() as conn:
+        schools = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT school FROM users WHERE school IS NOT NULL ORDER BY school"
+            )
+        ]
+        teams = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT team FROM users WHERE team IS NOT NULL ORDER BY team"
+            )
+        ]
+    return schools, teams
+
+
+# 로그인한 사용자의 순위 (rank, points) - 사용자가 없으면 None
+# 전체 사용자 수는 매번 세지 않고 랭킹 스냅샷의 total_users를 씁니다. (sidebar.py)
+@traced
+def get_user_rank(user_id):
+    query, params = user_rank_query(user_id)
+    with connection() as conn:
+        row = conn.execute(query, params).fetchone()
+    if row is None:
+        return None
+    return row["rank"], row["points"]
+
+
+# 소속별 랭킹 데이터를 가져오는 함수 (school_stats 사용)
+@traced
+def get_school_ranking():
+    query = """
+    SELECT
+        RANK() OVER (ORDER BY total_points DESC) as rank,
+        NULLIF(school, '') as school,
+        total_points,
+        member_count,
+        correct,
+        incorrect
+    FROM school_stats
+    WHERE member_count > 0
+    ORDER BY total_points DESC
+    """
+    with connection() as conn:
+        df = pd.read_sql_query(query, conn)
+    return df
+
+
+# 팀별 랭킹 데이터를 가져오는 함수 (team_stats 사용)
+@traced
+def get_team_ranking():
+    query = """
+    SELECT
+        RANK() OVER (ORDER BY total_points DESC) as rank,
+        RANK() OVER (ORDER BY total_points * 1.0 / member_count DESC) as average_rank,
+        NULLIF(team, '') as team,
+        total_points,
+        member_count,
+        total_points * 1.0 / member_count as average_points,
+        correct,
+        incorrect
+    FROM team_stats
+    WHERE member_count > 0
+    ORDER BY total_points DESC
+    """
+    with connection() as conn:
+        df = pd.read_sql_query(query, conn)
+    return df
@@ -0,0 +1,127 @@
+import functools
+import inspect
+import sys
+import threading
+from collections import Counter, OrderedDict
+from datetime import date
+
+import config
+from utils.helpers import now_local
+
+# 주제별 데이터 버전: 해당 주제의 답안이 기록될 때마다 올라갑니다.
+# 캐시 키에 버전이 들어가므로, 새 답안이 들어오기 전까지는 같은 결과를 재사용합니다.
+_versions_lock = threading.Lock()
+_topic_versions = Counter()
+_global_version = 0
+
+
+def topic_version(topic):
+    return _global_version, _topic_versions[topic]
+
+
+def bump_topic_versions(topics):
+    with _versions_lock:
+        for topic in set(topics):
+            _topic_versions[topic] += 1
+
+
+def bump_all_versions():
+    """관리자 수정처럼 어느 주제가 바뀌었는지 모를 때, 과거 기간을 포함한 모든 캐시를 무효화합니다."""
+    global _global_version
+    with _versions_lock:
+        _global_version += 1
+
+
+def _estimate_size(value):
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:
+        return int(memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """전체 크기 상한이 있는 LRU 캐시"""
+
+    def __init__(self, max_bytes, max_entries):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while self._entries and (
+                self.total_bytes > self.max_bytes
+                or len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+dashboard_cache = ResultCache(
+    max_bytes=config.DASHBOARD_CACHE_MAX_BYTES,
+    max_entries=config.DASHBOARD_CACHE_MAX_ENTRIES,
+)
+
+
+def _is_past(day):
+    return isinstance(day, date) and day < now_local().date()
+
+
+def versioned_cache(func):
+    """topic 인자를 받는 조회 함수의 결과를 캐시합니다.
+
+    - 기간이 오늘 이전에 끝나면 과거 데이터이므로 주제 버전과 관계없이 계속 재사용합니다.
+    - 그 외(오늘 포함, 전체 기간)는 주제 버전이 바뀌면 다시 조회합니다.
+    - 결과 DataFrame은 호출자가 수정할 수 있으므로 복사본을 돌려줍니다.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        end = arguments.get("end_date") or arguments.get("date")
+        if _is_past(end):
+            version = (_global_version, "past")
+        else:
+            version = topic_version(arguments["topic"])
+
+        key = (func.__qualname__, tuple(arguments.items()), version)
+        result = dashboard_cache.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            dashboard_cache.put(key, result)
+        return result.copy()
+
+    return wrapper
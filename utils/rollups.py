@@ -0,0 +1,474 @@
+"""question_results에서 파생되는 집계 테이블을 관리합니다.
+
+- activity_rollup: (topic, day, user_id, hour)별 시도/정답 수 (Homework Dashboard)
+- question_attempts: (topic, question_idx, user_id)별 시도/정답 수와 첫/마지막 시도 시각
+  (Problem-Centric Dashboard)
+- school_stats / team_stats: 소속/팀별 총점, 인원, 정답/오답 수 (Ranking, users 트리거로 갱신)
+
+답안 기록과 같은 트랜잭션에서 증분 갱신하며, 원본에서 다시 계산하거나
+원본과 일치하는지 확인할 수 있습니다.
+서비스 중에는 rebuild_in_chunks()로 (주제, 날짜)/(주제, 문제 범위) 단위의 짧은
+트랜잭션으로 나누어 다시 계산하므로, 그동안에도 답안 기록이 오래 막히지 않습니다.
+
+실행: python -m utils.rollups [--check | --rebuild] [--db db/db.sqlite]
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import config
+from utils.helpers import day_range, local_timezone, utc_offset_seconds
+
+
+def local_day_hour(timestamp):
+    local = datetime.fromtimestamp(timestamp, local_timezone())
+    return local.strftime("%Y-%m-%d"), local.hour
+
+
+def update_activity_rollup(conn, submissions):
+    """제출 목록을 activity_rollup에 더합니다. (커밋은 호출자가 합니다)"""
+    attempts = Counter()
+    correct = Counter()
+    for submission in submissions:
+        day, hour = local_day_hour(submission.created_ts)
+        key = (submission.topic, day, submission.user_id, hour)
+        attempts[key] += 1
+        correct[key] += 1 if submission.correct else 0
+
+    conn.executemany(
+        """
+        INSERT INTO activity_rollup (topic, day, user_id, hour, attempts, correct)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (topic, day, user_id, hour) DO UPDATE SET
+            attempts = attempts + excluded.attempts,
+            correct = correct + excluded.correct
+        """,
+        [(*key, attempts[key], correct[key]) for key in attempts],
+    )
+
+
+# 원본 기록에서 계산한 activity_rollup (기준 시간대는 일광 절약 시간이 없다고 가정)
+# 날짜와 시각은 정수로 묶고, 날짜 문자열은 묶음마다 한 번만 만듭니다.
+def _activity_from_raw(where=""):
+    return f"""
+    SELECT
+        topic,
+        date(local_day * 86400, 'unixepoch') AS day,
+        user_id,
+        hour,
+        COUNT(*) AS attempts,
+        SUM(CASE WHEN correct = 1 THEN 1 ELSE 0 END) AS correct
+    FROM (
+        SELECT
+            topic,
+            (created_ts + :offset) / 86400 AS local_day,
+            user_id,
+            (created_ts + :offset) % 86400 / 3600 AS hour,
+            correct
+        FROM question_results
+        {where}
+    )
+    GROUP BY topic, local_day, user_id, hour
+    """
+
+
+_ACTIVITY_FROM_RAW = _activity_from_raw()
+
+
+def rebuild_activity_rollup(conn):
+    """activity_rollup을 원본 기록에서 다시 계산합니다. (커밋은 호출자가 합니다)"""
+    conn.execute("DELETE FROM activity_rollup")
+    conn.execute(
+        f"""
+        INSERT INTO activity_rollup (topic, day, user_id, hour, attempts, correct)
+        {_ACTIVITY_FROM_RAW}
+        """,
+        {"offset": utc_offset_seconds(date.today())},
+    )
+
+
+def _count_mismatches(conn, from_raw, table, columns, params=()):
+    missing = conn.execute(
+        f"SELECT COUNT(*) FROM ({from_raw} EXCEPT SELECT {columns} FROM {table})",
+        params,
+    ).fetchone()[0]
+    extra = conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT {columns} FROM {table} EXCEPT {from_raw})",
+        params,
+    ).fetchone()[0]
+    return missing + extra
+
+
+def check_activity_rollup(conn):
+    """원본과 다른 activity_rollup 행 수를 반환합니다. 0이면 일치합니다."""
+    return _count_mismatches(
+        conn,
+        _ACTIVITY_FROM_RAW,
+        "activity_rollup",
+        "topic, day, user_id, hour, attempts, correct",
+        {"offset": utc_offset_seconds(date.today())},
+    )
+
+
+def update_question_attempts(conn, submissions):
+    """제출 목록을 question_attempts에 더합니다. (커밋은 호출자가 합니다)"""
+    summary = {}
+    for submission in submissions:
+        key = (submission.topic, submission.question_idx, submission.user_id)
+        attempts, correct, first, last = summary.get(
+            key, (0, 0, submission.created_ts, submission.created_ts)
+        )
+        summary[key] = (
+            attempts + 1,
+            correct + (1 if submission.correct else 0),
+            min(first, submission.created_ts),
+            max(last, submission.created_ts),
+        )
+
+    conn.executemany(
+        """
+        INSERT INTO question_attempts (
+            topic, question_idx, user_id,
+            attempt_count, correct_count, first_attempt, last_attempt
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (topic, question_idx, user_id) DO UPDATE SET
+            attempt_count = attempt_count + excluded.attempt_count,
+            correct_count = correct_count + excluded.correct_count,
+            first_attempt = MIN(first_attempt, excluded.first_attempt),
+            last_attempt = MAX(last_attempt, excluded.last_attempt)
+        """,
+        [(*key, *values) for key, values in summary.items()],
+    )
+
+
+def _question_attempts_from_raw(where=""):
+    return f"""
+    SELECT
+        topic,
+        question_idx,
+        user_id,
+        COUNT(*) AS attempt_count,
+        SUM(CASE WHEN correct = 1 THEN 1 ELSE 0 END) AS correct_count,
+        MIN(created_ts) AS first_attempt,
+        MAX(created_ts) AS last_attempt
+    FROM question_results
+    {where}
+    GROUP BY 1, 2, 3
+    """
+
+
+_QUESTION_ATTEMPTS_FROM_RAW = _question_attempts_from_raw()
+
+
+def rebuild_question_attempts(conn):
+    """question_attempts를 원본 기록에서 다시 계산합니다. (커밋은 호출자가 합니다)"""
+    conn.execute("DELETE FROM question_attempts")
+    conn.execute(
+        f"""
+        INSERT INTO question_attempts (
+            topic, question_idx, user_id,
+            attempt_count, correct_count, first_attempt, last_attempt
+        )
+        {_QUESTION_ATTEMPTS_FROM_RAW}
+        """
+    )
+
+
+def check_question_attempts(conn):
+    """원본과 다른 question_attempts 행 수를 반환합니다. 0이면 일치합니다."""
+    return _count_mismatches(
+        conn,
+        _QUESTION_ATTEMPTS_FROM_RAW,
+        "question_attempts",
+        "topic, question_idx, user_id, attempt_count, correct_count, "
+        "first_attempt, last_attempt",
+    )
+
+
+def _group_stats_from_users(column):
+    return f"""
+    SELECT
+        IFNULL({column}, '') AS {column},
+        SUM(IFNULL(points, 0)) AS total_points,
+        COUNT(*) AS member_count,
+        SUM(IFNULL(correct, 0)) AS correct,
+        SUM(IFNULL(incorrect, 0)) AS incorrect
+    FROM users
+    GROUP BY 1
+    """
+
+
+_GROUP_STATS = (("school_stats", "school"), ("team_stats", "team"))
+
+
+def rebuild_group_stats(conn):
+    """school_stats, team_stats를 users에서 다시 계산합니다. (커밋은 호출자가 합니다)"""
+    for table, column in _GROUP_STATS:
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            f"""
+            INSERT INTO {table} ({column}, total_points, member_count, correct, incorrect)
+            {_group_stats_from_users(column)}
+            """
+        )
+
+
+def check_group_stats(conn):
+    """users와 다른 school_stats, team_stats 행 수를 반환합니다. 0이면 일치합니다."""
+    return sum(
+        _count_mismatches(
+            conn,
+            _group_stats_from_users(column),
+            table,
+            f"{column}, total_points, member_count, correct, incorrect",
+        )
+        for table, column in _GROUP_STATS
+    )
+
+
+ROLLUPS = {
+    "activity_rollup": (rebuild_activity_rollup, check_activity_rollup),
+    "question_attempts": (rebuild_question_attempts, check_question_attempts),
+    "school_stats/team_stats": (rebuild_group_stats, check_group_stats),
+}
+
+
+def _rebuild_everything(conn):
+    for rebuild, _ in ROLLUPS.values():
+        rebuild(conn)
+
+
+def rebuild_all(conn):
+    """모든 집계 테이블을 한 트랜잭션에서 다시 계산합니다.
+
+    그동안 쓰기 잠금을 계속 잡으므로 서비스 중이 아닐 때만 사용하고,
+    서비스 중에는 rebuild_in_chunks()를 사용합니다.
+    """
+    _in_transaction(conn, _rebuild_everything)
+
+
+def refresh_rollup_rows(conn, results):
+    """question_results 행 [(user_id, question_idx, topic, created_ts)]이 속한 집계 행만
+    원본에서 다시 계산합니다. (커밋은 호출자가 합니다)
+
+    관리자가 기록을 고치거나 지울 때, 바뀌기 전과 후의 행을 넘겨 같은 트랜잭션에서 호출합니다.
+    """
+    offset = utc_offset_seconds(date.today())
+    hours = set()
+    questions = set()
+    for user_id, question_idx, topic, created_ts in results:
+        hours.add((topic, user_id, created_ts - (created_ts + offset) % 3600))
+        questions.add((topic, question_idx, user_id))
+
+    for topic, user_id, start in hours:
+        day, hour = local_day_hour(start)
+        conn.execute(
+            """
+            DELETE FROM activity_rollup
+            WHERE topic = ? AND day = ? AND user_id = ? AND hour = ?
+            """,
+            (topic, day, user_id, hour),
+        )
+        conn.execute(
+            f"""
+            INSERT INTO activity_rollup (topic, day, user_id, hour, attempts, correct)
+            {_activity_from_raw(
+                "WHERE topic = :topic AND user_id = :user_id "
+                "AND created_ts >= :start AND created_ts < :start + 3600"
+            )}
+            """,
+            {"offset": offset, "topic": topic, "user_id": user_id, "start": start},
+        )
+
+    where = "WHERE topic = :topic AND question_idx = :question_idx AND user_id = :user_id"
+    for topic, question_idx, user_id in questions:
+        params = {"topic": topic, "question_idx": question_idx, "user_id": user_id}
+        conn.execute(f"DELETE FROM question_attempts {where}", params)
+        conn.execute(
+            f"""
+            INSERT INTO question_attempts (
+                topic, question_idx, user_id,
+                attempt_count, correct_count, first_attempt, last_attempt
+            )
+            {_question_attempts_from_raw(where)}
+            """,
+            params,
+        )
+
+
+def _distinct(conn, table, column, where="", params=()):
+    # 인덱스 앞쪽 열의 서로 다른 값을 전체를 읽지 않고 하나씩 건너뛰며 찾습니다.
+    values = []
+    condition = f"{where} AND" if where else ""
+    row = conn.execute(
+        f"SELECT MIN({column}) FROM {table} {'WHERE ' + where if where else ''}",
+        params,
+    ).fetchone()
+    while row[0] is not None:
+        values.append(row[0])
+        row = conn.execute(
+            f"SELECT MIN({column}) FROM {table} WHERE {condition} {column} > ?",
+            (*params, row[0]),
+        ).fetchone()
+    return values
+
+
+def _activity_chunks(conn):
+    # (topic, day)마다 하나. 원본의 첫날~마지막 날과 집계 테이블에 남아 있는 날을 모두 포함합니다.
+    chunks = set()
+    for topic in _distinct(conn, "question_results", "topic"):
+        first, last = (
+            conn.execute(
+                f"SELECT {func}(created_ts) FROM question_results WHERE topic = ?",
+                (topic,),
+            ).fetchone()[0]
+            for func in ("MIN", "MAX")
+        )
+        day = datetime.fromtimestamp(first, local_timezone()).date()
+        last_day = datetime.fromtimestamp(last, local_timezone()).date()
+        while day <= last_day:
+            chunks.add((topic, day.isoformat()))
+            day += timedelta(days=1)
+    for topic in _distinct(conn, "activity_rollup", "topic"):
+        for day in _distinct(conn, "activity_rollup", "day", "topic = ?", (topic,)):
+            chunks.add((topic, day))
+    return sorted(chunks)
+
+
+def _rebuild_activity_chunk(conn, topic, day):
+    start_ts, end_ts = day_range(date.fromisoformat(day))
+    conn.execute(
+        "DELETE FROM activity_rollup WHERE topic = ? AND day = ?", (topic, day)
+    )
+    conn.execute(
+        f"""
+        INSERT INTO activity_rollup (topic, day, user_id, hour, attempts, correct)
+        {_activity_from_raw(
+            "WHERE topic = :topic AND created_ts >= :start AND created_ts < :end"
+        )}
+        """,
+        {
+            "offset": utc_offset_seconds(date.today()),
+            "topic": topic,
+            "start": start_ts,
+            "end": end_ts,
+        },
+    )
+
+
+def _question_attempts_chunks(conn, questions_per_chunk):
+    # (topic, 첫 문제, 마지막 문제)마다 하나. 집계 테이블에만 남은 문제도 포함합니다.
+    chunks = []
+    topics = set(_distinct(conn, "question_results", "topic"))
+    topics.update(_distinct(conn, "question_attempts", "topic"))
+    for topic in sorted(topics):
+        questions = set()
+        for table in ("question_results", "question_attempts"):
+            questions.update(
+                _distinct(conn, table, "question_idx", "topic = ?", (topic,))
+            )
+        questions = sorted(questions)
+        for start in range(0, len(questions), questions_per_chunk):
+            group = questions[start : start + questions_per_chunk]
+            chunks.append((topic, group[0], group[-1]))
+    return chunks
+
+
+def _rebuild_question_attempts_chunk(conn, topic, first_question, last_question):
+    params = {"topic": topic, "first": first_question, "last": last_question}
+    where = "WHERE topic = :topic AND question_idx BETWEEN :first AND :last"
+    conn.execute(f"DELETE FROM question_attempts {where}", params)
+    conn.execute(
+        f"""
+        INSERT INTO question_attempts (
+            topic, question_idx, user_id,
+            attempt_count, correct_count, first_attempt, last_attempt
+        )
+        {_question_attempts_from_raw(where)}
+        """,
+        params,
+    )
+
+
+def _in_transaction(conn, rebuild, *args):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rebuild(conn, *args)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def rebuild_in_chunks(conn, progress=None):
+    """서비스 중에 모든 집계 테이블을 짧은 트랜잭션 여러 개로 나누어 다시 계산합니다.
+
+    각 단위는 같은 트랜잭션 안에서 원본을 읽어 바꾸므로, 그 사이에 기록된 답안도
+    빠지거나 두 번 더해지지 않습니다. 단위마다 걸린 시간만큼 쉬어(최소
+    config.ROLLUP_REBUILD_PAUSE초) 답안 기록이 쓰기 잠금을 얻을 수 있게 합니다.
+    progress(끝난 수, 전체 수)가 있으면 단위마다 호출합니다.
+    """
+    chunks = [
+        (_rebuild_activity_chunk, chunk) for chunk in _activity_chunks(conn)
+    ] + [
+        (_rebuild_question_attempts_chunk, chunk)
+        for chunk in _question_attempts_chunks(
+            conn, config.ROLLUP_REBUILD_CHUNK_QUESTIONS
+        )
+    ]
+    # 소속/팀 통계는 users에서 계산하므로 한 번에 처리해도 짧습니다.
+    chunks.append((rebuild_group_stats, ()))
+
+    for done, (rebuild, args) in enumerate(chunks, 1):
+        started = time.perf_counter()
+        _in_transaction(conn, rebuild, *args)
+        if progress is not None:
+            progress(done, len(chunks))
+        time.sleep(max(time.perf_counter() - started, config.ROLLUP_REBUILD_PAUSE))
+
+
+def check_all(conn):
+    """집계 테이블별로 원본과 다른 행 수를 반환합니다."""
+    return {name: check(conn) for name, (_, check) in ROLLUPS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="집계 테이블 확인 및 재계산")
+    parser.add_argument("--db", default=config.DB_PATH)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--check", action="store_true", help="원본과 비교만 합니다")
+    group.add_argument("--rebuild", action="store_true", help="원본에서 다시 계산합니다")
+    parser.add_argument(
+        "--online",
+        action="store_true",
+        help="서비스 중인 DB를 짧은 트랜잭션으로 나누어 다시 계산합니다 (--rebuild와 함께)",
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.rebuild:
+            if args.online:
+                rebuild_in_chunks(conn)
+            else:
+                rebuild_all(conn)
+            print("집계 테이블 재계산 완료")
+
+        mismatched = 0
+        for name, count in check_all(conn).items():
+            mismatched += count
+            print(f"{name}: {'일치' if count == 0 else f'불일치 {count}행'}")
+    finally:
+        conn.close()
+
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""느린 SQL 기록.
+
+utils.db의 연결은 SlowQueryConnection을 사용합니다. 실행부터 결과를 모두 읽을 때까지
+config.SLOW_QUERY_THRESHOLD_MS보다 오래 걸린 SQL 문을 파라미터, 실행 시간, 행 수,
+EXPLAIN QUERY PLAN 결과와 함께 config.SLOW_QUERY_LOG_FILE에 한 줄짜리 JSON으로 남깁니다.
+파라미터 값은 config.SLOW_QUERY_LOG_PARAMS가 켜져 있을 때만 남기고, 기본은 "***"로 가립니다.
+결과를 끝까지 읽지 않고 버린 커서는 GC 종료자에서 기록하므로, 다른 스레드가 쓰고 있을 수 있는
+연결에 SQL을 실행하지 않도록 실행 계획 없이 시간만 남깁니다.
+로그 파일은 config.SLOW_QUERY_LOG_MAX_BYTES마다 교체되고 이전 파일은
+config.SLOW_QUERY_LOG_BACKUPS개까지 보관합니다.
+
+관리자 페이지의 "느린 쿼리" 탭이나 다음 명령으로 확인합니다.
+
+실행: python -m utils.slow_queries [--limit 20]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+import config
+
+SlowQuery = namedtuple(
+    "SlowQuery",
+    ["logged_at", "duration_ms", "rows", "sql", "params", "plan", "thread"],
+)
+
+_threshold_ms = config.SLOW_QUERY_THRESHOLD_MS
+_logger = logging.getLogger(__name__)
+_logger.propagate = False
+_handler_lock = threading.Lock()
+
+# 실행 계획을 확인할 SQL 문 (BEGIN, COMMIT, PRAGMA 등은 제외)
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_NO_PLAN = "(결과를 끝까지 읽지 않은 커서라 실행 계획을 확인하지 않았습니다)"
+
+
+def threshold_ms():
+    return _threshold_ms
+
+
+def set_threshold_ms(value):
+    """기준 시간(ms)을 바꿉니다. None이면 기록하지 않습니다."""
+    global _threshold_ms
+    _threshold_ms = value
+
+
+def _ensure_handler():
+    if _logger.handlers:
+        return
+    with _handler_lock:
+        if _logger.handlers:
+            return
+        directory = os.path.dirname(config.SLOW_QUERY_LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(
+            config.SLOW_QUERY_LOG_FILE,
+            maxBytes=config.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=config.SLOW_QUERY_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+
+
+def _plain(value):
+    # JSON으로 남길 수 없는 파라미터(bytes 등)는 repr로 남깁니다.
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return repr(value)
+
+
+def _explain(conn, sql, params):
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    try:
+        # 기록용 커서가 다시 기록되지 않도록 기본 커서로 실행합니다.
+        cursor = sqlite3.Cursor(conn)
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[3] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except sqlite3.Error as e:
+        return [f"(실행 계획을 확인할 수 없습니다: {e})"]
+
+
+def _logged_params(sql, params):
+    # 학생 이름, 비밀번호 해시 등이 로그 파일에 남지 않도록 기본은 값을 가리고 개수만 남깁니다.
+    masked = not config.SLOW_QUERY_LOG_PARAMS or "password" in sql.lower()
+    if isinstance(params, dict):
+        return {
+            key: "***" if masked else _plain(value) for key, value in params.items()
+        }
+    return ["***" if masked else _plain(value) for value in params]
+
+
+def _log(conn, sql, params, duration_ms, rows, explain=True):
+    entry = {
+        "logged_at": datetime.now().isoformat(timespec="seconds"),
+        "duration_ms": round(duration_ms, 2),
+        "rows": rows,
+        "sql": " ".join(sql.split()),
+        "params": _logged_params(sql, params),
+        "plan": _explain(conn, sql, params) if explain else [_NO_PLAN],
+        "thread": threading.current_thread().name,
+    }
+    try:
+        _ensure_handler()
+        _logger.info(json.dumps(entry, ensure_ascii=False))
+    except OSError:
+        pass  # 로그를 남기지 못해도 조회는 계속되어야 합니다.
+
+
+class SlowQueryCursor(sqlite3.Cursor):
+    """실행부터 결과를 모두 읽을 때까지의 시간을 재는 커서.
+
+    SQL 문 하나는 결과를 끝까지 읽거나, 커서를 다시 실행하거나, 닫을 때 끝난 것으로 봅니다.
+    """
+
+    _statement = None
+
+    def _start(self, sql, params, started):
+        self._finish()
+        self._statement = [sql, params, time.perf_counter() - started, 0]
+
+    def _add(self, started, rows):
+        if self._statement is not None:
+            self._statement[2] += time.perf_counter() - started
+            self._statement[3] += rows
+
+    def _finish(self, explain=True):
+        statement = self._statement
+        if statement is None:
+            return
+        self._statement = None
+        sql, params, elapsed, rows = statement
+        limit = _threshold_ms
+        if limit is not None and elapsed * 1000 >= limit:
+            _log(self.connection, sql, params, elapsed * 1000, rows, explain)
+
+    def execute(self, sql, params=()):
+        started = time.perf_counter()
+        super().execute(sql, params)
+        self._start(sql, params, started)
+        if self.description is None:
+            # 결과 행이 없는 문장(INSERT/UPDATE 등)은 실행이 끝나면 바로 판단합니다.
+            self._statement[3] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        started = time.perf_counter()
+        seq_of_params = list(seq_of_params)
+        super().executemany(sql, seq_of_params)
+        first = seq_of_params[0] if seq_of_params else ()
+        self._start(sql, first, started)
+        self._statement[3] = max(self.rowcount, 0)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._add(started, row is not None)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        self._add(started, len(rows))
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._add(started, len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._finish()
+            raise
+        self._add(started, 1)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # 결과를 끝까지 읽지 않고 버린 커서 (fetchone 한 번 등)
+        # 종료자는 아무 스레드에서나 실행되므로 연결에 SQL을 실행하지 않습니다.
+        self._finish(explain=False)
+
+
+class SlowQueryConnection(sqlite3.Connection):
+    """cursor(), execute(), executemany()가 SlowQueryCursor를 사용하는 연결"""
+
+    def cursor(self, factory=SlowQueryCursor):
+        return super().cursor(factory)
+
+    # 기본 Connection.execute()는 커서의 execute()를 거치지 않으므로 직접 연결합니다.
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def read_entries(limit=200):
+    """최근 기록을 최신 순으로 limit개까지 SlowQuery 목록으로 반환합니다."""
+    paths = [config.SLOW_QUERY_LOG_FILE] + [
+        f"{config.SLOW_QUERY_LOG_FILE}.{i}"
+        for i in range(1, config.SLOW_QUERY_LOG_BACKUPS + 1)
+    ]
+    entries = []
+    for path in paths:
+        if len(entries) >= limit or not os.path.exists(path):
+            break
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        for line in reversed(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 기록 중인 마지막 줄 등
+            entries.append(
+                SlowQuery(*(entry.get(field) for field in SlowQuery._fields))
+            )
+            if len(entries) >= limit:
+                break
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="느린 SQL 기록 보기")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    entries = read_entries(args.limit)
+    if not entries:
+        print(f"기록이 없습니다. ({config.SLOW_QUERY_LOG_FILE})")
+        return
+    for entry in entries:
+        print(f"[{entry.logged_at}] {entry.duration_ms:.1f}ms, {entry.rows}행")
+        print(f"  {entry.sql}")
+        print(f"  params: {entry.params}")
+        for step in entry.plan:
+            print(f"    {step}")
+
+
+if __name__ == "__main__":
+    main()
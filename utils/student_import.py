@@ -0,0 +1,145 @@
+"""CSV 파일로 학생 계정을 한 번에 만듭니다.
+
+CSV 헤더: name,school,team,pin (또는 이름,학교,팀,PIN)
+school/team은 config.SCHOOLS/config.TEAMS에 있는 값이어야 하고, pin은 4자리 숫자여야 합니다.
+
+실행: python -m utils.student_import students.csv [--db db/db.sqlite]
+"""
+
+import argparse
+import csv
+import io
+import sqlite3
+import sys
+from collections import namedtuple
+
+import config
+from utils.auth import hash_password
+from utils.migrations import migrate
+
+StudentRow = namedtuple("StudentRow", ["line", "name", "school", "team", "pin"])
+# skipped: [(줄 번호, 이름, 학교, 팀, 사유)]
+ImportResult = namedtuple("ImportResult", ["inserted", "skipped"])
+
+HEADER_ALIASES = {
+    "name": "name",
+    "이름": "name",
+    "school": "school",
+    "학교": "school",
+    "team": "team",
+    "팀": "team",
+    "pin": "pin",
+    "password": "pin",
+    "비밀번호": "pin",
+}
+
+
+def read_students(text):
+    """CSV 내용을 읽어 (StudentRow 목록, 건너뛴 행 목록)을 반환합니다."""
+    reader = csv.reader(io.StringIO(text.lstrip("\ufeff")))
+    header = next(reader, None)
+    if header is None:
+        return [], []
+
+    fields = [HEADER_ALIASES.get(column.strip().lower()) for column in header]
+    missing = {"name", "school", "team", "pin"} - set(fields)
+    if missing:
+        raise ValueError(f"CSV 헤더에 {', '.join(sorted(missing))} 열이 없습니다")
+
+    rows = []
+    skipped = []
+    for line, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        record = {
+            field: value.strip()
+            for field, value in zip(fields, values)
+            if field is not None
+        }
+        row = StudentRow(
+            line,
+            record.get("name", ""),
+            record.get("school", ""),
+            record.get("team", ""),
+            record.get("pin", ""),
+        )
+        if not row.name or not row.pin:
+            reason = "이름 또는 PIN이 비어 있습니다"
+        elif len(row.pin) != 4 or not row.pin.isdigit():
+            # 로그인/회원가입과 같은 규칙입니다. 엑셀에서 앞자리 0이 지워진 경우가 많아 안내를 붙입니다.
+            reason = "PIN은 4자리 숫자여야 합니다 (앞자리 0이 지워졌다면 PIN 열을 텍스트로 저장하세요)"
+        elif row.school not in config.SCHOOLS:
+            reason = f"알 수 없는 학교입니다: {row.school}"
+        elif row.team not in config.TEAMS:
+            reason = f"알 수 없는 팀입니다: {row.team}"
+        else:
+            rows.append(row)
+            continue
+        skipped.append((line, row.name, row.school, row.team, reason))
+    return rows, skipped
+
+
+def import_students(conn, rows):
+    """학생 계정을 한 트랜잭션에서 추가합니다.
+
+    이미 있는 계정이나 파일 안에서 중복된 (이름, 학교, 팀)은 건너뛰고 결과에 사유를 남깁니다.
+    """
+    # sha256 해시는 건당 수 마이크로초라 작업자 풀을 쓰면 오히려 느립니다.
+    hashed = [hash_password(row.pin) for row in rows]
+
+    skipped = []
+    seen = set()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        new_users = []
+        for row, password in zip(rows, hashed):
+            key = (row.name, row.school, row.team)
+            if key in seen:
+                skipped.append((row.line, *key, "파일 안에서 중복됩니다"))
+                continue
+            seen.add(key)
+            exists = conn.execute(
+                "SELECT 1 FROM users WHERE name = ? AND school = ? AND team = ?",
+                key,
+            ).fetchone()
+            if exists:
+                skipped.append((row.line, *key, "이미 등록된 사용자입니다"))
+                continue
+            new_users.append((*key, password))
+
+        conn.executemany(
+            "INSERT INTO users (name, school, team, password) VALUES (?, ?, ?, ?)",
+            new_users,
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return ImportResult(len(new_users), skipped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV로 학생 계정 일괄 등록")
+    parser.add_argument("csv_file")
+    parser.add_argument("--db", default=config.DB_PATH)
+    args = parser.parse_args()
+
+    with open(args.csv_file, "r", encoding="utf-8") as f:
+        try:
+            rows, skipped = read_students(f.read())
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    result = import_students(conn, rows)
+    conn.close()
+
+    print(f"등록: {result.inserted}명, 건너뜀: {len(skipped) + len(result.skipped)}건")
+    for line, name, school, team, reason in sorted(skipped + result.skipped):
+        print(f"  {line}행 {name} ({school} / {team}): {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, namedtuple
+
+import config
+from utils.db import connection
+from utils.helpers import now_local
+from utils.result_cache import bump_topic_versions
+from utils.rollups import update_activity_rollup, update_question_attempts
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+Submission = namedtuple(
+    "Submission",
+    ["user_id", "question_idx", "topic", "correct", "created_at", "created_ts"],
+)
+
+
+def record_submissions(conn, submissions):
+    """제출 결과를 기록하고 사용자별 점수와 집계 테이블을 한 번에 갱신합니다. (커밋은 호출자가 합니다)"""
+    conn.executemany(
+        """
+        INSERT INTO question_results
+            (user_id, question_idx, topic, correct, created_at, created_ts)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        submissions,
+    )
+
+    points = Counter()
+    correct = Counter()
+    incorrect = Counter()
+    for submission in submissions:
+        points[submission.user_id] += 3 if submission.correct else 1
+        if submission.correct:
+            correct[submission.user_id] += 1
+        else:
+            incorrect[submission.user_id] += 1
+
+    conn.executemany(
+        """
+        UPDATE users
+        SET points = points + ?,
+            correct = correct + ?,
+            incorrect = incorrect + ?
+        WHERE id = ?
+        """,
+        [
+            (points[user_id], correct[user_id], incorrect[user_id], user_id)
+            for user_id in points
+        ],
+    )
+    update_activity_rollup(conn, submissions)
+    update_question_attempts(conn, submissions)
+
+
+@traced
+def write_submissions(submissions):
+    with connection() as conn:
+        record_submissions(conn, submissions)
+        conn.commit()
+    # 커밋 후 주제별 데이터 버전을 올려 대시보드 캐시를 무효화합니다.
+    bump_topic_versions(submission.topic for submission in submissions)
+
+
+def _is_transient(error):
+    # 다른 연결이 쓰기 잠금을 잡고 있을 때처럼, 기다리면 성공할 수 있는 오류
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and (
+        "locked" in message or "busy" in message
+    )
+
+
+class SubmissionQueue:
+    """답안 제출을 모아 백그라운드 스레드에서 한 트랜잭션으로 기록하는 write-behind 큐.
+
+    - 큐 크기는 제한되며, 가득 차면 호출한 스레드에서 바로 기록합니다. (실패하면 예외)
+    - 쓰기 잠금 대기(database is locked/busy)로 실패한 배치는 버리지 않고 간격을 늘려가며
+      (최대 max_backoff초) 다시 시도합니다. 그동안 해당 사용자의 제출은 대기 중으로 남고,
+      user_status()로 오류를 확인할 수 있습니다.
+    - 제약 조건 위반처럼 다시 해도 실패할 오류는 max_retries회 후 한 건씩 나누어 기록하고,
+      그래도 실패한 제출만 spill_file에 보관해 뒤의 제출이 막히지 않게 합니다.
+    - wait_for_user()/flush()는 제출이 실제로 기록되었을 때만 True를 반환합니다.
+    - 종료할 때까지 기록하지 못한 제출도 spill_file에 남기고, 다음 시작 시 먼저 기록합니다.
+    """
+
+    def __init__(
+        self,
+        maxsize,
+        batch_size,
+        flush_interval,
+        max_retries=3,
+        max_backoff=5.0,
+        spill_file=None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries  # spill_file에 남기기 전 시도 횟수 (잠금 대기는 종료 중일 때만)
+        self.max_backoff = max_backoff
+        self.spill_file = spill_file
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pending = Counter()
+        self._failing = {}  # 기록을 재시도 중인 user_id -> 마지막 오류
+        self._rejected = {}  # 기록하지 못하고 보관한 제출이 있는 user_id -> 오류 (다음 기록 성공 시 해제)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._wakeup = threading.Event()  # 종료 시 재시도 대기를 끝냅니다.
+        self._thread = threading.Thread(
+            target=self._run, name="submission-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, submission, timeout=1.0):
+        with self._cond:
+            if self._stopping:
+                enqueue = False
+            else:
+                self._pending[submission.user_id] += 1
+                enqueue = True
+
+        if enqueue:
+            try:
+                self._queue.put(submission, timeout=timeout)
+                return
+            except queue.Full:
+                self._done([submission])
+                logger.warning("제출 큐가 가득 차서 직접 기록합니다.")
+
+        # 직접 기록이 실패하면 예외가 호출자(save_question_result)까지 전달됩니다.
+        write_submissions([submission])
+
+    def wait_for_user(self, user_id, timeout=5.0):
+        """user_id의 대기 중인 제출이 모두 기록될 때까지 기다립니다.
+
+        모두 기록되었으면 True, 시간이 지나거나 기록이 실패해 재시도 중이거나 보관되었으면
+        False를 반환합니다.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: not self._pending[user_id] or user_id in self._failing,
+                timeout,
+            )
+            return not self._pending[user_id] and user_id not in self._rejected
+
+    def flush(self, timeout=10.0):
+        """현재까지 제출된 내용이 모두 기록될 때까지 기다립니다. 모두 기록되었으면 True"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def user_status(self, user_id):
+        """(기록 대기 중인 제출 수, 재시도 중이거나 보관된 제출이 있으면 오류 메시지 아니면 None)"""
+        with self._cond:
+            error = self._failing.get(user_id) or self._rejected.get(user_id)
+            return self._pending[user_id], error
+
+    def shutdown(self, timeout=10.0):
+        with self._cond:
+            self._stopping = True
+        self._wakeup.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+        # 종료 직전에 들어온 제출이 남아 있으면 직접 기록합니다.
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftover.append(item)
+        if leftover:
+            try:
+                write_submissions(leftover)
+            except Exception:
+                logger.exception("종료 중 제출 %d건을 기록하지 못했습니다.", len(leftover))
+                self._spill(leftover)
+            finally:
+                self._done(leftover)
+
+    def _done(self, submissions):
+        with self._cond:
+            for submission in submissions:
+                self._pending[submission.user_id] -= 1
+                if self._pending[submission.user_id] <= 0:
+                    del self._pending[submission.user_id]
+                    self._failing.pop(submission.user_id, None)
+            self._cond.notify_all()
+
+    def _set_failing(self, submissions, error):
+        with self._cond:
+            if error is None:
+                for submission in submissions:
+                    self._failing.pop(submission.user_id, None)
+                    self._rejected.pop(submission.user_id, None)
+            else:
+                for submission in submissions:
+                    if self._pending[submission.user_id]:
+                        self._failing[submission.user_id] = error
+            self._cond.notify_all()
+
+    def _spill(self, submissions):
+        """기록하지 못한 제출을 spill_file에 한 줄씩 JSON으로 덧붙입니다."""
+        if self.spill_file:
+            try:
+                with open(self.spill_file, "a", encoding="utf-8") as f:
+                    for submission in submissions:
+                        f.write(json.dumps(list(submission), ensure_ascii=False) + "\n")
+                logger.warning(
+                    "제출 %d건을 %s에 보관했습니다.", len(submissions), self.spill_file
+                )
+                return
+            except OSError:
+                logger.exception("제출을 %s에 보관하지 못했습니다.", self.spill_file)
+        # 마지막 수단: 로그에서 복구할 수 있도록 내용을 남깁니다.
+        logger.error("기록하지 못한 제출: %s", [list(s) for s in submissions])
+
+    def _reject(self, submissions, error):
+        with self._cond:
+            for submission in submissions:
+                self._rejected[submission.user_id] = error
+            self._cond.notify_all()
+
+    def _replay_spilled(self):
+        # 이전 실행에서 보관한 제출을 먼저 기록합니다. 기록 중 종료되면 다시 보관됩니다.
+        # 배치를 기록할 때마다 남은 제출만 replay 파일에 다시 써서, 중간에 프로세스가
+        # 죽더라도 다음 시작 때 이미 기록한 배치를 두 번 기록하지 않습니다.
+        if not self.spill_file:
+            return
+        replay_file = self.spill_file + ".replay"
+        if os.path.exists(self.spill_file) and not os.path.exists(replay_file):
+            os.replace(self.spill_file, replay_file)
+        if not os.path.exists(replay_file):
+            return
+        with open(replay_file, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        for start in range(0, len(lines), self.batch_size):
+            batch = lines[start : start + self.batch_size]
+            self._write([Submission(*json.loads(line)) for line in batch])
+            with open(replay_file + ".tmp", "w", encoding="utf-8") as f:
+                f.writelines(lines[start + len(batch) :])
+            os.replace(replay_file + ".tmp", replay_file)
+        os.remove(replay_file)
+        logger.info("보관했던 제출 %d건을 기록했습니다.", len(lines))
+
+    def _next_batch(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                # 종료 신호는 이번 배치를 기록한 뒤 처리합니다.
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _write(self, batch):
+        """batch를 기록합니다.
+
+        잠금 대기는 기록될 때까지 다시 시도하고(종료 중에는 max_retries회까지), 그 밖의 오류는
+        max_retries회 후 한 건씩 나누어 기록해 실패한 제출만 보관합니다.
+        """
+        attempt = 0
+        while True:
+            try:
+                write_submissions(batch)
+            except Exception as e:
+                attempt += 1
+                error = f"{type(e).__name__}: {e}"
+                transient = _is_transient(e)
+                self._set_failing(batch, error)
+                if attempt == 1 or attempt % 10 == 0:
+                    logger.warning(
+                        "제출 %d건 기록 실패 (%d회째), 다시 시도합니다: %s",
+                        len(batch),
+                        attempt,
+                        e,
+                    )
+                if attempt >= self.max_retries and not transient and len(batch) > 1:
+                    # 한 건 때문에 배치 전체가 막히지 않도록 나누어 기록합니다.
+                    for submission in batch:
+                        self._write([submission])
+                    return
+                if attempt >= self.max_retries and (self._stopping or not transient):
+                    self._spill(batch)
+                    self._reject(batch, error)
+                    return
+                self._wakeup.wait(min(self.max_backoff, 0.1 * 2 ** (attempt - 1)))
+                continue
+            self._set_failing(batch, None)
+            return
+
+    def _run(self):
+        try:
+            self._replay_spilled()
+        except Exception:
+            logger.exception("보관했던 제출을 기록하지 못했습니다.")
+
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                self._write(batch)
+            finally:
+                self._done(batch)
+
+        # 종료 신호 이후 남아 있는 제출도 기록합니다.
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            batch = remaining[start : start + self.batch_size]
+            try:
+                self._write(batch)
+            finally:
+                self._done(batch)
+
+
+_queue_lock = threading.Lock()
+_submission_queue = None
+
+
+def get_submission_queue():
+    global _submission_queue
+    if _submission_queue is None:
+        with _queue_lock:
+            if _submission_queue is None:
+                _submission_queue = SubmissionQueue(
+                    maxsize=config.WRITE_QUEUE_MAXSIZE,
+                    batch_size=config.WRITE_QUEUE_BATCH_SIZE,
+                    flush_interval=config.WRITE_QUEUE_FLUSH_INTERVAL,
+                    max_backoff=config.WRITE_QUEUE_MAX_BACKOFF,
+                    spill_file=config.WRITE_QUEUE_SPILL_FILE,
+                )
+                atexit.register(_submission_queue.shutdown)
+    return _submission_queue
+
+
+@traced
+def save_submission(user_id, question_idx, topic, is_correct):
+    # created_ts(epoch 초)가 기준이고, created_at은 config.TIMEZONE 기준 표시용 문자열입니다.
+    now = now_local()
+    submission = Submission(
+        user_id,
+        question_idx,
+        topic,
+        is_correct,
+        now.strftime("%Y-%m-%d %H:%M:%S"),
+        int(now.timestamp()),
+    )
+    if config.WRITE_QUEUE_ENABLED:
+        get_submission_queue().submit(submission)
+    else:
+        write_submissions([submission])
+
+
+def wait_for_user_writes(user_id):
+    """학생 본인의 제출이 반영된 뒤 조회하도록, 대기 중인 제출이 기록될 때까지 기다립니다.
+
+    모두 기록되었으면 True, 아직 기록되지 않은 제출이 있으면 False를 반환합니다.
+    """
+    if config.WRITE_QUEUE_ENABLED and _submission_queue is not None:
+        return _submission_queue.wait_for_user(user_id)
+    return True
+
+
+def pending_write_status(user_id):
+    """(기록 대기 중인 제출 수, 기록이 실패해 재시도 중이면 마지막 오류 아니면 None)"""
+    if config.WRITE_QUEUE_ENABLED and _submission_queue is not None:
+        return _submission_queue.user_status(user_id)
+    return 0, None
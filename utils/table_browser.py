@@ -0,0 +1,245 @@
+import sqlite3
+from collections import namedtuple
+
+from utils.tracing import traced
+
+# 관리자 페이지용 테이블 탐색기
+# 테이블 전체를 읽지 않고, 정렬 키 기준 keyset 방식으로 한 페이지씩만 조회합니다.
+# 정렬은 기본 키나 인덱스의 열 순서를 그대로 따르므로,
+# 행이 수백만 개여도 별도 정렬 없이 인덱스를 따라 읽습니다.
+
+TableInfo = namedtuple(
+    "TableInfo", ["name", "columns", "not_null", "key_columns", "orderings"]
+)
+
+# 필터 연산자 -> SQL 조건 형식
+FILTER_OPERATORS = {
+    "=": "{} = ?",
+    "≠": "{} != ?",
+    "≥": "{} >= ?",
+    "≤": "{} <= ?",
+    "포함": "{} LIKE ? ESCAPE '\\'",
+    "비어 있음": "{} IS NULL",
+}
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def list_tables(conn):
+    rows = conn.execute(
+        """
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+        ORDER BY name
+        """
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def table_info(conn, table):
+    """테이블의 열, 키 열, 정렬 방법 정보를 반환합니다. 없는 테이블이면 ValueError."""
+    if table not in list_tables(conn):
+        raise ValueError(f"알 수 없는 테이블입니다: {table}")
+
+    info = conn.execute(f"PRAGMA table_info({quote(table)})").fetchall()
+    columns = [row[1] for row in info]
+    key_columns = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]]
+    not_null = {row[1] for row in info if row[3]}
+    if not key_columns:
+        # 기본 키가 없는 테이블은 rowid로 행을 구분합니다.
+        key_columns = ["rowid"]
+    not_null.update(key_columns)
+
+    # 정렬 방법: 기본 키, 그리고 각 인덱스의 열 순서 (+ 행을 구분하는 키 열)
+    orderings = {", ".join(key_columns): tuple(key_columns)}
+    for index in conn.execute(f"PRAGMA index_list({quote(table)})").fetchall():
+        index_columns = [
+            row[2]
+            for row in conn.execute(f"PRAGMA index_info({quote(index[1])})")
+            if row[2] is not None
+        ]
+        if not index_columns:
+            continue
+        label = ", ".join(index_columns)
+        order = index_columns + [c for c in key_columns if c not in index_columns]
+        orderings.setdefault(label, tuple(order))
+
+    return TableInfo(table, columns, not_null, key_columns, orderings)
+
+
+@traced
+def approximate_count(conn, info, exact_limit=100_000):
+    """(행 수, 정확한 값인지 여부)를 반환합니다.
+
+    exact_limit행까지는 직접 세고, 그보다 많으면 sqlite_stat1 통계나 최대 rowid로 추정합니다.
+    """
+    table = quote(info.name)
+    count = conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} LIMIT ?)", (exact_limit + 1,)
+    ).fetchone()[0]
+    if count <= exact_limit:
+        return count, True
+
+    try:
+        row = conn.execute(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (info.name,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        row = None  # ANALYZE를 실행한 적이 없으면 sqlite_stat1 테이블이 없습니다.
+    if row is not None:
+        return int(row[0].split()[0]), False
+
+    try:
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0]
+    except sqlite3.OperationalError:
+        max_rowid = None  # WITHOUT ROWID 테이블
+    return max(max_rowid or 0, exact_limit), False
+
+
+def _filter_clause(info, filters):
+    conditions = []
+    params = []
+    for column, operator, value in filters:
+        if column not in info.columns or operator not in FILTER_OPERATORS:
+            raise ValueError(f"잘못된 필터입니다: {column} {operator}")
+        conditions.append(FILTER_OPERATORS[operator].format(quote(column)))
+        if operator == "포함":
+            escaped = (
+                value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            params.append(f"%{escaped}%")
+        elif operator != "비어 있음":
+            params.append(value)
+    return conditions, params
+
+
+def _after(columns, values, descending, not_null):
+    """columns 정렬 순서에서 values 다음에 오는 행의 조건을 만듭니다.
+
+    NULL은 오름차순에서는 가장 앞, 내림차순에서는 가장 뒤에 옵니다.
+    """
+    operator = "<" if descending else ">"
+    # NULL이 끼지 않으면 행 값 비교 하나로 인덱스 범위 탐색이 가능합니다.
+    if None not in values and (
+        not descending or all(column in not_null for column in columns[1:])
+    ):
+        row = ", ".join(quote(column) for column in columns)
+        marks = ", ".join("?" for _ in columns)
+        return f"({row}) {operator} ({marks})", list(values)
+
+    terms = []
+    params = []
+    for position, (column, value) in enumerate(zip(columns, values)):
+        if value is None and descending:
+            continue  # 내림차순에서 NULL 뒤에는 같은 열 값이 더 없습니다.
+        conditions = [f"{quote(prefix)} IS ?" for prefix in columns[:position]]
+        term_params = list(values[:position])
+        if value is None:
+            conditions.append(f"{quote(column)} IS NOT NULL")
+        elif descending:
+            conditions.append(f"({quote(column)} < ? OR {quote(column)} IS NULL)")
+            term_params.append(value)
+        else:
+            conditions.append(f"{quote(column)} > ?")
+            term_params.append(value)
+        terms.append("(" + " AND ".join(conditions) + ")")
+        params.extend(term_params)
+    if not terms:
+        return "0", []
+    return "(" + " OR ".join(terms) + ")", params
+
+
+@traced
+def fetch_page(
+    conn, info, ordering, descending=False, filters=(), cursor=None, limit=100
+):
+    """ordering(info.orderings의 이름) 순서로 cursor 다음 limit행을 가져옵니다.
+
+    (열 이름 목록, 행 목록, 다음 페이지 cursor)를 반환하며, 마지막 페이지이면 cursor는 None입니다.
+    """
+    order_columns = list(info.orderings[ordering])
+    select_columns = list(info.columns)
+    if info.key_columns == ["rowid"]:
+        select_columns.insert(0, "rowid")
+    positions = [select_columns.index(column) for column in order_columns]
+
+    first = quote(order_columns[0])
+    direction = "DESC" if descending else "ASC"
+    base_conditions, base_params = _filter_clause(info, filters)
+
+    # 첫 정렬 열의 NULL 행은 따로 조회합니다. (오름차순이면 앞, 내림차순이면 뒤)
+    # 그래야 NULL이 아닌 영역에서 첫 열 범위 조건으로 인덱스를 탐색할 수 있습니다.
+    if order_columns[0] in info.not_null:
+        regions = [False]
+    else:
+        regions = [False, True] if descending else [True, False]
+    if cursor is not None:
+        # cursor가 속한 영역 이전의 영역은 이미 모두 보여줬습니다.
+        regions = regions[regions.index(cursor[0] is None) :]
+
+    rows = []
+    for is_null in regions:
+        conditions = list(base_conditions)
+        params = list(base_params)
+        conditions.append(f"{first} IS NULL" if is_null else f"{first} IS NOT NULL")
+        if cursor is not None and (cursor[0] is None) == is_null:
+            if not is_null:
+                conditions.append(f"{first} {'<=' if descending else '>='} ?")
+                params.append(cursor[0])
+            condition, after_params = _after(
+                order_columns, cursor, descending, info.not_null
+            )
+            conditions.append(condition)
+            params.extend(after_params)
+
+        query = f"""
+        SELECT {", ".join(quote(column) for column in select_columns)}
+        FROM {quote(info.name)}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {", ".join(f"{quote(column)} {direction}" for column in order_columns)}
+        LIMIT ?
+        """
+        params.append(limit + 1 - len(rows))
+        rows.extend(tuple(row) for row in conn.execute(query, params).fetchall())
+        if len(rows) > limit:
+            break
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = tuple(rows[-1][position] for position in positions)
+    return select_columns, rows, next_cursor
+
+
+def searchable_columns(info):
+    """ID 검색에 쓸 수 있는 열 (기본 키나 인덱스의 첫 열)"""
+    return list(dict.fromkeys(order[0] for order in info.orderings.values()))
+
+
+@traced
+def search_values(conn, info, column, text, limit=20):
+    """인덱스의 첫 열에서 text로 시작하는(숫자면 text 이상인) 값을 limit개까지 찾습니다."""
+    if column not in searchable_columns(info):
+        raise ValueError(f"인덱스가 없는 열은 검색할 수 없습니다: {column}")
+    text = text.strip()
+    if not text:
+        return []
+
+    try:
+        condition, params = "{0} >= ?", [int(text)]
+    except ValueError:
+        condition, params = "{0} >= ? AND {0} < ?", [text, text + "\U0010ffff"]
+
+    column = quote(column)
+    rows = conn.execute(
+        f"""
+        SELECT DISTINCT {column} FROM {quote(info.name)}
+        WHERE {condition.format(column)}
+        ORDER BY {column}
+        LIMIT ?
+        """,
+        [*params, limit],
+    ).fetchall()
+    return [row[0] for row in rows]
@@ -0,0 +1,191 @@
+"""rerun이 어디에서 시간을 쓰는지 보기 위한 가벼운 시간 측정 계층.
+
+- traced: DB 조회 함수 등에 붙이는 데코레이터. 구간 이름별로 실행 시간을 모읍니다.
+- span: 함수 안의 일부 구간(SQL 실행, pandas 변환 등)을 재는 컨텍스트 관리자
+- traced_page: 페이지 한 번의 실행(rerun) 전체 시간.
+  rerun 안에서 바로 호출된 구간들의 시간도 함께 남겨, 나머지를 위젯 렌더링 시간으로 봅니다.
+
+프로세스 안에서 구간별 최근 샘플(config.TRACING_MAX_SAMPLES개)로 p50/p95를 계산하고,
+관리자 페이지의 "성능" 탭에서 확인합니다.
+꺼져 있으면(config.TRACING_ENABLED = False) 전역 플래그 하나만 확인하고 바로 원래 함수를 실행합니다.
+"""
+
+import functools
+import statistics
+import threading
+import time
+from collections import deque, namedtuple
+
+import config
+
+SpanStats = namedtuple(
+    "SpanStats", ["name", "count", "total_ms", "p50_ms", "p95_ms", "max_ms"]
+)
+# spans: rerun 안에서 바로 호출된 구간의 [(이름, ms)]
+Rerun = namedtuple("Rerun", ["page", "started_at", "total_ms", "spans"])
+
+_enabled = config.TRACING_ENABLED
+_lock = threading.Lock()
+_histograms = {}
+_reruns = deque(maxlen=config.TRACING_RECENT_RERUNS)
+_local = threading.local()
+
+
+class _Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=config.TRACING_MAX_SAMPLES)
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _reruns.clear()
+
+
+def record(name, elapsed_ms):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = _Histogram()
+        histogram.count += 1
+        histogram.total += elapsed_ms
+        histogram.max = max(histogram.max, elapsed_ms)
+        histogram.samples.append(elapsed_ms)
+
+
+def _finish(name, started, depth):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    record(name, elapsed_ms)
+    _local.depth = depth
+    rerun_spans = getattr(_local, "rerun_spans", None)
+    # 페이지 바로 아래 구간만 남겨야 중첩된 구간이 두 번 더해지지 않습니다.
+    if rerun_spans is not None and depth == 1:
+        rerun_spans.append((name, elapsed_ms))
+
+
+class span:
+    """with span("이름"): 블록의 실행 시간을 기록합니다."""
+
+    __slots__ = ("name", "started", "depth")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if _enabled:
+            self.depth = getattr(_local, "depth", 0)
+            _local.depth = self.depth + 1
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.started is not None:
+            _finish(self.name, self.started, self.depth)
+        return False
+
+
+def traced(func=None, *, name=None):
+    """함수 실행 시간을 "모듈.함수" 이름(또는 name)으로 기록하는 데코레이터"""
+    if func is None:
+        return functools.partial(traced, name=name)
+    span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        depth = getattr(_local, "depth", 0)
+        _local.depth = depth + 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _finish(span_name, started, depth)
+
+    return wrapper
+
+
+class _Page:
+    __slots__ = ("name", "started", "spans")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans = []
+        _local.rerun_spans = self.spans
+        _local.depth = 1
+
+    def end(self):
+        if getattr(_local, "rerun_spans", None) is not self.spans:
+            return  # 이미 끝났거나 다른 페이지가 시작된 경우
+        _local.rerun_spans = None
+        _local.depth = 0
+        total_ms = (time.perf_counter() - self.started) * 1000
+        record(f"page.{self.name}", total_ms)
+        with _lock:
+            _reruns.append(Rerun(self.name, time.time(), total_ms, self.spans))
+
+
+def traced_page(name):
+    """함수로 된 페이지의 rerun 전체 시간을 기록하는 데코레이터 (st.stop()/st.rerun() 포함)"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            page = _Page(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                page.end()
+
+        return wrapper
+
+    return decorator
+
+
+def _percentile(samples, q):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+def snapshot():
+    """구간별 SpanStats 목록 (총 시간이 큰 순서)"""
+    with _lock:
+        items = [
+            (name, h.count, h.total, list(h.samples), h.max)
+            for name, h in _histograms.items()
+        ]
+    stats = [
+        SpanStats(
+            name,
+            count,
+            total,
+            _percentile(samples, 50),
+            _percentile(samples, 95),
+            max_ms,
+        )
+        for name, count, total, samples, max_ms in items
+    ]
+    return sorted(stats, key=lambda s: s.total_ms, reverse=True)
+
+
+def recent_reruns():
+    """최근 rerun 목록 (최신 순)"""
+    with _lock:
+        return list(reversed(_reruns))